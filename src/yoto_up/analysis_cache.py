@@ -0,0 +1,91 @@
+"""Persistent cache of audio analysis results (see waveform_utils.audio_stats).
+
+Measuring loudness means decoding the whole file, which is the slow part of
+opening the waveform dialog or running ``yoto normalize --auto``. Results are
+stored per file and reused while the file's (path, size, mtime) and the
+analysis version are unchanged:
+
+- the scalar stats (peak, average, LUFS, duration) live in an SQLite table
+- the finest envelope level is saved as a ``(2, n)`` float32 ``.npy`` next to
+  it and memory-mapped on load; coarser levels are rebuilt from it
+
+Storage is handled by `npy_store.NpyStore`. The number of entries is
+bounded; the least recently used are evicted.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from yoto_up.npy_store import NpyStore
+from yoto_up.waveform_utils import ANALYSIS_VERSION, Envelope
+
+DEFAULT_MAX_ENTRIES = 2000
+
+
+class AnalysisCache(NpyStore):
+    columns = (
+        ("ext", "TEXT"),
+        ("framerate", "INTEGER NOT NULL"),
+        ("n_frames", "INTEGER NOT NULL"),
+        ("bin_frames", "INTEGER NOT NULL"),
+        ("max_amp", "REAL"),
+        ("avg_amp", "REAL"),
+        ("lufs", "REAL"),
+    )
+
+    def __init__(self, cache_dir: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        super().__init__(cache_dir, max_entries=max_entries)
+
+    def get(self, filepath: str):
+        """Return the `audio_stats` result tuple for an unchanged file, else None."""
+        found = self._get(filepath, (ANALYSIS_VERSION,), mmap=True)
+        if found is None:
+            return None
+        (ext, framerate, n_frames, bin_frames, max_amp, avg_amp, lufs), bins = found
+        envelope = Envelope.from_bins(bins[0], bins[1], bin_frames, framerate, n_frames)
+        return (envelope, max_amp, avg_amp, lufs, ext, filepath)
+
+    def put(self, filepath: str, result) -> None:
+        """Store a successful `audio_stats` result for `filepath`."""
+        envelope, max_amp, avg_amp, lufs, ext, _ = result
+        if envelope is None:
+            return
+        mins, maxs = envelope.levels[0]
+        self._put(
+            filepath,
+            (ANALYSIS_VERSION,),
+            np.stack([mins, maxs]).astype(np.float32),
+            ext=ext,
+            framerate=int(envelope.framerate),
+            n_frames=int(envelope.n_frames),
+            bin_frames=int(envelope.bin_frames),
+            max_amp=max_amp,
+            avg_amp=avg_amp,
+            lufs=lufs,
+        )
+
+
+_shared_cache: AnalysisCache | None = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache | None:
+    """Return the cache shared by the CLI and the GUI, or None if it cannot be opened."""
+    global _shared_cache, _shared_failed
+    if _shared_cache is None and not _shared_failed:
+        with _shared_lock:
+            if _shared_cache is None and not _shared_failed:
+                try:
+                    from yoto_up.paths import AUDIO_ANALYSIS_CACHE_DIR
+
+                    _shared_cache = AnalysisCache(AUDIO_ANALYSIS_CACHE_DIR)
+                except Exception as e:
+                    logger.warning(f"Failed to open audio analysis cache, analysing without it: {e}")
+                    _shared_failed = True
+    return _shared_cache
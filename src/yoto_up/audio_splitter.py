@@ -2,7 +2,9 @@
 
 Provides `split_audio` which detects silences and splits an input audio
 file into multiple tracks aiming for `target_tracks` while respecting a
-minimum track length.
+minimum track length. `plan_split` returns the segments that would be
+written without writing them; silence maps are cached per file and
+threshold so re-planning with other track counts does not re-decode.
 
 This is a pragmatic wrapper around `ffmpeg`; `ffmpeg` must be installed
 and on PATH.
@@ -10,11 +12,19 @@ and on PATH.
 
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
+import glob
+import os
 import shutil
 import subprocess
+import threading
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Tuple, Optional, Callable
+import numpy as np
+from loguru import logger
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.table import Table
@@ -107,6 +117,86 @@ def _get_duration(path: Path) -> float:
         raise RuntimeError("failed to determine input duration via ffprobe")
 
 
+# Containers whose embedded cover art (an attached-picture stream) survives a
+# stream copy into each split file
+_COVER_ART_SUFFIXES = {".mp3", ".m4a", ".m4b", ".mp4", ".flac"}
+
+
+def _has_attached_picture(path: Path) -> bool:
+    """Whether `path` embeds cover art as an attached-picture video stream."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v",
+        "-show_entries",
+        "stream_disposition=attached_pic",
+        "-of",
+        "csv=p=0",
+        str(path),
+    ]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return False
+    return any(line.strip() == "1" for line in proc.stdout.splitlines())
+
+
+# Silence is always detected with at most this minimum length. silencedetect
+# reports maximal quiet runs, so the ranges for any longer minimum are exactly
+# the cached ranges that are at least that long and can be filtered in memory.
+_SILENCE_DETECT_FLOOR_S = 0.1
+_SILENCE_CACHE_SIZE = 32
+_silence_cache: "OrderedDict[tuple, Tuple[float, List[Tuple[float, float]]]]" = OrderedDict()
+_silence_cache_lock = threading.Lock()
+
+
+def _silence_map(
+    path: Path, silence_thresh_db: int, detect_len_s: float
+) -> Tuple[float, List[Tuple[float, float]]]:
+    """Return (duration, silence ranges) for `path`, decoding at most once per key.
+
+    Entries are keyed by the file's identity (resolved path, size and mtime),
+    the threshold and the detection length, so an edited file is re-analysed.
+    """
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns, silence_thresh_db, detect_len_s)
+    with _silence_cache_lock:
+        cached = _silence_cache.get(key)
+        if cached is not None:
+            _silence_cache.move_to_end(key)
+            return cached
+    total_dur = _get_duration(path)
+    ranges = _parse_silencedetect_output(
+        _run_ffmpeg_silencedetect(path, silence_thresh_db, detect_len_s)
+    )
+    with _silence_cache_lock:
+        _silence_cache[key] = (total_dur, ranges)
+        _silence_cache.move_to_end(key)
+        while len(_silence_cache) > _SILENCE_CACHE_SIZE:
+            _silence_cache.popitem(last=False)
+    return total_dur, ranges
+
+
+def detect_silences(
+    input_path: str | Path, silence_thresh_db: int = -40, min_silence_len_ms: int = 800
+) -> Tuple[float, List[Tuple[float, float]]]:
+    """Return the input duration and the silences of at least `min_silence_len_ms`.
+
+    The file is only decoded the first time a threshold is used; later calls
+    with the same threshold and any minimum silence length reuse the cached
+    silence map.
+    """
+    p = Path(input_path)
+    min_silence_len_s = max(0.01, min_silence_len_ms / 1000.0)
+    detect_len_s = min(min_silence_len_s, _SILENCE_DETECT_FLOOR_S)
+    total_dur, ranges = _silence_map(p, silence_thresh_db, detect_len_s)
+    # small tolerance for the rounding in silencedetect's printed timestamps
+    keep = min_silence_len_s - 0.0005
+    return total_dur, [(s, e) for s, e in ranges if e - s >= keep]
+
+
 def _format_output_name(
     input_path: Path,
     index: int,
@@ -160,62 +250,256 @@ def _format_output_name(
     return out_dir / name
 
 
-def split_audio(
-    input_path: str | Path,
-    target_tracks: int = 10,
-    min_track_length_sec: int = 30,
-    silence_thresh_db: int = -40,
-    min_silence_len_ms: int = 800,
-    output_dir: Optional[str | Path] = None,
-    show_progress: bool = True,
-    console: Optional[Console] = None,
-    output_name_template: Optional[str] = None,
-    progress_callback: Optional[Callable[[str, float], None]] = None,
-) -> List[Path]:
-    """Split `input_path` into up to `target_tracks` pieces.
+def _extract_segment(
+    input_path: Path, idx: int, start: float, end: float, out_path: Path
+) -> None:
+    """Extract one segment with its own ffmpeg process (stream copy, then re-encode).
 
-    - Detects silences with ffmpeg's `silencedetect`.
-    - Chooses cut points at the midpoint of silence ranges.
-    - Tries to pick up to `target_tracks - 1` cut points while ensuring
-      segments are at least `min_track_length_sec` seconds long.
-    - If insufficient silence points are found, falls back to even splits.
+    The seek is applied to the input (`-ss` before `-i`) so ffmpeg jumps
+    straight to `start` instead of decoding everything before it.
+    """
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{start}",
+        "-t",
+        f"{end - start}",
+        "-i",
+        str(input_path),
+        "-c",
+        "copy",
+        str(out_path),
+    ]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        # fallback: re-encode audio to avoid copy-related issues
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-ss",
+            f"{start}",
+            "-t",
+            f"{end - start}",
+            "-i",
+            str(input_path),
+            "-acodec",
+            "libmp3lame",
+            "-b:a",
+            "128k",
+            str(out_path),
+        ]
+        proc2 = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if proc2.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg failed to create segment {idx + 1}: {proc2.stderr}\n{proc.stderr}"
+            )
 
-    Returns list of output file Paths.
+
+def _extract_segments_single_pass(
+    input_path: Path,
+    segments: List[Tuple[float, float]],
+    out_paths: List[Path],
+    on_started: Callable[[int], None],
+    on_done: Callable[[int], None],
+) -> bool:
+    """Write every segment from a single ffmpeg run using the segment muxer.
+
+    The input is read once and the audio stream copied into a new file at each
+    cut time, with the input's metadata. Segments are written under temporary
+    names in the output directory and renamed to `out_paths` once ffmpeg
+    succeeds. Returns False (leaving no partial outputs behind) when the
+    stream cannot be segmented this way, so the caller can fall back to
+    per-segment extraction. That includes inputs with embedded cover art:
+    the segment muxer would only put the picture in the first file, while
+    per-segment extraction copies it into every one.
+
+    `on_started`/`on_done` are only called, for every segment in order, once
+    the run has succeeded. A failed run reports nothing, so the fallback's
+    progress starts from the first segment without repeating any.
     """
-    _ensure_ffmpeg()
-    p = Path(input_path)
-    if output_dir is None:
-        out_dir = p.parent
-    else:
-        out_dir = Path(output_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
+    if not segments:
+        return False
+    if input_path.suffix.lower() in _COVER_ART_SUFFIXES and _has_attached_picture(input_path):
+        logger.debug(f"{input_path} has cover art; extracting segments individually to keep it")
+        return False
+    cuts = [start for start, _ in segments[1:]]
+    out_dir = out_paths[0].parent
+    suffix = input_path.suffix or ".mp3"
+    tmp_prefix = f".{input_path.stem}.split-{os.getpid()}-"
+    pattern = out_dir / (tmp_prefix.replace("%", "%%") + "%05d" + suffix)
+    tmp_paths = [out_dir / f"{tmp_prefix}{i:05d}{suffix}" for i in range(len(segments))]
 
-    total_dur = _get_duration(p)
-    min_silence_len_s = max(0.01, min_silence_len_ms / 1000.0)
-    console = console or Console()
-    if show_progress:
-        with console.status("Detecting silences…", spinner="dots"):
-            raw = _run_ffmpeg_silencedetect(p, silence_thresh_db, min_silence_len_s)
+    def _cleanup() -> None:
+        for leftover in out_dir.glob(f"{glob.escape(tmp_prefix)}*{glob.escape(suffix)}"):
+            try:
+                leftover.unlink()
+            except Exception:
+                pass
+
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostats",
+        "-i",
+        str(input_path),
+        "-map",
+        "0:a:0",
+        "-map_metadata",
+        "0",
+        "-c",
+        "copy",
+        "-f",
+        "segment",
+        "-reset_timestamps",
+        "1",
+    ]
+    if cuts:
+        cmd += ["-segment_times", ",".join(f"{c:.6f}" for c in cuts)]
     else:
-        raw = _run_ffmpeg_silencedetect(p, silence_thresh_db, min_silence_len_s)
-    if callable(progress_callback):
-        try:
-            progress_callback("silence_detected", 0.0)
-        except Exception:
-            pass
-    silence_ranges = _parse_silencedetect_output(raw)
+        # A single segment: make sure the muxer never starts a second file
+        cmd += ["-segment_time", f"{segments[-1][1] + 1:.6f}"]
+    cmd.append(str(pattern))
 
-    candidates = []
-    for s, e in silence_ranges:
-        midpoint = (s + e) / 2.0
-        candidates.append(midpoint)
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except OSError:
+        _cleanup()
+        return False
+    returncode, stderr = proc.returncode, proc.stderr
+
+    extra = out_dir / f"{tmp_prefix}{len(segments):05d}{suffix}"
+    if returncode != 0 or not all(t.exists() for t in tmp_paths) or extra.exists():
+        logger.debug(
+            f"Single-pass split of {input_path} failed, extracting segments individually: {stderr.strip()}"
+        )
+        _cleanup()
+        return False
 
-    if show_progress:
-        t = Table(show_header=False, box=None)
-        t.add_row("Duration:", f"{total_dur:.1f}s")
-        t.add_row("Silence ranges found:", str(len(silence_ranges)))
-        t.add_row("Candidate cuts:", str(len(candidates)))
-        console.print(t)
+    for tmp, out in zip(tmp_paths, out_paths):
+        tmp.replace(out)
+    for idx in range(len(segments)):
+        on_started(idx)
+        on_done(idx)
+    return True
+
+
+def _extract_segments_parallel(
+    input_path: Path,
+    segments: List[Tuple[float, float]],
+    out_paths: List[Path],
+    max_workers: Optional[int],
+    on_started: Callable[[int], None],
+    on_done: Callable[[int], None],
+) -> None:
+    """Extract segments with up to `max_workers` ffmpeg processes at once.
+
+    Each segment is independent, so they are handed to a bounded pool whose
+    workers each drive one ffmpeg process. Progress is still reported from the
+    calling thread in segment order: `on_started(i)` before waiting for
+    segment i and `on_done(i)` once it exists. The first failure cancels the
+    segments that have not started and is re-raised.
+    """
+    try:
+        if max_workers is None:
+            workers = min(4, (os.cpu_count() or 1))
+        else:
+            workers = max(1, int(max_workers))
+    except Exception:
+        workers = 1
+    workers = min(workers, len(segments))
+
+    if workers <= 1:
+        for idx, (start, end) in enumerate(segments):
+            on_started(idx)
+            _extract_segment(input_path, idx, start, end, out_paths[idx])
+            on_done(idx)
+        return
+
+    ex = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            ex.submit(_extract_segment, input_path, idx, start, end, out_paths[idx])
+            for idx, (start, end) in enumerate(segments)
+        ]
+        for idx, fut in enumerate(futures):
+            on_started(idx)
+            fut.result()
+            on_done(idx)
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def _choose_cuts(
+    candidates: List[float],
+    total_dur: float,
+    target_tracks: int,
+    min_gap: float,
+) -> Optional[List[float]]:
+    """Pick exactly `target_tracks - 1` cuts from `candidates`.
+
+    The j-th cut ideally sits at j * total_dur / target_tracks; the chosen
+    cuts minimise the summed squared distance from those positions, with
+    consecutive cuts at least `min_gap` apart. Because both the candidates
+    and the ideal positions are ordered, the j-th cut is always matched
+    with a later candidate than the (j-1)-th, which gives a dynamic
+    programme over (cut, candidate) evaluated one cut at a time in
+    O(cuts * candidates). Returns None when no choice satisfies `min_gap`.
+    """
+    k = target_tracks - 1
+    c = np.sort(np.asarray(candidates, dtype=float))
+    n = len(c)
+    if k <= 0:
+        return []
+    if n < k:
+        return None
+    idx = np.arange(n)
+    # latest candidate that can precede candidate i
+    prev_limit = np.minimum(np.searchsorted(c, c - min_gap, side="right") - 1, idx - 1)
+    ideal = total_dur / target_tracks
+
+    cost = (c - ideal) ** 2
+    back = np.empty((k, n), dtype=np.int64)
+    back[0] = -1
+    for j in range(1, k):
+        # best previous cost among candidates 0..p, and where it was reached
+        best = np.minimum.accumulate(cost)
+        best_at = np.maximum.accumulate(np.where(cost == best, idx, 0))
+        ok = prev_limit >= 0
+        p = np.where(ok, prev_limit, 0)
+        cost = np.where(ok, best[p], np.inf) + (c - (j + 1) * ideal) ** 2
+        back[j] = np.where(ok, best_at[p], -1)
+
+    last = int(np.argmin(cost))
+    if not np.isfinite(cost[last]):
+        return None
+    chosen = [last]
+    for j in range(k - 1, 0, -1):
+        chosen.append(int(back[j][chosen[-1]]))
+    return [float(c[i]) for i in reversed(chosen)]
+
+
+def _plan_segments(
+    total_dur: float,
+    silence_ranges: List[Tuple[float, float]],
+    target_tracks: int,
+    min_track_length_sec: float,
+) -> List[Tuple[float, float]]:
+    """Turn detected silences into (start, end) segments covering the input.
+
+    Pure computation over the silence map, so it can be re-run for different
+    `target_tracks` / `min_track_length_sec` without touching the audio.
+    """
+    candidates = [(s + e) / 2.0 for s, e in silence_ranges]
 
     # Filter candidates too close to start/end or violating min track length
     filtered = [
@@ -227,14 +511,11 @@ def split_audio(
     desired_cuts = max(0, target_tracks - 1)
     chosen_cuts: List[float] = []
     if len(filtered) >= desired_cuts and desired_cuts > 0:
-        # pick cuts closest to ideal even-split positions
-        targets = [(i + 1) * total_dur / target_tracks for i in range(desired_cuts)]
-        used = set()
-        for t in targets:
-            # find nearest candidate not yet used
-            best = min(filtered, key=lambda c: abs(c - t))
-            chosen_cuts.append(best)
-            filtered.remove(best)
+        # pick the cuts closest to the ideal even-split positions, keeping
+        # tracks at least min_track_length_sec long when that is possible
+        chosen_cuts = _choose_cuts(filtered, total_dur, target_tracks, min_track_length_sec)
+        if chosen_cuts is None:
+            chosen_cuts = _choose_cuts(filtered, total_dur, target_tracks, 0.0) or []
     elif desired_cuts > 0 and len(filtered) > 0:
         # not enough candidates — use what we have
         chosen_cuts = filtered[:desired_cuts]
@@ -313,130 +594,123 @@ def split_audio(
             f"Segment coverage mismatch: covered={covered:.3f}s total={total_dur:.3f}s; this indicates a splitting error"
         )
 
-    outputs: List[Path] = []
-    total = len(segments)
+    return segments
+
+
+def plan_split(
+    input_path: str | Path,
+    target_tracks: int = 10,
+    min_track_length_sec: int = 30,
+    silence_thresh_db: int = -40,
+    min_silence_len_ms: int = 800,
+) -> List[Tuple[float, float]]:
+    """Return the (start, end) segments `split_audio` would write, without writing them.
+
+    Uses the cached silence map, so after the first call for a file and
+    threshold, trying other track counts or lengths does not decode the audio.
+    """
+    _ensure_ffmpeg()
+    total_dur, silence_ranges = detect_silences(input_path, silence_thresh_db, min_silence_len_ms)
+    return _plan_segments(total_dur, silence_ranges, target_tracks, min_track_length_sec)
+
+
+def split_audio(
+    input_path: str | Path,
+    target_tracks: int = 10,
+    min_track_length_sec: int = 30,
+    silence_thresh_db: int = -40,
+    min_silence_len_ms: int = 800,
+    output_dir: Optional[str | Path] = None,
+    show_progress: bool = True,
+    console: Optional[Console] = None,
+    output_name_template: Optional[str] = None,
+    progress_callback: Optional[Callable[[str, float], None]] = None,
+    single_pass: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[Path]:
+    """Split `input_path` into up to `target_tracks` pieces.
+
+    - Detects silences with ffmpeg's `silencedetect` (cached per file and
+      threshold, see `detect_silences`).
+    - Chooses cut points at the midpoint of silence ranges.
+    - Tries to pick up to `target_tracks - 1` cut points while ensuring
+      segments are at least `min_track_length_sec` seconds long.
+    - If insufficient silence points are found, falls back to even splits.
+    - With `single_pass` (the default) all segments are written by one ffmpeg
+      run using the segment muxer; otherwise, or if the stream cannot be
+      segmented that way, each segment is extracted by its own ffmpeg run,
+      up to `max_workers` at a time (default: min(4, CPU count)).
+
+    Returns list of output file Paths.
+    """
+    _ensure_ffmpeg()
+    p = Path(input_path)
+    if output_dir is None:
+        out_dir = p.parent
+    else:
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    console = console or Console()
     if show_progress:
-        with Progress(SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TimeElapsedColumn(), console=console) as progress:
-            task = progress.add_task("Extracting segments", total=total)
-            for idx, (start, end) in enumerate(segments):
-                out_path = _format_output_name(p, idx, total, out_dir, template=output_name_template)
-                if callable(progress_callback):
-                    try:
-                        progress_callback(f"Extracting {idx+1}/{total}", idx / total)
-                    except Exception:
-                        pass
-                progress.update(task, description=f"Segment {idx+1}/{total} — {end-start:.1f}s")
-                # use ffmpeg to extract
-                cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-hide_banner",
-                    "-loglevel",
-                    "error",
-                    "-i",
-                    str(p),
-                    "-ss",
-                    f"{start}",
-                    "-to",
-                    f"{end}",
-                    "-c",
-                    "copy",
-                    str(out_path),
-                ]
-                proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                if proc.returncode != 0:
-                    # fallback: re-encode audio to avoid copy-related issues
-                    cmd = [
-                        "ffmpeg",
-                        "-y",
-                        "-hide_banner",
-                        "-loglevel",
-                        "error",
-                        "-i",
-                        str(p),
-                        "-ss",
-                        f"{start}",
-                        "-to",
-                        f"{end}",
-                        "-acodec",
-                        "libmp3lame",
-                        "-b:a",
-                        "128k",
-                        str(out_path),
-                    ]
-                    proc2 = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                    if proc2.returncode != 0:
-                        raise RuntimeError(
-                            f"ffmpeg failed to create segment {idx + 1}: {proc2.stderr}\n{proc.stderr}"
-                        )
-                outputs.append(out_path)
-                if callable(progress_callback):
-                    try:
-                        progress_callback(f"Completed {idx+1}/{total}", (idx + 1) / total)
-                    except Exception:
-                        pass
-                progress.advance(task)
+        with console.status("Detecting silences…", spinner="dots"):
+            total_dur, silence_ranges = detect_silences(p, silence_thresh_db, min_silence_len_ms)
     else:
-        for idx, (start, end) in enumerate(segments):
-            out_path = _format_output_name(p, idx, total, out_dir, template=output_name_template)
-            if callable(progress_callback):
-                try:
-                    progress_callback(f"Extracting {idx+1}/{total}", idx / total)
-                except Exception:
-                    pass
-            # use ffmpeg to extract
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-i",
-                str(p),
-                "-ss",
-                f"{start}",
-                "-to",
-                f"{end}",
-                "-c",
-                "copy",
-                str(out_path),
-            ]
-            proc = subprocess.run(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        total_dur, silence_ranges = detect_silences(p, silence_thresh_db, min_silence_len_ms)
+    if callable(progress_callback):
+        try:
+            progress_callback("silence_detected", 0.0)
+        except Exception:
+            pass
+
+    if show_progress:
+        t = Table(show_header=False, box=None)
+        t.add_row("Duration:", f"{total_dur:.1f}s")
+        t.add_row("Silence ranges found:", str(len(silence_ranges)))
+        t.add_row("Candidate cuts:", str(len(silence_ranges)))
+        console.print(t)
+
+    segments = _plan_segments(total_dur, silence_ranges, target_tracks, min_track_length_sec)
+
+    total = len(segments)
+    out_paths = [
+        _format_output_name(p, idx, total, out_dir, template=output_name_template)
+        for idx in range(total)
+    ]
+
+    def _started(idx: int) -> None:
+        if callable(progress_callback):
+            try:
+                progress_callback(f"Extracting {idx+1}/{total}", idx / total)
+            except Exception:
+                pass
+        if progress is not None:
+            start, end = segments[idx]
+            progress.update(task, description=f"Segment {idx+1}/{total} — {end-start:.1f}s")
+
+    def _done(idx: int) -> None:
+        if callable(progress_callback):
+            try:
+                progress_callback(f"Completed {idx+1}/{total}", (idx + 1) / total)
+            except Exception:
+                pass
+        if progress is not None:
+            progress.advance(task)
+
+    with contextlib.ExitStack() as stack:
+        progress = None
+        task = None
+        if show_progress:
+            progress = stack.enter_context(
+                Progress(SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TimeElapsedColumn(), console=console)
             )
-            if proc.returncode != 0:
-                # fallback: re-encode audio to avoid copy-related issues
-                cmd = [
-                    "ffmpeg",
-                    "-y",
-                    "-hide_banner",
-                    "-loglevel",
-                    "error",
-                    "-i",
-                    str(p),
-                    "-ss",
-                    f"{start}",
-                    "-to",
-                    f"{end}",
-                    "-acodec",
-                    "libmp3lame",
-                    "-b:a",
-                    "128k",
-                    str(out_path),
-                ]
-                proc2 = subprocess.run(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-                )
-                if proc2.returncode != 0:
-                    raise RuntimeError(
-                        f"ffmpeg failed to create segment {idx + 1}: {proc2.stderr}\n{proc.stderr}"
-                    )
-            outputs.append(out_path)
-            if callable(progress_callback):
-                try:
-                    progress_callback(f"Completed {idx+1}/{total}", (idx + 1) / total)
-                except Exception:
-                    pass
+            task = progress.add_task("Extracting segments", total=total)
+        extracted = single_pass and _extract_segments_single_pass(
+            p, segments, out_paths, _started, _done
+        )
+        if not extracted:
+            _extract_segments_parallel(p, segments, out_paths, max_workers, _started, _done)
+    outputs: List[Path] = out_paths
 
     if show_progress:
         # Print a summary table of created files
@@ -453,12 +727,9 @@ def split_audio(
                 n /= 1024.0
             return f"{n:.1f} PB"
 
-        for idx, out in enumerate(outputs):
-            try:
-                dur = _get_duration(out)
-                dur_text = str(timedelta(seconds=round(dur)))
-            except Exception:
-                dur_text = "?"
+        for idx, (out, (start, end)) in enumerate(zip(outputs, segments)):
+            # The cut times are known, so there is no need to probe each output
+            dur_text = str(timedelta(seconds=round(end - start)))
             try:
                 size = out.stat().st_size
                 size_text = _format_bytes(size)
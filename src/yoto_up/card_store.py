@@ -0,0 +1,95 @@
+"""Local store of full card details, keyed by cardId and updatedAt.
+
+The MYO content list (``/content/mine``) only returns card summaries, so bulk
+operations that need metadata or chapters (tag/category filters, exports)
+used to fetch every card's details. The store keeps the last fetched details
+for each card together with the ``updatedAt`` they correspond to; a card only
+needs refetching when its summary reports a different ``updatedAt``.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+from yoto_up.models import Card
+
+
+class CardStore:
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cards (
+                    card_id TEXT PRIMARY KEY,
+                    updated_at TEXT,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+
+    def get(self, card_id: str, updated_at: str | None) -> Card | None:
+        """Return the stored card if it matches `updated_at` (None never matches)."""
+        if not card_id or not updated_at:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload FROM cards WHERE card_id = ? AND updated_at = ?",
+                    (card_id, updated_at),
+                ).fetchone()
+            if row:
+                return Card.model_validate(json.loads(row[0]))
+        except Exception as e:
+            logger.debug(f"CardStore.get failed for {card_id}: {e}")
+        return None
+
+    def put(self, card: Card, updated_at: str | None = None) -> None:
+        """Store full card details, recorded against `updated_at` (default: the card's own)."""
+        card_id = getattr(card, "cardId", None)
+        if not card_id:
+            return
+        try:
+            payload = json.dumps(card.model_dump(exclude_none=True), ensure_ascii=False)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cards (card_id, updated_at, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                    (card_id, updated_at or card.updatedAt, payload, time.time()),
+                )
+        except Exception as e:
+            logger.debug(f"CardStore.put failed for {card_id}: {e}")
+
+    def delete(self, card_id: str) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM cards WHERE card_id = ?", (card_id,))
+        except Exception as e:
+            logger.debug(f"CardStore.delete failed for {card_id}: {e}")
+
+    def retain(self, card_ids: Iterable[str]) -> int:
+        """Drop stored cards that are no longer in the library. Returns the count removed."""
+        keep = set(card_ids)
+        try:
+            with self._lock:
+                stored = [r[0] for r in self._conn.execute("SELECT card_id FROM cards")]
+                doomed = [(cid,) for cid in stored if cid not in keep]
+                if doomed:
+                    with self._conn:
+                        self._conn.executemany("DELETE FROM cards WHERE card_id = ?", doomed)
+            return len(doomed)
+        except Exception as e:
+            logger.debug(f"CardStore.retain failed: {e}")
+            return 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,83 @@
+"""Persistent cache of MFCC sequences used by intro/outro analysis.
+
+Pressing "Analyze" again on an unchanged queue would otherwise decode and
+featurise every file again. Each entry is the MFCC matrix of one side
+(intro/outro) of one file for one set of analysis parameters, stored as a
+float16 ``.npy`` with its metadata in an SQLite index (see
+`npy_store.NpyStore`). Entries are reused while the file's (path, size,
+mtime) and the parameters, including the feature version, are unchanged.
+
+The total size of the stored arrays is bounded; the least recently used
+entries are evicted first.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from yoto_up.npy_store import NpyStore
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FeatureCache(NpyStore):
+    columns = (
+        ("n_samples", "INTEGER NOT NULL"),
+        ("sample_rate", "INTEGER NOT NULL"),
+    )
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes=max_bytes)
+
+    def get(self, path: str, params: tuple):
+        """Return (mfcc float32, n_samples, sample_rate) for an unchanged file, else None.
+
+        `params` identifies the analysis (feature version, side, seconds, sr,
+        n_mfcc, ...).
+        """
+        found = self._get(path, params)
+        if found is None:
+            return None
+        (n_samples, sample_rate), mfcc = found
+        return mfcc.astype(np.float32), int(n_samples), int(sample_rate)
+
+    def put(self, path: str, params: tuple, mfcc: np.ndarray, n_samples: int, sample_rate: int) -> None:
+        """Store the MFCC matrix computed for `path` with `params`."""
+        self._put(
+            path,
+            params,
+            np.asarray(mfcc, dtype=np.float16),
+            n_samples=int(n_samples),
+            sample_rate=int(sample_rate),
+        )
+
+
+_shared_cache: FeatureCache | None = None
+_shared_pid: int | None = None
+_shared_failed = False
+_shared_lock = threading.Lock()
+
+
+def get_feature_cache() -> FeatureCache | None:
+    """Return the process-wide feature cache, or None if it cannot be opened."""
+    global _shared_cache, _shared_pid, _shared_failed
+    # A forked analysis worker must not reuse its parent's SQLite connection
+    if _shared_cache is not None and _shared_pid != os.getpid():
+        _shared_cache = None
+    if _shared_cache is None and not _shared_failed:
+        with _shared_lock:
+            if _shared_cache is None and not _shared_failed:
+                try:
+                    from yoto_up.paths import MFCC_FEATURE_CACHE_DIR
+
+                    _shared_cache = FeatureCache(MFCC_FEATURE_CACHE_DIR)
+                    _shared_pid = os.getpid()
+                except Exception as e:
+                    logger.warning(f"Failed to open MFCC feature cache, analysing without it: {e}")
+                    _shared_failed = True
+    return _shared_cache
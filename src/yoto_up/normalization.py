@@ -1,7 +1,10 @@
+import math
 import os
 import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional, Callable, Union
+from typing import Dict, List, Optional, Callable, Union
 from loguru import logger
 from ffmpeg_normalize import FFmpegNormalize
 import ffmpeg
@@ -12,16 +15,73 @@ ffmpeg.init()
 ffmpeg.add_to_path()
 
 
+# Output formats that ffmpeg-normalize treats as unable to carry pictures or
+# more than one stream
+_AUDIO_ONLY_FORMATS = {"aac", "ast", "flac", "mka", "oga", "ogg", "opus", "wav"}
+_ONE_STREAM_FORMATS = {"aac", "ast", "flac", "mp3", "wav"}
+
+# A sample peak can read below the true (inter-sample) peak, and lossy
+# re-encoding adds overshoot of its own. Measurements that only carry a
+# sample peak are given this much headroom before a linear render is trusted
+# to stay under `true_peak`.
+SAMPLE_PEAK_HEADROOM_DB = 1.0
+
+
+def cached_measurements(paths: List[str]) -> Dict[str, dict]:
+    """Return {path: {"lufs", "max_amp"}} for the files the analysis cache holds.
+
+    Only files whose results are already cached (and unchanged) are
+    included; nothing is decoded. The result can be passed as
+    `AudioNormalizer.normalize(measurements=...)`.
+    """
+    try:
+        from yoto_up.analysis_cache import get_analysis_cache
+
+        cache = get_analysis_cache()
+    except Exception as e:
+        logger.debug(f"Analysis cache unavailable for normalization: {e}")
+        return {}
+    if cache is None:
+        return {}
+    measurements = {}
+    for path in paths:
+        cached = cache.get(path)
+        if cached is None:
+            continue
+        _, max_amp, _, lufs, _, _ = cached
+        measurements[path] = {"lufs": lufs, "max_amp": max_amp}
+    return measurements
+
+
+class NormalizationError(RuntimeError):
+    """Raised after all files were attempted when some failed to normalize.
+
+    `errors` maps each failed input path to its exception and
+    `output_paths` lists the outputs in input order, None for failed files.
+    """
+
+    def __init__(self, errors: Dict[str, Exception], output_paths: List[Optional[str]]):
+        self.errors = errors
+        self.output_paths = output_paths
+        details = "; ".join(f"{os.path.basename(p)}: {e}" for p, e in errors.items())
+        super().__init__(
+            f"{len(errors)} of {len(output_paths)} files failed to normalize ({details})"
+        )
+
+
 class AudioNormalizer:
     def __init__(
         self,
         target_level: float = -23.0,
         true_peak: float = -1.0,
         batch_mode: bool = False,
+        max_workers: Optional[int] = None,
     ):
         self.target_level = target_level
         self.true_peak = true_peak
         self.batch_mode = batch_mode
+        # Files normalized concurrently outside batch mode (default: CPU count)
+        self.max_workers = max_workers or os.cpu_count() or 1
 
     def _get_codec_for_ext(self, ext: str) -> str:
         ext = ext.lower()
@@ -37,23 +97,129 @@ class AudioNormalizer:
             return "pcm_s16le"
         return "aac"  # Default fallback
 
+    def _measured(self, path: str, measurements: Optional[Dict[str, dict]]):
+        """Return (integrated LUFS, peak dBFS) the caller measured for `path`, or None.
+
+        `measurements` uses the shape returned by `analyze_gain_requirements`
+        ({path: {"lufs": ..., "max_amp": ...}}, optionally with "true_peak" in
+        dBTP): BS.1770 loudness over all channels and the peak of any
+        channel. A sample peak is raised by `SAMPLE_PEAK_HEADROOM_DB` to stand
+        in for the true peak. Nothing is measured or looked up here.
+        """
+        if not measurements:
+            return None
+        info = measurements.get(path) or measurements.get(os.path.abspath(path))
+        if not info:
+            return None
+        lufs = info.get("lufs")
+        peak_db = info.get("true_peak")
+        if peak_db is None and info.get("max_amp"):
+            peak_db = 20.0 * math.log10(float(info["max_amp"])) + SAMPLE_PEAK_HEADROOM_DB
+        if lufs is None or peak_db is None:
+            return None
+        return float(lufs), float(peak_db)
+
+    def _render_linear(self, inp: str, outp: str, gain_db: float, codec: str) -> None:
+        """Apply a fixed gain of `gain_db` in a single ffmpeg pass.
+
+        Streams are mapped as ffmpeg-normalize maps them, so a file keeps its
+        cover art whichever path it takes: the audio is re-encoded with
+        `codec` while pictures and subtitles are copied. Containers that cannot
+        hold pictures get audio only.
+        """
+        ext = os.path.splitext(outp)[1].lower().lstrip(".")
+        cmd = [
+            "ffmpeg",
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            inp,
+            "-map",
+            "0:a:0" if ext in _ONE_STREAM_FORMATS else "0:a",
+            "-map_metadata",
+            "0",
+        ]
+        if ext not in _AUDIO_ONLY_FORMATS:
+            cmd += ["-map", "0:v?", "-c:v", "copy"]
+        if ext not in _ONE_STREAM_FORMATS:
+            cmd += ["-map", "0:s?", "-c:s", "copy"]
+        cmd += ["-af", f"volume={gain_db:.3f}dB", "-c:a", codec, outp]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"ffmpeg exited with {result.returncode}")
+
+    def apply_gain(self, inp: str, outp: str, gain_db: float) -> str:
+        """Write `inp` with a fixed gain of `gain_db` applied to `outp`.
+
+        Used when the gain was decided elsewhere (e.g. a gain plan from
+        `analyze_gain_requirements`); nothing is measured or limited.
+        """
+        if os.path.abspath(outp) == os.path.abspath(inp):
+            raise ValueError(f"Refusing to overwrite the input file {inp}")
+        self._render_linear(inp, outp, gain_db, self._get_codec_for_ext(os.path.splitext(inp)[1]))
+        return outp
+
+    def _normalize_one(
+        self, inp: str, outp: str, measurements: Optional[Dict[str, dict]]
+    ) -> str:
+        codec = self._get_codec_for_ext(os.path.splitext(inp)[1])
+        measured = self._measured(inp, measurements)
+        if measured is not None:
+            lufs, peak_db = measured
+            gain_db = self.target_level - lufs
+            if peak_db + gain_db <= self.true_peak:
+                try:
+                    self._render_linear(inp, outp, gain_db, codec)
+                    logger.debug(f"Normalized {inp} with measured gain {gain_db:+.2f} dB")
+                    return outp
+                except Exception as e:
+                    logger.warning(f"Single-pass normalization failed for {inp}, measuring instead: {e}")
+
+        normalizer = FFmpegNormalize(
+            target_level=self.target_level,
+            true_peak=self.true_peak,
+            print_stats=False,
+            progress=False,  # We report progress per file
+            batch=False,
+            audio_codec=codec,
+        )
+        normalizer.add_media_file(inp, outp)
+        normalizer.run_normalization()
+        return outp
+
     def normalize(
         self,
         input_paths: Union[str, List[str]],
         output_dir: str,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        measurements: Optional[Dict[str, dict]] = None,
     ) -> List[str]:
         """
         Normalize one or more audio files.
 
+        Outside batch mode, files whose loudness and peak were already
+        measured (see `measurements`) are normalized with a single linear
+        gain render, skipping ffmpeg-normalize's measurement pass; the rest,
+        and any file that would need limiting to reach the target, go
+        through ffmpeg-normalize. Up to `max_workers` files are processed
+        concurrently; a failing file does not stop the others, and
+        `NormalizationError` reports every failure once all have finished.
+
         Args:
             input_paths: Single path or list of paths to normalize.
             output_dir: Directory to save normalized files.
             progress_callback: Function to call with (status_message, progress_float).
                                Progress float is 0.0 to 1.0.
+            measurements: Optional {path: {"lufs", "max_amp"}} mapping, e.g. the
+                          result of `analyze_gain_requirements` or
+                          `cached_measurements`. Files missing from it are
+                          measured by ffmpeg-normalize.
 
         Returns:
-            List of paths to normalized files.
+            List of paths to normalized files, in input order.
         """
         if isinstance(input_paths, str):
             input_paths = [input_paths]
@@ -75,32 +241,38 @@ class AudioNormalizer:
         )
 
         if not self.batch_mode:
-            # Process individually to handle different codecs/extensions correctly
             total = len(input_paths)
-            for i, (inp, outp) in enumerate(zip(input_paths, output_paths)):
-                ext = os.path.splitext(inp)[1]
-                codec = self._get_codec_for_ext(ext)
-
-                if progress_callback:
-                    progress_callback(
-                        f"Normalizing {os.path.basename(inp)}...", (i / total)
-                    )
-
-                normalizer = FFmpegNormalize(
-                    target_level=self.target_level,
-                    true_peak=self.true_peak,
-                    print_stats=False,
-                    progress=False,  # We handle progress manually for individual files loop
-                    batch=False,
-                    audio_codec=codec,
-                )
-                normalizer.add_media_file(inp, outp)
+            done = 0
+            errors: Dict[str, Exception] = {}
+            if progress_callback:
+                progress_callback(f"Normalizing {total} files...", 0.0)
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as pool:
+                futures = {
+                    pool.submit(self._normalize_one, inp, outp, measurements): i
+                    for i, (inp, outp) in enumerate(zip(input_paths, output_paths))
+                }
                 try:
-                    normalizer.run_normalization()
-                except Exception as e:
-                    logger.error(f"Normalization failed for {inp}: {e}")
+                    for fut in as_completed(futures):
+                        inp = input_paths[futures[fut]]
+                        try:
+                            fut.result()
+                            msg = f"Normalized {os.path.basename(inp)}"
+                        except Exception as e:
+                            logger.error(f"Normalization failed for {inp}: {e}")
+                            errors[inp] = e
+                            msg = f"Failed to normalize {os.path.basename(inp)}"
+                        done += 1
+                        if progress_callback:
+                            progress_callback(msg, done / total)
+                except BaseException:
+                    pool.shutdown(wait=True, cancel_futures=True)
                     raise
 
+            if errors:
+                raise NormalizationError(
+                    {p: errors[p] for p in input_paths if p in errors},
+                    [None if inp in errors else outp for inp, outp in zip(input_paths, output_paths)],
+                )
             if progress_callback:
                 progress_callback("Normalization complete", 1.0)
             return output_paths
@@ -0,0 +1,143 @@
+"""SQLite-indexed store of NumPy arrays computed from audio files.
+
+Shared by the analysis and MFCC feature caches. Each entry belongs to one
+source file and one tuple of parameters (which should include the version of
+the code that computed it) and is reused while the file's (path, size,
+mtime) are unchanged. The array is saved as an ``.npy`` next to an SQLite
+index that holds the entry's scalar metadata.
+
+Entries can be bounded by count and by the total size of the arrays; the
+least recently used are evicted first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+
+class NpyStore:
+    """Base class of the caches: subclasses list their metadata `columns`
+    as (name, SQL type) pairs and wrap `_get`/`_put`."""
+
+    columns: tuple[tuple[str, str], ...] = ()
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Worker processes of the analysis pools may share the index
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "index.sqlite"), timeout=10, check_same_thread=False
+        )
+        extra = "".join(f"{name} {decl}, " for name, decl in self.columns)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                f"size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, {extra}"
+                "data_file TEXT NOT NULL, nbytes INTEGER NOT NULL, used_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)"
+            )
+
+    @staticmethod
+    def _key(path: str | Path, params: tuple) -> tuple[str, str, int, int]:
+        st = os.stat(path)
+        resolved = str(Path(path).resolve())
+        key = "|".join([resolved, *(str(p) for p in params)])
+        return key, resolved, st.st_size, st.st_mtime_ns
+
+    def _get(self, path: str | Path, params: tuple, mmap: bool = False):
+        """Return (metadata tuple in `columns` order, array) for an unchanged file, else None."""
+        try:
+            key, _, size, mtime_ns = self._key(path, params)
+            names = "".join(f", {name}" for name, _ in self.columns)
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT data_file{names} FROM entries WHERE key = ? AND size = ? AND mtime_ns = ?",
+                    (key, size, mtime_ns),
+                ).fetchone()
+                if row is None:
+                    return None
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE entries SET used_at = ? WHERE key = ?", (time.time(), key)
+                    )
+            data = np.load(self.cache_dir / row[0], mmap_mode="r" if mmap else None)
+            return tuple(row[1:]), data
+        except Exception as e:
+            logger.debug(f"{type(self).__name__}.get failed for {path}: {e}")
+            return None
+
+    def _put(self, path: str | Path, params: tuple, data: np.ndarray, **metadata) -> None:
+        """Store `data` for `path` and `params` with one value per column in `metadata`."""
+        try:
+            key, resolved, size, mtime_ns = self._key(path, params)
+            data_file = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy"
+            tmp = self.cache_dir / (data_file + f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, data)
+            tmp.replace(self.cache_dir / data_file)
+            names = [name for name, _ in self.columns]
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO entries (key, path, size, mtime_ns, "
+                    f"{''.join(n + ', ' for n in names)}data_file, nbytes, used_at) "
+                    f"VALUES ({', '.join('?' * (len(names) + 7))})",
+                    (
+                        key,
+                        resolved,
+                        size,
+                        mtime_ns,
+                        *(metadata[n] for n in names),
+                        data_file,
+                        int(data.nbytes),
+                        time.time(),
+                    ),
+                )
+                self._evict_locked()
+        except Exception as e:
+            logger.debug(f"{type(self).__name__}.put failed for {path}: {e}")
+
+    def _evict_locked(self) -> None:
+        if not self.max_entries and not self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, data_file, nbytes FROM entries ORDER BY used_at DESC"
+        ).fetchall()
+        total = 0
+        doomed = []
+        for i, (key, data_file, nbytes) in enumerate(rows):
+            total += nbytes
+            if (self.max_entries and i >= self.max_entries) or (self.max_bytes and total > self.max_bytes):
+                doomed.append((key, data_file))
+        if not doomed:
+            return
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in doomed])
+        for _, data_file in doomed:
+            self._unlink(data_file)
+
+    def _unlink(self, data_file: str) -> None:
+        try:
+            (self.cache_dir / data_file).unlink()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -42,7 +42,12 @@ UI_STATE_FILE = _BASE_CONFIG_DIR / "ui_state.json"
 OFFICIAL_ICON_CACHE_DIR = _BASE_DATA_DIR / ".yoto_icon_cache"
 YOTOICONS_CACHE_DIR = _BASE_DATA_DIR / ".yotoicons_cache"
 UPLOAD_ICON_CACHE_FILE = _BASE_DATA_DIR / ".yoto_icon_upload_cache.json"
-API_CACHE_FILE = _BASE_DATA_DIR / ".yoto_api_cache.json"
+API_CACHE_FILE = _BASE_DATA_DIR / ".yoto_api_cache.sqlite"
+UPLOAD_INDEX_FILE = _BASE_DATA_DIR / ".yoto_upload_index.sqlite"
+UPLOAD_JOURNALS_DIR = _BASE_DATA_DIR / ".upload_journals"
+CARD_STORE_FILE = _BASE_DATA_DIR / ".yoto_card_store.sqlite"
+AUDIO_ANALYSIS_CACHE_DIR = _BASE_DATA_DIR / ".audio_analysis_cache"
+MFCC_FEATURE_CACHE_DIR = _BASE_DATA_DIR / ".mfcc_feature_cache"
 STAMPS_DIR = _BASE_DATA_DIR / ".stamps"
 USER_ICONS_DIR = _BASE_DATA_DIR / ".user_icons"
 VERSIONS_DIR = _BASE_DATA_DIR / ".card_versions"
@@ -111,6 +116,10 @@ try:
     USER_ICONS_DIR.mkdir(parents=True, exist_ok=True)
 except Exception:
     pass
+try:
+    UPLOAD_JOURNALS_DIR.mkdir(parents=True, exist_ok=True)
+except Exception:
+    pass
 
 
 
@@ -159,6 +168,11 @@ __all__ = [
     "YOTOICONS_CACHE_DIR",
     "UPLOAD_ICON_CACHE_FILE",
     "API_CACHE_FILE",
+    "UPLOAD_INDEX_FILE",
+    "UPLOAD_JOURNALS_DIR",
+    "CARD_STORE_FILE",
+    "AUDIO_ANALYSIS_CACHE_DIR",
+    "MFCC_FEATURE_CACHE_DIR",
     "USER_ICONS_DIR",
     "STAMPS_DIR",
     "VERSIONS_DIR",
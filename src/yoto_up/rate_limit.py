@@ -0,0 +1,240 @@
+"""Per-host rate limiting and retry policy for YotoAPI's pooled HTTP clients.
+
+Bulk operations (parallel icon replacement, icon downloads, pipelined audio
+uploads) all share one YotoAPI instance. Instead of each caller pacing itself,
+every request made through the pooled clients goes through a transport that:
+
+- takes a token from the bucket for the request's host class
+  (``api`` for the Yoto API and login hosts, ``yotoicons`` for yotoicons.com
+  and ``cdn`` for everything else: media/icon CDNs and pre-signed upload URLs)
+- retries 429 and transient 5xx responses and connection failures with
+  exponential backoff and jitter, honouring Retry-After. A 429 also pauses the
+  host's bucket so concurrent requests back off together.
+
+Requests whose body can't be replayed (streamed uploads) are never retried.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+from loguru import logger
+
+API_HOST = "api"
+CDN_HOST = "cdn"
+YOTOICONS_HOST = "yotoicons"
+
+# Requests per second and burst size per host class
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    API_HOST: (10.0, 20),
+    CDN_HOST: (20.0, 40),
+    YOTOICONS_HOST: (4.0, 8),
+}
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failures where the request never reached the server, safe for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def retry_after_seconds(response) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+
+def host_class(host: str) -> str:
+    """Map a request host onto one of the rate-limited host classes."""
+    host = (host or "").lower()
+    if host in ("api.yotoplay.com", "login.yotoplay.com"):
+        return API_HOST
+    if host == "yotoicons.com" or host.endswith(".yotoicons.com"):
+        return YOTOICONS_HOST
+    return CDN_HOST
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from threads and event loops alike.
+
+    Callers reserve a token up front (the balance may go negative) and then
+    sleep for the returned delay, so waiters are served in arrival order
+    without busy-polling.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, start - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller of this bucket for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 4
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    jitter: float = 0.2
+    retry_statuses: frozenset[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+
+    def delay(self, attempt: int, response: httpx.Response | None = None) -> float:
+        delay = min(self.backoff_base * (2**attempt), self.backoff_max)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        retry_after = retry_after_seconds(response)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def should_retry_response(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code not in self.retry_statuses:
+            return False
+        # The server rejected a throttled request without acting on it
+        return response.status_code == 429 or request.method in IDEMPOTENT_METHODS
+
+    def should_retry_error(self, request: httpx.Request, error: Exception) -> bool:
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return isinstance(error, httpx.TransportError) and request.method in IDEMPOTENT_METHODS
+
+
+class RateLimiter:
+    """Token buckets per host class plus the shared retry policy."""
+
+    def __init__(
+        self,
+        rate_limits: dict[str, tuple[float, int]] | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        limits = dict(DEFAULT_RATE_LIMITS)
+        limits.update(rate_limits or {})
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def bucket_for(self, request: httpx.Request) -> TokenBucket:
+        name = host_class(request.url.host)
+        return self.buckets.get(name) or self.buckets[CDN_HOST]
+
+
+def _replayable(request: httpx.Request) -> bool:
+    return isinstance(request.stream, httpx.ByteStream)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.BaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self._limiter.retry_policy
+        bucket = self._limiter.bucket_for(request)
+        retries = policy.max_retries if _replayable(request) else 0
+        attempt = 0
+        while True:
+            bucket.acquire()
+            try:
+                response = self._transport.handle_request(request)
+            except Exception as e:
+                if attempt >= retries or not policy.should_retry_error(request, e):
+                    raise
+                delay = policy.delay(attempt)
+                logger.debug(f"{request.method} {request.url} failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if attempt >= retries or not policy.should_retry_response(request, response):
+                    return response
+                delay = policy.delay(attempt, response)
+                if response.status_code == 429:
+                    bucket.pause(delay)
+                response.close()
+                logger.debug(
+                    f"{request.method} {request.url} returned {response.status_code}; retrying in {delay:.1f}s"
+                )
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self._limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self._limiter.retry_policy
+        bucket = self._limiter.bucket_for(request)
+        retries = policy.max_retries if _replayable(request) else 0
+        attempt = 0
+        while True:
+            await bucket.acquire_async()
+            try:
+                response = await self._transport.handle_async_request(request)
+            except Exception as e:
+                if attempt >= retries or not policy.should_retry_error(request, e):
+                    raise
+                delay = policy.delay(attempt)
+                logger.debug(f"{request.method} {request.url} failed ({e}); retrying in {delay:.1f}s")
+            else:
+                if attempt >= retries or not policy.should_retry_response(request, response):
+                    return response
+                delay = policy.delay(attempt, response)
+                if response.status_code == 429:
+                    bucket.pause(delay)
+                await response.aclose()
+                logger.debug(
+                    f"{request.method} {request.url} returned {response.status_code}; retrying in {delay:.1f}s"
+                )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,297 @@
+"""Persistent HTTP cache for YotoAPI GET requests.
+
+Entries live in one SQLite table and are written individually, so caching a
+response costs one row write rather than rewriting the whole cache. Each entry
+keeps the response body plus its ETag/Last-Modified validators:
+
+- by default every use is revalidated with If-None-Match/If-Modified-Since
+  and a 304 serves the stored body instead of downloading it again
+- callers can opt in to per-endpoint TTLs (e.g. ``RECOMMENDED_TTLS``) within
+  which the cached body is served without any request
+
+Responses carrying short-lived signed URLs (``?playable=true`` cards, signed
+media links) are never cached; see `is_cacheable`.
+
+The total body size is bounded; the least recently used entries are evicted
+first.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+CONTENT_LIST = "content_list"
+CARD = "card"
+ICONS = "icons"
+DEVICE = "device"
+OTHER = "other"
+
+# Seconds a cached response is served without revalidating. 0 (the default
+# for every class) revalidates on every use, so edits made elsewhere show up
+# immediately.
+DEFAULT_TTLS: dict[str, float] = {
+    CONTENT_LIST: 0,
+    CARD: 0,
+    ICONS: 0,
+    DEVICE: 0,
+    OTHER: 0,
+}
+
+# Opt-in TTLs for callers that accept slightly stale listings/cards
+RECOMMENDED_TTLS: dict[str, float] = {
+    CONTENT_LIST: 60,
+    CARD: 300,
+    ICONS: 24 * 3600,
+    DEVICE: 0,
+    OTHER: 60,
+}
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"/content/mine/?$|/card/family/library"), CONTENT_LIST),
+    (re.compile(r"/content/[^/?]+"), CARD),
+    (re.compile(r"/media/displayIcons|/icons?\b"), ICONS),
+    (re.compile(r"/device-v2/"), DEVICE),
+]
+
+
+_SIGNED_URL_PATTERN = re.compile(
+    r"[?&](playable=true|X-Amz-Signature=|Signature=|Expires=|token=)", re.IGNORECASE
+)
+
+
+def is_cacheable(url: str, params: dict | None = None) -> bool:
+    """False for requests whose responses embed short-lived signed URLs."""
+    if _SIGNED_URL_PATTERN.search(url):
+        return False
+    if params and str(params.get("playable", "")).lower() == "true":
+        return False
+    return True
+
+
+def endpoint_class(url: str) -> str:
+    """Classify a request URL so it gets the TTL for that kind of endpoint."""
+    for pattern, name in _ENDPOINT_PATTERNS:
+        if pattern.search(url):
+            return name
+    return OTHER
+
+
+class RequestCache:
+    def __init__(
+        self,
+        db_path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+        # The cache used to be a single JSON file next to the database; it is
+        # superseded by this store and can be large, so drop it.
+        legacy = self.db_path.with_suffix(".json")
+        try:
+            if legacy.exists():
+                legacy.unlink()
+                logger.debug(f"Removed legacy request cache {legacy}")
+        except Exception as e:
+            logger.debug(f"Failed to remove legacy request cache {legacy}: {e}")
+
+    def ttl_for(self, url: str) -> float:
+        return float(self.ttls.get(endpoint_class(url), self.ttls[OTHER]))
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached entry for `key` and mark it as recently used."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT url, status_code, headers, body, stored_at FROM entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE entries SET last_access = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+        except Exception as e:
+            logger.debug(f"RequestCache.get failed for {key}: {e}")
+            return None
+        url, status_code, headers, body, stored_at = row
+        return {
+            "url": url,
+            "status_code": status_code,
+            "headers": json.loads(headers),
+            "body": bytes(body),
+            "stored_at": stored_at,
+        }
+
+    def is_fresh(self, entry: dict, max_age: float | None = None) -> bool:
+        """Whether `entry` may be served without revalidating; never with a TTL of 0."""
+        ttl = self.ttl_for(entry["url"]) if max_age is None else max_age
+        return ttl > 0 and time.time() - entry["stored_at"] <= ttl
+
+    def put(
+        self, key: str, url: str, status_code: int, headers: dict, body: bytes
+    ) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                old = self._conn.execute(
+                    "SELECT size FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                total = self._total_size_locked() + len(body) - (old[0] if old else 0)
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, url, endpoint, status_code, headers, body, size, stored_at, last_access) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            url,
+                            endpoint_class(url),
+                            status_code,
+                            json.dumps(headers),
+                            body,
+                            len(body),
+                            now,
+                            now,
+                        ),
+                    )
+                self._total_bytes = total
+                if self.max_bytes and total > self.max_bytes:
+                    self._evict_locked(self.max_bytes)
+        except Exception as e:
+            logger.debug(f"RequestCache.put failed for {url}: {e}")
+
+    def touch(self, key: str) -> None:
+        """Restart the TTL of an entry that the server revalidated (304)."""
+        try:
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET stored_at = ?, last_access = ? WHERE key = ?",
+                    (now, now, key),
+                )
+        except Exception as e:
+            logger.debug(f"RequestCache.touch failed for {key}: {e}")
+
+    def invalidate(self, url_prefix: str) -> int:
+        """Drop every entry whose URL starts with `url_prefix`."""
+        try:
+            with self._lock, self._conn:
+                cur = self._conn.execute(
+                    "DELETE FROM entries WHERE substr(url, 1, ?) = ?",
+                    (len(url_prefix), url_prefix),
+                )
+                self._total_bytes = None
+                return cur.rowcount
+        except Exception as e:
+            logger.debug(f"RequestCache.invalidate failed for {url_prefix}: {e}")
+            return 0
+
+    def _total_size_locked(self) -> int:
+        if self._total_bytes is None:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._total_bytes = int(row[0])
+        return self._total_bytes
+
+    def _evict_locked(self, max_bytes: int) -> int:
+        total = self._total_size_locked()
+        removed = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        if doomed:
+            with self._conn:
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+            removed = len(doomed)
+        self._total_bytes = total
+        return removed
+
+    def prune(
+        self, max_bytes: int | None = None, older_than: float | None = None
+    ) -> int:
+        """
+        Remove entries not used for `older_than` seconds, then evict least
+        recently used entries until the cache fits in `max_bytes`
+        (default: the configured bound). Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            if older_than is not None:
+                with self._conn:
+                    cur = self._conn.execute(
+                        "DELETE FROM entries WHERE last_access < ?",
+                        (time.time() - older_than,),
+                    )
+                removed += cur.rowcount
+                self._total_bytes = None
+            limit = self.max_bytes if max_bytes is None else max_bytes
+            if limit is not None:
+                removed += self._evict_locked(limit)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """Entry counts and sizes, overall and per endpoint class."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT endpoint, COUNT(*), COALESCE(SUM(size), 0), MIN(last_access), MAX(last_access) "
+                "FROM entries GROUP BY endpoint"
+            ).fetchall()
+        endpoints = {
+            name: {"entries": count, "bytes": size, "oldest_access": oldest, "newest_access": newest}
+            for name, count, size, oldest, newest in rows
+        }
+        return {
+            "path": str(self.db_path),
+            "entries": sum(e["entries"] for e in endpoints.values()),
+            "bytes": sum(e["bytes"] for e in endpoints.values()),
+            "max_bytes": self.max_bytes,
+            "endpoints": endpoints,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
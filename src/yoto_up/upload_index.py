@@ -0,0 +1,133 @@
+"""Persistent index of audio files we have already hashed and transcoded.
+
+Uploading the same audio twice is common (re-building a card from a folder,
+retrying a failed GUI upload), and both hashing a large file and waiting for
+the server to transcode it are slow. The index remembers:
+
+- (path, size, mtime) -> sha256, so unchanged files skip re-hashing
+- (sha256, loudnorm) -> TranscodedAudio payload, so known audio skips the
+  upload-URL request, the upload and the transcode poll entirely.
+
+The server may purge a transcode, so recorded transcodes expire after
+`transcode_max_age` seconds; the audio is then uploaded again and the fresh
+result recorded.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from yoto_up.models import TranscodedAudio
+
+DEFAULT_TRANSCODE_MAX_AGE = 14 * 24 * 3600
+
+
+class UploadIndex:
+    def __init__(
+        self, db_path: str | Path, transcode_max_age: float | None = DEFAULT_TRANSCODE_MAX_AGE
+    ):
+        self.db_path = Path(db_path)
+        # None keeps recorded transcodes forever
+        self.transcode_max_age = transcode_max_age
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS transcodes (
+                    sha256 TEXT NOT NULL,
+                    loudnorm INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (sha256, loudnorm)
+                )"""
+            )
+
+    @staticmethod
+    def _file_key(path: str | Path) -> tuple[str, int, int]:
+        st = os.stat(path)
+        return str(Path(path).resolve()), st.st_size, st.st_mtime_ns
+
+    def get_sha256(self, path: str | Path) -> str | None:
+        """Return the recorded sha256 for `path` if the file is unchanged."""
+        try:
+            key, size, mtime_ns = self._file_key(path)
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, sha256 FROM files WHERE path = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            logger.debug(f"UploadIndex.get_sha256 failed for {path}: {e}")
+            return None
+        if row and row[0] == size and row[1] == mtime_ns:
+            return row[2]
+        return None
+
+    def put_sha256(self, path: str | Path, sha256: str) -> None:
+        try:
+            key, size, mtime_ns = self._file_key(path)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)",
+                    (key, size, mtime_ns, sha256),
+                )
+        except Exception as e:
+            logger.debug(f"UploadIndex.put_sha256 failed for {path}: {e}")
+
+    def get_transcode(self, sha256: str, loudnorm: bool = False) -> TranscodedAudio | None:
+        """Return the known transcode result for audio with this hash, if any.
+
+        Entries older than `transcode_max_age` are dropped and not returned.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT payload, updated_at FROM transcodes WHERE sha256 = ? AND loudnorm = ?",
+                    (sha256, int(bool(loudnorm))),
+                ).fetchone()
+                if row and self.transcode_max_age is not None and (
+                    time.time() - row[1] > self.transcode_max_age
+                ):
+                    with self._conn:
+                        self._conn.execute(
+                            "DELETE FROM transcodes WHERE sha256 = ? AND loudnorm = ?",
+                            (sha256, int(bool(loudnorm))),
+                        )
+                    return None
+            if row:
+                return TranscodedAudio.model_validate(json.loads(row[0]))
+        except Exception as e:
+            logger.debug(f"UploadIndex.get_transcode failed for {sha256}: {e}")
+        return None
+
+    def put_transcode(
+        self, sha256: str, transcoded: TranscodedAudio, loudnorm: bool = False
+    ) -> None:
+        try:
+            payload = json.dumps(transcoded.model_dump(exclude_none=True))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO transcodes (sha256, loudnorm, payload, updated_at) VALUES (?, ?, ?, ?)",
+                    (sha256, int(bool(loudnorm)), payload, time.time()),
+                )
+        except Exception as e:
+            logger.debug(f"UploadIndex.put_transcode failed for {sha256}: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
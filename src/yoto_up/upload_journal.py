@@ -0,0 +1,190 @@
+"""On-disk journal for resumable bulk uploads.
+
+A bulk upload (``yoto create-card-from-folder`` or the GUI upload queue) is a
+long sequence of hash -> upload -> transcode steps. The journal records how
+far each file got so an interrupted job can be resumed without re-uploading or
+re-polling anything that already finished:
+
+- ``hashed``: sha256 recorded along with the file's size/mtime
+- ``uploaded``: the server accepted the file; ``upload_id`` can be polled
+- ``transcoded``: the ``TranscodedAudio`` payload is stored and reused as-is
+
+One JSON-lines file per job lives in ``paths.UPLOAD_JOURNALS_DIR``. The job id
+is a hash of whatever identifies the job (input files, target, options) so the
+same command run again finds the same journal. Each state change appends one
+line, so recording progress costs the same however large the job is; the log
+is replayed and compacted to one line per file when the journal is opened.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from yoto_up import paths
+from yoto_up.models import TranscodedAudio
+
+HASHED = "hashed"
+UPLOADED = "uploaded"
+TRANSCODED = "transcoded"
+
+
+class UploadJournal:
+    def __init__(
+        self,
+        job_id: str,
+        journal_dir: str | Path | None = None,
+        resume: bool = True,
+    ):
+        """
+        Open the journal for `job_id`. With resume=False any existing journal
+        for the job is ignored (and overwritten on the first write).
+        """
+        self.job_id = job_id
+        self.path = Path(journal_dir or paths.UPLOAD_JOURNALS_DIR) / f"{job_id}.jsonl"
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Without resume the old log is replaced by the first write
+        self._truncate = not resume
+        if resume:
+            self._load()
+
+    @staticmethod
+    def job_id_for(*parts: Any) -> str:
+        """Derive a stable job id from the things that identify a job."""
+        blob = json.dumps([str(p) for p in parts], ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+    @staticmethod
+    def key_for(path: str | Path) -> str:
+        return str(Path(path).resolve())
+
+    def _load(self) -> None:
+        try:
+            if not self.path.exists():
+                return
+            n_lines = 0
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    n_lines += 1
+                    try:
+                        record = json.loads(line)
+                        key, fields = record["key"], record["fields"]
+                    except Exception:
+                        # e.g. a line cut short by a crash mid-write
+                        logger.debug(f"Skipping damaged line in upload journal {self.path}")
+                        continue
+                    self._entries.setdefault(key, {}).update(fields)
+            logger.debug(
+                f"Loaded upload journal {self.path} with {len(self._entries)} entries"
+            )
+            if n_lines > len(self._entries):
+                self._compact()
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable upload journal {self.path}: {e}")
+            self._entries = {}
+
+    @staticmethod
+    def _line(key: str, fields: dict[str, Any]) -> str:
+        return json.dumps({"key": key, "fields": fields, "at": time.time()}, ensure_ascii=False) + "\n"
+
+    def _compact(self) -> None:
+        data = "".join(self._line(key, entry) for key, entry in self._entries.items())
+        try:
+            paths.atomic_write(self.path, data, text_mode=True)
+        except Exception as e:
+            logger.warning(f"Failed to compact upload journal {self.path}: {e}")
+
+    def _update(self, key: str, **fields: Any) -> None:
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry.update(fields)
+            try:
+                paths.ensure_parents(self.path)
+                with open(self.path, "w" if self._truncate else "a", encoding="utf-8") as f:
+                    f.write(self._line(key, fields))
+                self._truncate = False
+            except Exception as e:
+                logger.warning(f"Failed to write upload journal {self.path}: {e}")
+
+    def state(self, key: str) -> str | None:
+        with self._lock:
+            return self._entries.get(key, {}).get("state")
+
+    def sha256(self, key: str, path: str | Path) -> str | None:
+        """Return the recorded hash if the file at `path` is unchanged."""
+        with self._lock:
+            entry = dict(self._entries.get(key, {}))
+        if not entry.get("sha256"):
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return entry["sha256"]
+        return None
+
+    def upload_id(self, key: str) -> tuple[str, str] | None:
+        """Return (sha256, upload_id) for a file that was uploaded but not yet transcoded."""
+        with self._lock:
+            entry = self._entries.get(key, {})
+            if entry.get("state") == UPLOADED and entry.get("upload_id"):
+                return entry.get("sha256", ""), entry["upload_id"]
+        return None
+
+    def transcoded(self, key: str) -> TranscodedAudio | None:
+        with self._lock:
+            entry = self._entries.get(key, {})
+            payload = entry.get("transcoded") if entry.get("state") == TRANSCODED else None
+        if payload is None:
+            return None
+        try:
+            return TranscodedAudio.model_validate(payload)
+        except Exception as e:
+            logger.debug(f"Discarding invalid journal transcode for {key}: {e}")
+            return None
+
+    def mark_hashed(self, key: str, path: str | Path, sha256: str) -> None:
+        try:
+            st = os.stat(path)
+            size, mtime_ns = st.st_size, st.st_mtime_ns
+        except OSError:
+            size = mtime_ns = None
+        self._update(key, state=HASHED, sha256=sha256, size=size, mtime_ns=mtime_ns)
+
+    def mark_uploaded(self, key: str, upload_id: str) -> None:
+        self._update(key, state=UPLOADED, upload_id=upload_id)
+
+    def mark_transcoded(self, key: str, transcoded: TranscodedAudio) -> None:
+        self._update(
+            key,
+            state=TRANSCODED,
+            transcoded=transcoded.model_dump(exclude_none=True),
+        )
+
+    def summary(self) -> dict[str, int]:
+        """Count journal entries by state."""
+        counts = {HASHED: 0, UPLOADED: 0, TRANSCODED: 0}
+        with self._lock:
+            for entry in self._entries.values():
+                state = entry.get("state")
+                if state in counts:
+                    counts[state] += 1
+        return counts
+
+    def discard(self) -> None:
+        """Remove the journal once the job has completed."""
+        with self._lock:
+            self._entries = {}
+            try:
+                self.path.unlink(missing_ok=True)
+            except Exception as e:
+                logger.debug(f"Failed to remove upload journal {self.path}: {e}")
@@ -1,107 +1,676 @@
+"""Audio statistics and waveform envelopes for the gain/normalisation tools.
+
+`audio_stats` decodes a file in fixed-size blocks and computes the sample
+peak over all channels, mean absolute amplitude and integrated loudness
+(ITU-R BS.1770 over all channels, as pyloudnorm does) incrementally. Instead of the decoded samples it keeps an `Envelope`:
+a min/max pyramid that is enough to draw the waveform at any width, so the
+memory used per file is bounded regardless of its length.
+"""
+
+import multiprocessing
 import os
-import io
-import base64
-import numpy as np
+import sys
+import shutil
+import struct
+import subprocess
 import contextlib
-import tempfile
 import wave
 from concurrent.futures import ThreadPoolExecutor
 
-def audio_stats(filepath, waveform_cache):
+import numpy as np
+from loguru import logger
+
+# Bump when a change alters the computed statistics or envelope so that
+# persisted results (see analysis_cache) are recomputed
+ANALYSIS_VERSION = 3
+# Samples decoded and analysed at a time
+BLOCK_FRAMES = 1 << 16
+# Upper bound on the number of bins in the finest envelope level; bins are
+# widened as needed so long files never exceed it
+ENVELOPE_MAX_BINS = 1 << 16
+
+
+class Envelope:
+    """Min/max envelope pyramid of a mono signal.
+
+    `levels[0]` holds the (mins, maxs) of consecutive `bin_frames`-sample
+    bins; every further level halves the resolution of the previous one.
     """
-    Calculate waveform, max amplitude, average amplitude, LUFS, extension, and filepath for an audio file.
-    Uses cache if available.
-    Returns (audio, max_amp, avg_amp, lufs, ext, filepath)
+
+    def __init__(self, levels, bin_frames, framerate, n_frames):
+        self.levels = levels
+        self.bin_frames = bin_frames
+        self.framerate = framerate
+        self.n_frames = n_frames
+
+    @classmethod
+    def from_bins(cls, mins, maxs, bin_frames, framerate, n_frames):
+        """Build the pyramid above the finest (mins, maxs) level."""
+        levels = [(mins, maxs)]
+        while len(levels[-1][0]) > 1:
+            levels.append(_halve(*levels[-1]))
+        return cls(levels, bin_frames, framerate, n_frames)
+
+    def __reduce__(self):
+        # Only the finest level crosses process boundaries; the rest of the
+        # pyramid is rebuilt on arrival
+        mins, maxs = self.levels[0]
+        return (Envelope.from_bins, (np.asarray(mins), np.asarray(maxs), self.bin_frames, self.framerate, self.n_frames))
+
+    @property
+    def duration(self):
+        return self.n_frames / float(self.framerate) if self.framerate else 0.0
+
+    def points(self, max_points=2000):
+        """Return (times, mins, maxs) with at most `max_points` bins (when possible).
+
+        Picks the finest pyramid level that fits, so drawing never needs more
+        than about `max_points` values however long the file is.
+        """
+        level = len(self.levels) - 1
+        for i, (mins, _maxs) in enumerate(self.levels):
+            if len(mins) <= max_points:
+                level = i
+                break
+        mins, maxs = self.levels[level]
+        frames = self.bin_frames * (2 ** level)
+        times = (np.arange(len(mins)) + 0.5) * frames / float(self.framerate)
+        times = np.minimum(times, self.duration)
+        return times, mins, maxs
+
+
+def _halve(mins, maxs):
+    """Pairwise-combine neighbouring bins (an odd last bin is kept as is)."""
+    n = len(mins)
+    even = n - (n % 2)
+    new_mins = np.minimum(mins[0:even:2], mins[1:even:2])
+    new_maxs = np.maximum(maxs[0:even:2], maxs[1:even:2])
+    if n % 2:
+        new_mins = np.append(new_mins, mins[-1])
+        new_maxs = np.append(new_maxs, maxs[-1])
+    return new_mins, new_maxs
+
+
+class _EnvelopeBuilder:
+    def __init__(self, max_bins=ENVELOPE_MAX_BINS, bin_frames=256):
+        self.max_bins = max(2, int(max_bins))
+        self.bin_frames = bin_frames
+        self._mins = []
+        self._maxs = []
+        self._count = 0
+        # partially filled bin carried over between blocks
+        self._pmin = np.inf
+        self._pmax = -np.inf
+        self._pn = 0
+
+    def add(self, block):
+        i = 0
+        if self._pn:
+            k = min(self.bin_frames - self._pn, len(block))
+            if k:
+                self._pmin = min(self._pmin, float(block[:k].min()))
+                self._pmax = max(self._pmax, float(block[:k].max()))
+                self._pn += k
+            i = k
+            if self._pn == self.bin_frames:
+                self._emit(np.array([self._pmin]), np.array([self._pmax]))
+                self._pmin, self._pmax, self._pn = np.inf, -np.inf, 0
+        rest = block[i:]
+        n_full = len(rest) // self.bin_frames
+        if n_full:
+            bins = rest[: n_full * self.bin_frames].reshape(n_full, self.bin_frames)
+            self._emit(bins.min(axis=1), bins.max(axis=1))
+        tail = rest[n_full * self.bin_frames:]
+        if len(tail):
+            self._pmin = min(self._pmin, float(tail.min()))
+            self._pmax = max(self._pmax, float(tail.max()))
+            self._pn += len(tail)
+        while self._count > self.max_bins:
+            self._coarsen()
+
+    def _emit(self, mins, maxs):
+        self._mins.append(mins.astype(np.float32))
+        self._maxs.append(maxs.astype(np.float32))
+        self._count += len(mins)
+
+    def _coarsen(self):
+        mins = np.concatenate(self._mins)
+        maxs = np.concatenate(self._maxs)
+        if len(mins) % 2:
+            # the odd full bin becomes the start of the (wider) partial bin
+            self._pmin = min(self._pmin, float(mins[-1]))
+            self._pmax = max(self._pmax, float(maxs[-1]))
+            self._pn += self.bin_frames
+            mins, maxs = mins[:-1], maxs[:-1]
+        mins, maxs = _halve(mins, maxs)
+        self._mins, self._maxs, self._count = [mins], [maxs], len(mins)
+        self.bin_frames *= 2
+
+    def finish(self, framerate, n_frames):
+        if self._pn:
+            self._emit(np.array([self._pmin]), np.array([self._pmax]))
+            self._pmin, self._pmax, self._pn = np.inf, -np.inf, 0
+        if self._mins:
+            mins = np.concatenate(self._mins)
+            maxs = np.concatenate(self._maxs)
+        else:
+            mins = maxs = np.zeros(0, dtype=np.float32)
+        return Envelope.from_bins(mins, maxs, self.bin_frames, framerate, n_frames)
+
+
+def _biquad(kind, fc, gain_db, q, rate):
+    """RBJ biquad coefficients for the BS.1770 K-weighting stages."""
+    A = 10 ** (gain_db / 40.0)
+    w0 = 2.0 * np.pi * (fc / rate)
+    alpha = np.sin(w0) / (2.0 * q)
+    cos_w0 = np.cos(w0)
+    if kind == "high_shelf":
+        b = [
+            A * ((A + 1) + (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha),
+            -2 * A * ((A - 1) + (A + 1) * cos_w0),
+            A * ((A + 1) + (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha),
+        ]
+        a = [
+            (A + 1) - (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha,
+            2 * ((A - 1) - (A + 1) * cos_w0),
+            (A + 1) - (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha,
+        ]
+    else:  # high_pass
+        b = [(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]
+        a = [1 + alpha, -2 * cos_w0, 1 - alpha]
+    return np.array(b) / a[0], np.array(a) / a[0]
+
+
+class LoudnessMeter:
+    """Streaming integrated loudness (ITU-R BS.1770-4).
+
+    Blocks are 1-D (mono) or (frames, channels) arrays. Every channel is
+    K-weighted as it arrives and only the channel-weighted sum of the mean
+    squares of each 100 ms step is kept; the 400 ms gating blocks (75%
+    overlap) and the absolute/relative gates are evaluated in
+    `integrated()`. Channels count equally, except in 5.1 audio (ffmpeg
+    channel order) where LFE is ignored and the surrounds weigh 1.41.
+    Requires scipy (installed with pyloudnorm); constructing the meter
+    raises ImportError without it.
     """
-    if filepath in waveform_cache:
-        return waveform_cache[filepath]
-    ext = os.path.splitext(filepath)[1].lower()
-    try:
-        audio = None
-        framerate = 44100
-        if ext == '.wav':
-            with contextlib.closing(wave.open(filepath, 'rb')) as wf:
-                n_frames = wf.getnframes()
-                framerate = wf.getframerate()
-                frames = wf.readframes(n_frames)
-                sampwidth = wf.getsampwidth()
-                nchannels = wf.getnchannels()
-                if sampwidth == 2:
-                    dtype = np.int16
-                elif sampwidth == 1:
-                    dtype = np.uint8
+
+    def __init__(self, rate):
+        from scipy.signal import lfilter
+
+        self._lfilter = lfilter
+        self._filters = []
+        for kind, fc, gain_db, q in (
+            ("high_shelf", 1500.0, 4.0, 1 / np.sqrt(2)),
+            ("high_pass", 38.0, 0.0, 0.5),
+        ):
+            b, a = _biquad(kind, fc, gain_db, q, rate)
+            self._filters.append([b, a, None])
+        self._step = max(1, int(round(0.1 * rate)))
+        self._carry = None
+        self._weights = None
+        self._energies = []
+
+    def add(self, block):
+        y = np.asarray(block, dtype=np.float64)
+        if y.ndim == 1:
+            y = y[:, None]
+        if self._weights is None:
+            channels = y.shape[1]
+            self._weights = np.ones(channels)
+            if channels == 6:
+                self._weights[:] = (1.0, 1.0, 1.0, 0.0, 1.41, 1.41)
+            for f in self._filters:
+                f[2] = np.zeros((2, channels))
+            self._carry = np.zeros((0, channels))
+        for f in self._filters:
+            y, f[2] = self._lfilter(f[0], f[1], y, axis=0, zi=f[2])
+        if len(self._carry):
+            y = np.concatenate([self._carry, y])
+        n = len(y) // self._step
+        if n:
+            sq = y[: n * self._step] ** 2
+            steps = sq.reshape(n, self._step, -1).mean(axis=1)
+            self._energies.append(steps @ self._weights)
+        self._carry = y[n * self._step:]
+
+    def integrated(self):
+        """Integrated loudness in LUFS, or None for silence or < 400 ms of audio."""
+        if not self._energies:
+            return None
+        z = np.concatenate(self._energies)
+        if len(z) < 4:
+            return None
+        blocks = np.convolve(z, np.ones(4) / 4.0, mode="valid")
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10.0 * np.log10(blocks)
+        above_abs = loudness >= -70.0
+        if not above_abs.any():
+            return None
+        rel_gate = -0.691 + 10.0 * np.log10(blocks[above_abs].mean()) - 10.0
+        gated = blocks[above_abs & (loudness > rel_gate)]
+        if not len(gated):
+            return None
+        return float(-0.691 + 10.0 * np.log10(gated.mean()))
+
+
+def _iter_wav_blocks(filepath, block_frames, mono=True):
+    wf = wave.open(filepath, "rb")
+    framerate = wf.getframerate()
+    sampwidth = wf.getsampwidth()
+    nchannels = wf.getnchannels()
+
+    def blocks():
+        with contextlib.closing(wf):
+            while True:
+                frames = wf.readframes(block_frames)
+                if not frames:
+                    break
+                if sampwidth == 1:
+                    audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+                elif sampwidth == 3:
+                    raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+                    ints = (
+                        raw[:, 0].astype(np.int32)
+                        | (raw[:, 1].astype(np.int32) << 8)
+                        | (raw[:, 2].astype(np.int32) << 16)
+                    )
+                    ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+                    audio = ints.astype(np.float32) / 8388608.0
+                elif sampwidth == 4:
+                    audio = np.frombuffer(frames, dtype=np.int32).astype(np.float32) / 2147483648.0
                 else:
-                    dtype = np.int16
-                audio = np.frombuffer(frames, dtype=dtype)
-                if nchannels > 1:
-                    audio = audio.reshape(-1, nchannels).mean(axis=1)
-                # Normalize
-                if dtype == np.int16:
-                    audio = audio.astype(np.float32) / 32768.0
-                elif dtype == np.uint8:
-                    audio = (audio.astype(np.float32) - 128) / 128.0
-        elif ext == '.mp3':
+                    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+                audio = audio.reshape(-1, nchannels)
+                yield audio.mean(axis=1, dtype=np.float32) if mono else audio
+
+    return framerate, blocks()
+
+
+def _iter_array_blocks(audio, block_frames):
+    for i in range(0, len(audio), block_frames):
+        yield audio[i:i + block_frames]
+
+
+def _ffmpeg_executable():
+    """Path of the ffmpeg binary on PATH or bundled by ffmpeg-binaries, else None."""
+    exe = shutil.which("ffmpeg")
+    if exe:
+        return exe
+    try:
+        import ffmpeg  # ffmpeg-binaries; importing does not download anything
+
+        if ffmpeg.FFMPEG_PATH and os.path.exists(ffmpeg.FFMPEG_PATH):
+            return str(ffmpeg.FFMPEG_PATH)
+    except Exception:
+        pass
+    return None
+
+
+def _read_exactly(stream, n):
+    chunks = []
+    while n > 0:
+        chunk = stream.read(n)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def _iter_ffmpeg_blocks(filepath, block_frames, sample_rate=None, ffmpeg_exe=None, offset=None, duration=None, mono=True):
+    """Decode any format ffmpeg understands into float32 blocks.
+
+    ffmpeg (resampling to `sample_rate` if given) writes a float WAV stream
+    to a pipe; the header gives the rate and channel count and the samples
+    are read straight into NumPy buffers block by block and downmixed by
+    averaging channels, like the other decoders (ffmpeg's own `-ac 1` mixes
+    at -3 dB per channel, which would change peak and loudness figures).
+    With `mono=False` blocks are (frames, channels) arrays instead.
+    `offset`/`duration` (seconds) make ffmpeg seek before decoding; a
+    negative offset counts from the end of the file (`-sseof`).
+    Returns (framerate, iterator) or None when ffmpeg cannot decode the file.
+    """
+    cmd = [
+        ffmpeg_exe or _ffmpeg_executable(),
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+    ]
+    if offset:
+        cmd += ["-sseof" if offset < 0 else "-ss", f"{offset:.6f}"]
+    if duration is not None:
+        cmd += ["-t", f"{duration:.6f}"]
+    cmd += [
+        "-i",
+        str(filepath),
+        "-map",
+        "0:a:0",
+    ]
+    if sample_rate:
+        cmd += ["-ar", str(int(sample_rate))]
+    cmd += ["-c:a", "pcm_f32le", "-f", "wav", "pipe:1"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def _close():
+        try:
+            proc.stdout.close()
+        except Exception:
+            pass
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+    framerate = channels = None
+    try:
+        if _read_exactly(proc.stdout, 12)[8:12] != b"WAVE":
+            _close()
+            return None
+        while True:
+            header = _read_exactly(proc.stdout, 8)
+            if len(header) < 8:
+                _close()
+                return None
+            chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+            if chunk_id == b"data":
+                break
+            body = _read_exactly(proc.stdout, size + (size % 2))
+            if chunk_id == b"fmt ":
+                channels, framerate = struct.unpack("<HI", body[2:8])
+    except Exception:
+        _close()
+        raise
+    if not framerate or not channels:
+        _close()
+        return None
+
+    def blocks():
+        try:
+            frame_bytes = 4 * channels
+            while True:
+                data = _read_exactly(proc.stdout, block_frames * frame_bytes)
+                n = len(data) // frame_bytes
+                if not n:
+                    break
+                block = np.frombuffer(data[: n * frame_bytes], dtype=np.float32).reshape(n, channels)
+                yield block.mean(axis=1, dtype=np.float32) if mono else block
+        finally:
+            _close()
+
+    return framerate, blocks()
+
+
+def can_decode(ext):
+    """Whether files with extension `ext` can be analysed here."""
+    return _ffmpeg_executable() is not None or ext in (".wav", ".mp3")
+
+
+def _iter_blocks(filepath, ext, block_frames=BLOCK_FRAMES, sample_rate=None, mono=True):
+    """Return (framerate, iterator of float32 blocks), or None if unsupported.
+
+    Blocks are mono, or (frames, channels) arrays with `mono=False`. Every
+    format is decoded by streaming PCM from ffmpeg. Without ffmpeg, WAV
+    files are read incrementally and MP3 is decoded with pydub (or librosa)
+    and handed out in blocks; `sample_rate` is then ignored.
+    """
+    ffmpeg_exe = _ffmpeg_executable()
+    if ffmpeg_exe:
+        return _iter_ffmpeg_blocks(filepath, block_frames, sample_rate, ffmpeg_exe, mono=mono)
+    if ext == ".wav":
+        return _iter_wav_blocks(filepath, block_frames, mono=mono)
+    if ext == ".mp3":
+        try:
+            from pydub import AudioSegment
+            audio_seg = AudioSegment.from_file(filepath, format="mp3")
+            samples = np.array(audio_seg.get_array_of_samples())
+            audio = samples.reshape((-1, audio_seg.channels)).astype(np.float32)
+            if audio_seg.sample_width == 2:
+                audio = audio / 32768.0
+            elif audio_seg.sample_width == 1:
+                audio = (audio - 128) / 128.0
+            framerate = audio_seg.frame_rate
+        except Exception:
             try:
-                from pydub import AudioSegment
-                audio_seg = AudioSegment.from_file(filepath, format='mp3')
-                samples = np.array(audio_seg.get_array_of_samples())
-                if audio_seg.channels > 1:
-                    samples = samples.reshape((-1, audio_seg.channels)).mean(axis=1)
-                audio = samples.astype(np.float32)
-                # Normalize
-                if audio_seg.sample_width == 2:
-                    audio = audio / 32768.0
-                elif audio_seg.sample_width == 1:
-                    audio = (audio - 128) / 128.0
-                framerate = audio_seg.frame_rate
+                import librosa
+                audio, framerate = librosa.load(filepath, sr=None, mono=False)
+                audio = audio.T if audio.ndim > 1 else audio[:, None]
             except Exception:
-                try:
-                    import librosa
-                    audio, framerate = librosa.load(filepath, sr=None, mono=True)
-                except Exception:
-                    return None, None, None, None, None, None
+                return None
+        if mono:
+            audio = audio.mean(axis=1, dtype=np.float32)
+        return framerate, _iter_array_blocks(audio, block_frames)
+    return None
+
+
+def load_audio(filepath, sample_rate=None, offset=None, duration=None):
+    """Decode a file to mono float32; returns (audio, framerate) or (None, None).
+
+    Only for callers that need the samples themselves (e.g. writing a
+    gain-adjusted copy); statistics and waveforms should use `audio_stats`.
+    `sample_rate` resamples while decoding (default: the file's own rate).
+    `offset`/`duration` in seconds restrict decoding to part of the file; a
+    negative offset is measured from the end. With ffmpeg only that part is
+    decoded; the fallback decoders decode everything and slice.
+    """
+    ext = os.path.splitext(filepath)[1].lower()
+    try:
+        ffmpeg_exe = _ffmpeg_executable()
+        if ffmpeg_exe:
+            decoded = _iter_ffmpeg_blocks(
+                filepath, BLOCK_FRAMES, sample_rate, ffmpeg_exe, offset=offset, duration=duration
+            )
         else:
+            decoded = _iter_blocks(filepath, ext)
+        if decoded is None:
+            return None, None
+        framerate, blocks = decoded
+        parts = list(blocks)
+        audio = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        if not ffmpeg_exe and (offset or duration is not None):
+            start = int(round((offset or 0.0) * framerate))
+            if start < 0:
+                start = max(0, len(audio) + start)
+            stop = len(audio) if duration is None else start + int(round(duration * framerate))
+            audio = audio[start:stop]
+        return audio, framerate
+    except Exception:
+        return None, None
+
+
+def audio_stats(filepath, waveform_cache, block_frames=BLOCK_FRAMES, max_envelope_bins=ENVELOPE_MAX_BINS, disk_cache=None):
+    """
+    Calculate the waveform envelope, max amplitude, average amplitude, LUFS, extension and filepath for an audio file.
+    The envelope and average amplitude describe the mono downmix; max
+    amplitude is the sample peak of any channel and LUFS the BS.1770
+    loudness over all channels.
+    Uses cache if available: the in-process `waveform_cache` dict first, then
+    `disk_cache` (an `analysis_cache.AnalysisCache`), which is also updated.
+    Returns (envelope, max_amp, avg_amp, lufs, ext, filepath) where envelope is an `Envelope`.
+    """
+    if filepath in waveform_cache:
+        return waveform_cache[filepath]
+    if disk_cache is not None:
+        cached = disk_cache.get(filepath)
+        if cached is not None:
+            waveform_cache[filepath] = cached
+            return cached
+    ext = os.path.splitext(filepath)[1].lower()
+    try:
+        decoded = _iter_blocks(filepath, ext, block_frames, mono=False)
+        if decoded is None:
             return None, None, None, None, None, None
-        if audio is None or len(audio) == 0:
+        framerate, blocks = decoded
+        envelope = _EnvelopeBuilder(max_envelope_bins)
+        try:
+            meter = LoudnessMeter(framerate)
+        except Exception:
+            meter = None
+        n_frames = 0
+        peak = 0.0
+        abs_sum = 0.0
+        for block in blocks:
+            if not len(block):
+                continue
+            n_frames += len(block)
+            peak = max(peak, float(np.abs(block).max()))
+            mono = block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+            abs_sum += float(np.abs(mono).sum(dtype=np.float64))
+            envelope.add(mono)
+            if meter is not None:
+                meter.add(block)
+        if n_frames == 0:
             result = (None, None, None, None, ext, filepath)
             waveform_cache[filepath] = result
             return result
-        # Remove DC offset and check for silence
-        audio = audio - np.mean(audio)
-        if np.allclose(audio, 0):
-            lufs = None
-        else:
-            try:
-                import pyloudnorm as pyln
-                meter = pyln.Meter(framerate)
-                lufs = float(meter.integrated_loudness(audio))
-            except Exception:
-                lufs = None
-        max_amp = float(np.max(np.abs(audio)))
-        avg_amp = float(np.mean(np.abs(audio)))
-        result = (audio, max_amp, avg_amp, lufs, ext, filepath)
+        # silence has no meaningful loudness
+        lufs = meter.integrated() if meter is not None and peak > 1e-8 else None
+        max_amp = peak
+        avg_amp = abs_sum / n_frames
+        result = (envelope.finish(framerate, n_frames), max_amp, avg_amp, lufs, ext, filepath)
         waveform_cache[filepath] = result
+        if disk_cache is not None:
+            disk_cache.put(filepath, result)
         return result
     except Exception:
         result = (None, None, None, None, None, None)
         waveform_cache[filepath] = result
         return result
 
-def batch_audio_stats(files, waveform_cache, progress_callback=None):
+def _compute_stats(filepath):
+    """Process-pool entry point: analyse one file without any shared cache."""
+    return audio_stats(filepath, {})
+
+
+def _warn_pool_failed(error, remaining):
+    logger.warning(
+        f"Worker processes failed ({type(error).__name__}: {error}); "
+        f"running the remaining {remaining} items on threads"
+    )
+
+
+def run_pooled(items, fn, progress_callback=None, max_workers=None, executor="auto", on_result=None):
+    """Call `fn(item)` for every distinct item in a worker pool.
+
+    Returns the results in `items` order; repeated items are computed once.
+    Up to `max_workers` workers (default: CPU count) are used and `executor`
+    selects the pool:
+
+    - "process": a process pool, so CPU-bound work runs on all cores; `fn`
+      must be a picklable top-level callable and should return compact
+      results rather than sample arrays
+    - "thread": a thread pool in this process
+    - "auto" (default): processes, except in frozen (bundled) builds or when
+      there is only one item
+
+    Worker processes are spawned, not forked. If they cannot be started, or
+    one dies, the remaining items run on threads; an exception raised by
+    `fn` is re-raised. `on_result(item, result)` and then `progress_callback(done,
+    total)` are called from the calling thread as each item finishes.
+    """
+    from concurrent.futures import as_completed, ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    total = len(items)
+    results = [None] * total
+    pending = {}
+    for i, item in enumerate(items):
+        pending.setdefault(item, []).append(i)
+    if not pending:
+        return results
+
+    if executor == "auto":
+        frozen = bool(getattr(sys, "frozen", False))
+        executor = "thread" if frozen or len(pending) == 1 else "process"
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(pending)))
+    done = 0
+
+    def _finish(item, result):
+        nonlocal done
+        if on_result is not None:
+            on_result(item, result)
+        for i in pending.pop(item):
+            results[i] = result
+            done += 1
+            if progress_callback:
+                progress_callback(done, total)
+
+    if executor == "process":
+        pool = futures = None
+        try:
+            # Spawned rather than forked: callers run in threaded processes
+            # (the GUI), and a forked worker could inherit a lock that another
+            # thread held at the time
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            futures = {pool.submit(fn, item): item for item in pending}
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            # e.g. the platform cannot start worker processes
+            _warn_pool_failed(e, len(pending))
+        if pool is not None:
+            try:
+                for future in as_completed(futures or ()):
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        # A worker died; errors raised by `fn` itself propagate
+                        _warn_pool_failed(e, len(pending))
+                        break
+                    _finish(futures[future], result)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(fn, item): item for item in list(pending)}
+            for future in as_completed(futures):
+                _finish(futures[future], future.result())
+    return results
+
+
+def batch_audio_stats(files, waveform_cache, progress_callback=None, disk_cache=None, max_workers=None, executor="auto"):
     """
     Calculate audio stats for a list of files in parallel, updating progress via callback.
     Returns a list of results in the same order as files.
+
+    Files found in `waveform_cache` or `disk_cache` are not analysed again;
+    the rest are spread over up to `max_workers` workers (default: CPU count)
+    by `run_pooled`, which documents `executor`. In worker processes only
+    the compact results (stats and envelope) are sent back, never sample
+    arrays.
     """
-    from concurrent.futures import as_completed
-    stats_results = [None] * len(files)
-    with ThreadPoolExecutor() as executor:
-        future_to_idx = {executor.submit(audio_stats, f, waveform_cache): i for i, f in enumerate(files)}
-        completed = 0
-        total = len(files)
-        for future in as_completed(future_to_idx):
-            idx = future_to_idx[future]
-            stats_results[idx] = future.result()
+    total = len(files)
+    stats_results = [None] * total
+    completed = 0
+    pending = []
+    for i, f in enumerate(files):
+        cached = waveform_cache.get(f)
+        if cached is None and disk_cache is not None:
+            cached = disk_cache.get(f)
+            if cached is not None:
+                waveform_cache[f] = cached
+        if cached is not None:
+            stats_results[i] = cached
             completed += 1
             if progress_callback:
                 progress_callback(completed, total)
+        else:
+            pending.append(i)
+    if not pending:
+        return stats_results
+
+    def _store(f, result):
+        waveform_cache[f] = result
+        if disk_cache is not None and result[0] is not None:
+            disk_cache.put(f, result)
+
+    def _progress(done, _):
+        if progress_callback:
+            progress_callback(completed + done, total)
+
+    computed = run_pooled(
+        [files[i] for i in pending], _compute_stats, _progress, max_workers, executor, on_result=_store
+    )
+    for i, result in zip(pending, computed):
+        stats_results[i] = result
     return stats_results
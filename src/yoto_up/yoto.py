@@ -4,6 +4,7 @@ import typer
 from yoto_up.models import Card, CardContent, CardMetadata, Chapter
 from yoto_up.tui import EditCardApp
 from yoto_up.yoto_api import YotoAPI
+from yoto_up.request_cache import RECOMMENDED_TTLS
 from yoto_up.logging_setup import setup_logging
 from rich import print as rprint
 from rich.console import Console
@@ -43,9 +44,13 @@ def analyze_gain_requirements(
     target_lufs: float = -16.0,
     strategy: str = "auto",
     target_peak: float = 0.9,
+    max_workers: Optional[int] = None,
 ):
     """Perform a pre-adjustment analysis for the given audio files.
 
+    Files are analysed in parallel worker processes (up to `max_workers`,
+    default CPU count); results cached from earlier runs are reused.
+
     Returns a dict mapping filepath -> {lufs, max_amp, avg_amp, recommended_gain_db}.
     If strategy == 'lufs', recommendation is target_lufs - file_lufs when LUFS is available; files without LUFS
     will have recommended_gain_db set to None.
@@ -54,11 +59,14 @@ def analyze_gain_requirements(
     """
     try:
         from yoto_up.waveform_utils import batch_audio_stats
+        from yoto_up.analysis_cache import get_analysis_cache
     except Exception:
         raise RuntimeError("waveform_utils unavailable; cannot analyze audio")
 
     waveform_cache = {}
-    stats = batch_audio_stats(paths, waveform_cache)
+    stats = batch_audio_stats(
+        paths, waveform_cache, disk_cache=get_analysis_cache(), max_workers=max_workers
+    )
     plan = {}
     for audio, max_amp, avg_amp, lufs, ext, filepath in stats:
         rec_gain = None
@@ -117,12 +125,14 @@ def apply_gain_plan(
 ):
     """Apply gain adjustments described by `plan` to files, writing to out_dir.
 
+    Each file's `recommended_gain_db` is applied as-is in a single ffmpeg
+    pass (see `AudioNormalizer.apply_gain`), keeping tags and cover art.
+
     Returns list of written paths (or planned paths in dry-run).
     """
-    try:
-        from pydub import AudioSegment
-    except Exception:
-        raise RuntimeError("pydub is required to apply gain adjustments")
+    from yoto_up.normalization import AudioNormalizer
+
+    normalizer = AudioNormalizer()
 
     os.makedirs(out_dir, exist_ok=True)
     written = []
@@ -142,10 +152,7 @@ def apply_gain_plan(
                     except Exception:
                         pass
                 continue
-            seg = AudioSegment.from_file(filepath)
-            seg = seg.apply_gain(gain_db)
-            fmt = ext.lstrip(".") or "mp3"
-            seg.export(dest_path, format=fmt)
+            normalizer.apply_gain(filepath, dest_path, gain_db)
             written.append(dest_path)
             if progress_callback:
                 try:
@@ -172,7 +179,15 @@ def main(
         True, "--cache-requests", "-r", help="Enable API request caching"
     ),
     cache_max_age_seconds: int = typer.Option(
-        0, "--cache-max-age-seconds", "-a", help="Max cache age in seconds"
+        0,
+        "--cache-max-age-seconds",
+        "-a",
+        help="Serve cached responses younger than this without revalidating (0 always revalidates)",
+    ),
+    cache_endpoint_ttls: bool = typer.Option(
+        False,
+        "--cache-endpoint-ttls",
+        help="Serve cached card lists, cards and icons for per-endpoint TTLs without revalidating",
     ),
     debug: bool = typer.Option(False, "--debug", "-d", help="Enable debug mode"),
     verbose: int = typer.Option(
@@ -185,13 +200,33 @@ def main(
     quiet: int = typer.Option(
         0, "-q", "--quiet", help="Reduce logging output (repeat to silence)", count=True
     ),
+    api_rate: float = typer.Option(
+        10.0, "--api-rate", help="Max requests/second to api.yotoplay.com (0 disables limiting)"
+    ),
+    cdn_rate: float = typer.Option(
+        20.0, "--cdn-rate", help="Max requests/second to media/icon CDNs and upload URLs"
+    ),
+    yotoicons_rate: float = typer.Option(
+        4.0, "--yotoicons-rate", help="Max requests/second to yotoicons.com"
+    ),
+    max_retries: int = typer.Option(
+        4, "--max-retries", help="Retries for throttled (429) or transient 5xx/network failures"
+    ),
 ):
     global api_options
     api_options = dict(
         client_id=client_id,
         cache_requests=cache_requests,
         cache_max_age_seconds=cache_max_age_seconds,
+        cache_ttls=RECOMMENDED_TTLS if cache_endpoint_ttls else None,
         debug=debug,
+        # Burst allows short spikes of up to two seconds' worth of requests
+        rate_limits={
+            "api": (api_rate, max(1, int(api_rate * 2))),
+            "cdn": (cdn_rate, max(1, int(cdn_rate * 2))),
+            "yotoicons": (yotoicons_rate, max(1, int(yotoicons_rate * 2))),
+        },
+        max_retries=max_retries,
     )
     # Configure logging early based on CLI options/env
     try:
@@ -251,18 +286,12 @@ def get_cards(
     cards = API.get_myo_content()
 
     # If caller asked to filter by tags or category, the summary objects returned
-    # by get_myo_content() may omit nested metadata/tags. In that case fetch
-    # full card objects so filters can inspect metadata reliably.
+    # by get_myo_content() may omit nested metadata/tags. In that case use full
+    # card objects (from the local card store unless changed) so filters can
+    # inspect metadata reliably.
     if (tags is not None or category is not None) and cards:
         try:
-            full_cards = []
-            for c in cards:
-                try:
-                    full = API.get_card(getattr(c, "cardId", None))
-                    full_cards.append(full or c)
-                except Exception:
-                    full_cards.append(c)
-            cards = full_cards
+            cards = API.get_cards_synced(cards)
         except Exception:
             # fallback: leave summary cards in place
             pass
@@ -386,18 +415,7 @@ def list_cards(
         return
 
     if include_chapters:
-        full_cards = []
-        API = get_api()
-        for summary_card in cards:
-            try:
-                full_card = API.get_card(summary_card.cardId)
-                if full_card:
-                    full_cards.append(full_card)
-                else:
-                    full_cards.append(summary_card)
-            except Exception:
-                full_cards.append(summary_card)
-        cards = full_cards
+        cards = get_api().get_cards_synced(cards)
 
     if table:
         rich_table = Table(title="Yoto Cards")
@@ -1205,6 +1223,7 @@ def export_cards(
     regex: bool = typer.Option(False, help="Use regex for name filtering"),
     path: str = typer.Option("cards", help="Path to export JSON file (optional)"),
     include_name: bool = typer.Option(True, help="Include card name in export"),
+    concurrency: int = typer.Option(8, help="Number of cards fetched in parallel"),
 ):
     API = get_api()
     cards = get_cards(name, ignore_case, regex)
@@ -1213,8 +1232,12 @@ def export_cards(
     if not cards:
         typer.echo("No cards found.")
         return
-    for summary_card in cards:
-        card = API.get_card(summary_card.cardId)
+    for summary_card, card in zip(
+        cards, API.get_cards_synced(cards, concurrency=concurrency)
+    ):
+        if card is summary_card:
+            # Details couldn't be synced; fetch directly so the error surfaces
+            card = API.get_card(summary_card.cardId)
         if include_name and card.title:
             export_path = (
                 export_dir
@@ -1333,6 +1356,67 @@ def paths(
             typer.echo(f"{k}: {v}")
 
 
+@app.command()
+def cache(
+    verb: str = typer.Argument(..., help="Action: stats|prune|clear"),
+    max_mb: float = typer.Option(
+        None, "--max-mb", help="prune: evict least recently used entries down to this size"
+    ),
+    older_than_days: float = typer.Option(
+        None, "--older-than-days", help="prune: remove entries not used for this many days"
+    ),
+    json_out: bool = typer.Option(False, "--json", help="Output stats as JSON"),
+):
+    """Inspect and trim the on-disk API request cache.
+
+    Actions:
+        stats: show entry counts and sizes per endpoint class
+        prune: drop entries older than --older-than-days, then evict least
+               recently used entries until the cache fits in --max-mb
+               (default: the configured size bound)
+        clear: remove every cached response
+    """
+    from yoto_up.request_cache import RequestCache
+    import yoto_up.paths as paths_mod
+
+    store = RequestCache(paths_mod.API_CACHE_FILE)
+    try:
+        verb_l = (verb or "").lower()
+        if verb_l == "stats":
+            stats = store.stats()
+            if json_out:
+                typer.echo(json.dumps(stats, indent=2))
+                return
+            table = Table(title=f"API cache: {stats['path']}")
+            table.add_column("Endpoint")
+            table.add_column("Entries", justify="right")
+            table.add_column("Size (KB)", justify="right")
+            for name, info in sorted(stats["endpoints"].items()):
+                table.add_row(name, str(info["entries"]), f"{info['bytes'] / 1024:.1f}")
+            table.add_row(
+                "[bold]total[/bold]",
+                str(stats["entries"]),
+                f"{stats['bytes'] / 1024:.1f} / {stats['max_bytes'] / 1024:.0f}",
+            )
+            console.print(table)
+            return
+        if verb_l == "prune":
+            removed = store.prune(
+                max_bytes=int(max_mb * 1024 * 1024) if max_mb is not None else None,
+                older_than=older_than_days * 86400 if older_than_days is not None else None,
+            )
+            typer.echo(f"Removed {removed} cached responses")
+            return
+        if verb_l == "clear":
+            store.clear()
+            typer.echo("API cache cleared")
+            return
+        typer.echo(f"Unknown action: {verb}. Use stats, prune or clear.")
+        raise typer.Exit(code=1)
+    finally:
+        store.close()
+
+
 @app.command()
 def versions(
     verb: str = typer.Argument(
@@ -1531,8 +1615,23 @@ def create_card_from_folder(
     local_norm_batch: bool = typer.Option(
         False, help="Use batch mode for local normalization"
     ),
+    local_norm_workers: Optional[int] = typer.Option(
+        None,
+        "--local-norm-workers",
+        help="Files to normalize concurrently with --local-norm (default: CPU count)",
+    ),
+    local_norm_strict: bool = typer.Option(
+        False,
+        "--local-norm-strict",
+        help="Abort if any file fails local normalization instead of uploading it un-normalized",
+    ),
+    resume: bool = typer.Option(
+        False,
+        help="Resume an interrupted run for the same folder, skipping files already uploaded/transcoded",
+    ),
 ):
-    from yoto_up.normalization import AudioNormalizer
+    from yoto_up.normalization import AudioNormalizer, NormalizationError, cached_measurements
+    from yoto_up.upload_journal import UploadJournal
 
     async def async_main():
         API = get_api()
@@ -1557,6 +1656,25 @@ def create_card_from_folder(
             typer.echo(f"[bold red]No media files found in folder: {folder}[/bold red]")
             raise typer.Exit(code=1)
 
+        # Journal per-file progress keyed by the source files, so a resumed run
+        # still matches entries when local normalization writes new temp files.
+        journal_keys = [UploadJournal.key_for(f) for f in media_files]
+        journal = UploadJournal(
+            UploadJournal.job_id_for(
+                folder_path.resolve(),
+                *journal_keys,
+                loudnorm,
+                local_norm and local_norm_target,
+                local_norm and local_norm_batch,
+            ),
+            resume=resume,
+        )
+        if resume:
+            done = journal.summary()
+            typer.echo(
+                f"Resuming: {done['transcoded']} transcoded, {done['uploaded']} awaiting transcode"
+            )
+
         temp_norm_dir = None
         if local_norm:
             typer.echo(
@@ -1565,15 +1683,36 @@ def create_card_from_folder(
             try:
                 temp_norm_dir = tempfile.mkdtemp(prefix="yoto_norm_")
                 normalizer = AudioNormalizer(
-                    target_level=local_norm_target, batch_mode=local_norm_batch
+                    target_level=local_norm_target,
+                    batch_mode=local_norm_batch,
+                    max_workers=local_norm_workers,
                 )
                 media_files_str = [str(f) for f in media_files]
 
+                # Files analysed earlier (e.g. by `normalize --auto`) skip the
+                # measurement pass
                 normalized_files = await asyncio.to_thread(
-                    normalizer.normalize, media_files_str, temp_norm_dir
+                    normalizer.normalize,
+                    media_files_str,
+                    temp_norm_dir,
+                    measurements=cached_measurements(media_files_str),
                 )
                 media_files = [Path(f) for f in normalized_files]
                 typer.echo("Normalization complete.")
+            except NormalizationError as e:
+                for path, err in e.errors.items():
+                    typer.echo(f"[bold red]Normalization failed for {path}: {err}[/bold red]")
+                if local_norm_strict:
+                    if temp_norm_dir:
+                        shutil.rmtree(temp_norm_dir)
+                    raise typer.Exit(code=1)
+                # Upload the files that normalized; fall back to originals for the rest
+                media_files = [
+                    Path(out) if out else src for out, src in zip(e.output_paths, media_files)
+                ]
+                typer.echo(
+                    f"Normalization failed for {len(e.errors)} file(s); uploading those un-normalized."
+                )
             except Exception as e:
                 typer.echo(f"[bold red]Normalization failed: {e}[/bold red]")
                 if temp_norm_dir:
@@ -1602,6 +1741,8 @@ def create_card_from_folder(
                 poll_interval=poll_interval,
                 max_attempts=max_attempts,
                 show_progress=True,
+                journal=journal,
+                journal_keys=journal_keys,
             )
             for idx, (media_file, transcoded_audio) in enumerate(
                 zip(media_files, transcoded_audios), len(tracks) + 1
@@ -1627,6 +1768,8 @@ def create_card_from_folder(
                 poll_interval=poll_interval,
                 max_attempts=max_attempts,
                 show_progress=True,
+                journal=journal,
+                journal_keys=journal_keys,
             )
             for idx, (media_file, transcoded_audio) in enumerate(
                 zip(media_files, transcoded_audios), len(chapters) + 1
@@ -1656,6 +1799,7 @@ def create_card_from_folder(
             result = API.create_or_update_content(new_card, return_card=True)
         typer.echo(f"[bold green]Card created: {result.cardId}[/bold green]")
         print(result.model_dump_json(exclude_none=True))
+        journal.discard()
 
         if temp_norm_dir and os.path.exists(temp_norm_dir):
             shutil.rmtree(temp_norm_dir)
@@ -2045,6 +2189,10 @@ def normalize(
       python -m yoto_up.yoto normalize *.mp3 --auto
       python -m yoto_up.yoto normalize *.mp3 --auto --apply --dest /tmp/adjusted
       python -m yoto_up.yoto normalize *.mp3 --gain-db -3.0
+
+    --apply writes each file with its applied gain in a single ffmpeg pass,
+    using the measurements from the analysis (which are cached, so a later
+    run skips decoding unchanged files).
     """
     # Validate input
     if not files:
@@ -2515,6 +2663,8 @@ def split_audio(
     min_silence_len_ms: int = 1000,
     silence_thresh_db: int = -40,
     output_name_template: Optional[str] = None,
+    single_pass: bool = typer.Option(True, "--single-pass/--per-segment", help="Write all segments from one ffmpeg run (segment muxer) instead of one run per segment"),
+    max_workers: Optional[int] = typer.Option(None, "--max-workers", help="Segments to extract concurrently when extracting per segment (default: min(4, CPU count))"),
 ):
     """
     Split an audio file into multiple segments based on silence detection.
@@ -2535,6 +2685,8 @@ def split_audio(
         min_silence_len_ms=min_silence_len_ms,
         silence_thresh_db=silence_thresh_db,
         output_name_template=output_name_template,
+        single_pass=single_pass,
+        max_workers=max_workers,
     )
     if files:
         rprint(f"Created {len(files)} segment(s):")
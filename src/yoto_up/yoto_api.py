@@ -7,8 +7,11 @@ import json
 from pathlib import Path
 import hashlib
 import io
+import random
 import re
 import threading
+import dataclasses
+from dataclasses import dataclass
 from typing import Optional, Callable, Literal
 
 from loguru import logger
@@ -54,6 +57,17 @@ except (AssertionError, ModuleNotFoundError):
 
 
 from yoto_up.icons import render_icon
+from yoto_up.upload_index import UploadIndex
+from yoto_up.card_store import CardStore
+from yoto_up.request_cache import DEFAULT_MAX_BYTES, RequestCache, is_cacheable
+from yoto_up.rate_limit import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+    RetryPolicy,
+    retry_after_seconds,
+)
+from yoto_up.upload_journal import UploadJournal
 from yoto_up.audio_splitter import split_audio as _split_audio_file
 import asyncio
 
@@ -62,6 +76,17 @@ from datetime import datetime, timezone
 # Centralized per-user paths
 import yoto_up.paths as paths
 
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it.
+try:
+    import h2  # noqa: F401
+
+    _HAVE_H2 = True
+except ImportError:
+    _HAVE_H2 = False
+
+# Guards lazy creation of the pooled HTTP clients on YotoAPI instances
+_CLIENT_INIT_LOCK = threading.Lock()
+
 # Helper: recursively detect unexpected (extra) fields in input data against a Pydantic model
 from typing import Any, List, Type, get_origin, get_args
 from pydantic import BaseModel
@@ -270,6 +295,189 @@ def has_extra_fields(model: Type[BaseModel], data: Any) -> bool:
     return bool(find_extra_fields(model, data))
 
 
+@dataclass
+class _PendingTranscode:
+    upload_id: str
+    loudnorm: bool
+    future: asyncio.Future
+    started: float
+    deadline: float
+    next_due: float
+    delay: float = 0.0
+    attempts: int = 0
+    last_percent: float | None = None
+    last_percent_at: float | None = None
+    last_data: Any = None
+    listeners: list = dataclasses.field(default_factory=list)
+
+
+class _TranscodePoller:
+    """Polls every outstanding transcode for one event loop from a single task.
+
+    Each upload gets its own schedule: exponential backoff (with jitter) while
+    the server reports nothing useful, and a next-poll estimate derived from
+    the reported ``progress.percent`` rate once it does, so short files are
+    picked up quickly and long ones aren't hammered. Retry-After is honoured.
+    Callers await a per-upload future.
+    """
+
+    MIN_DELAY = 1.0
+    MAX_DELAY = 30.0
+    BACKOFF = 1.6
+    JITTER = 0.2
+
+    def __init__(self, api: "YotoAPI"):
+        self._api = api
+        self._pending: dict[tuple[str, bool], _PendingTranscode] = {}
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+
+    def track(
+        self,
+        upload_id: str,
+        loudnorm: bool,
+        timeout: float,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = (upload_id, bool(loudnorm))
+        entry = self._pending.get(key)
+        if entry is None:
+            now = loop.time()
+            entry = _PendingTranscode(
+                upload_id=upload_id,
+                loudnorm=bool(loudnorm),
+                future=loop.create_future(),
+                started=now,
+                deadline=now + timeout,
+                next_due=now,
+            )
+            self._pending[key] = entry
+        if on_progress is not None:
+            entry.listeners.append(on_progress)
+        self._wakeup.set()
+        if self._runner is None or self._runner.done():
+            self._runner = loop.create_task(self._run())
+        # Shield so one cancelled waiter doesn't cancel the shared result
+        return asyncio.shield(entry.future)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        error: BaseException | None = None
+        try:
+            while self._pending:
+                now = loop.time()
+                due = [e for e in self._pending.values() if e.next_due <= now]
+                if not due:
+                    wait = min(e.next_due for e in self._pending.values()) - now
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await asyncio.gather(*(self._poll(e) for e in due))
+        except Exception as e:
+            # Reported to every waiter below rather than left unretrieved on the task
+            error = e
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            # Never leave waiters hanging on futures nobody will resolve
+            if self._pending:
+                if not isinstance(error, Exception):
+                    error = RuntimeError("Transcode poller stopped")
+                logger.error(f"Transcode poller stopped with uploads pending: {error!r}")
+                for entry in list(self._pending.values()):
+                    self._finish(entry, error=error)
+
+    def _finish(self, entry: _PendingTranscode, result=None, error=None):
+        self._pending.pop((entry.upload_id, entry.loudnorm), None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+        else:
+            entry.future.set_result(result)
+
+    async def _poll(self, entry: _PendingTranscode):
+        loop = asyncio.get_running_loop()
+        url = (
+            f"{self._api.SERVER_URL}/media/upload/{entry.upload_id}/transcoded"
+            f"?loudnorm={'true' if entry.loudnorm else 'false'}"
+        )
+        percent = None
+        retry_after = None
+        try:
+            resp = await self._api._get_async_client().get(
+                url, headers={"Authorization": f"Bearer {self._api.access_token}"}
+            )
+            entry.attempts += 1
+            logger.debug(f"Transcode poll response: {resp.status_code} {resp.text}")
+            retry_after = retry_after_seconds(resp)
+            try:
+                data = resp.json()
+            except Exception:
+                data = None
+            transcode = data.get("transcode", data) if isinstance(data, dict) else None
+            if not isinstance(transcode, dict):
+                transcode = None
+            entry.last_data = data
+            if resp.is_success and transcode and transcode.get("transcodedSha256"):
+                self._finish(entry, result=transcode)
+                return
+            if transcode and isinstance(transcode.get("progress"), dict):
+                percent = transcode["progress"].get("percent")
+        except httpx.HTTPError as e:
+            logger.debug(f"Transcode poll for {entry.upload_id} failed: {e}")
+        except Exception as e:
+            # Keep polling until the deadline; the shared runner must survive
+            logger.warning(f"Transcode poll for {entry.upload_id} failed: {e!r}")
+
+        now = loop.time()
+        if now >= entry.deadline:
+            logger.debug(entry.last_data)
+            self._finish(entry, error=Exception("Transcoding timed out."))
+            return
+        if percent is not None:
+            for listener in list(entry.listeners):
+                try:
+                    listener(float(percent))
+                except Exception:
+                    pass
+        entry.delay = self._next_delay(entry, percent, retry_after, now)
+        entry.next_due = min(now + entry.delay, entry.deadline)
+
+    def _next_delay(self, entry, percent, retry_after, now) -> float:
+        delay = None
+        if percent is not None:
+            try:
+                percent = float(percent)
+            except (TypeError, ValueError):
+                percent = None
+        if percent is not None and 0 < percent < 100:
+            # Estimate progress rate from the last sample (or the start) and
+            # aim to poll around halfway through the predicted remaining time.
+            if entry.last_percent is not None and percent > entry.last_percent:
+                rate = (percent - entry.last_percent) / max(
+                    now - entry.last_percent_at, 1e-3
+                )
+            else:
+                rate = percent / max(now - entry.started, 1e-3)
+            if rate > 0:
+                delay = (100 - percent) / rate / 2
+            entry.last_percent = percent
+            entry.last_percent_at = now
+        if delay is None:
+            delay = entry.delay * self.BACKOFF if entry.delay else self.MIN_DELAY
+        delay = min(max(delay, self.MIN_DELAY), self.MAX_DELAY)
+        delay *= random.uniform(1 - self.JITTER, 1 + self.JITTER)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
 class YotoAPI:
     SERVER_URL = "https://api.yotoplay.com"
     DEVICE_AUTH_URL = "https://login.yotoplay.com/oauth/device/code"
@@ -279,6 +487,8 @@ class YotoAPI:
     TOKEN_FILE = paths.TOKENS_FILE
     CACHE_FILE = paths.API_CACHE_FILE
     UPLOAD_ICON_CACHE_FILE = paths.UPLOAD_ICON_CACHE_FILE
+    UPLOAD_INDEX_FILE: Path = paths.UPLOAD_INDEX_FILE
+    CARD_STORE_FILE: Path = paths.CARD_STORE_FILE
     OFFICIAL_ICON_CACHE_DIR = paths.OFFICIAL_ICON_CACHE_DIR
     YOTOICONS_CACHE_DIR: Path = paths.YOTOICONS_CACHE_DIR
     VERSIONS_DIR: Path = paths.VERSIONS_DIR
@@ -292,6 +502,16 @@ class YotoAPI:
         auto_refresh_tokens=True,
         auto_start_authentication=True,
         app_path: Path | None = None,
+        http2: bool = True,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        timeout: float = 30.0,
+        use_upload_index: bool = True,
+        rate_limits: dict[str, tuple[float, int]] | None = None,
+        max_retries: int = 4,
+        cache_max_bytes: int = DEFAULT_MAX_BYTES,
+        use_card_store: bool = True,
+        cache_ttls: dict[str, float] | None = None,
     ):
         self.client_id = client_id
         self.debug = debug
@@ -300,13 +520,32 @@ class YotoAPI:
             logger.debug(f"YotoAPI initialized with client_id: {client_id}")
             logger.debug(f"App path: {app_path}")
         self.cache_requests = cache_requests
+        # 0 means "always revalidate" unless per-endpoint TTLs are opted into
+        # with cache_ttls (e.g. request_cache.RECOMMENDED_TTLS)
         self.cache_max_age_seconds = cache_max_age_seconds
-        self._cache_lock = threading.Lock()
+        self.cache_ttls = cache_ttls
+        self.cache_max_bytes = cache_max_bytes
+        self._request_cache = None
         # In-memory upload cache to avoid races where writers update the file
         # but the current API instance doesn't see the change when queried.
         self._upload_icon_cache = None
         # Lock protecting writes to the upload icon cache JSON file
         self._upload_icon_cache_lock = threading.Lock()
+        # Pooled HTTP clients are created lazily on first use (see _get_client)
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.timeout = timeout
+        # Per-host token buckets and retry policy shared by all pooled clients
+        self.rate_limits = rate_limits
+        self.max_retries = max_retries
+        self._rate_limiter = None
+        # Local sha256/transcode index so known audio isn't re-uploaded
+        self.use_upload_index = use_upload_index
+        self._upload_index = None
+        # Local copy of full card details so bulk reads skip unchanged cards
+        self.use_card_store = use_card_store
+        self._card_store = None
 
         if app_path is not None:
             logger.debug(f"Using app_path: {app_path}")
@@ -320,7 +559,7 @@ class YotoAPI:
             try:
                 self.CACHE_FILE = Path(app_path) / self.CACHE_FILE.name
             except Exception:
-                self.CACHE_FILE = Path(app_path) / ".yoto_api_cache.json"
+                self.CACHE_FILE = Path(app_path) / ".yoto_api_cache.sqlite"
             try:
                 # keep upload cache as a file path
                 self.UPLOAD_ICON_CACHE_FILE = str(
@@ -346,8 +585,9 @@ class YotoAPI:
                 self.VERSIONS_DIR = Path(app_path) / Path(self.VERSIONS_DIR).name
             except Exception:
                 self.VERSIONS_DIR = Path(app_path) / ".card_versions"
+            self.UPLOAD_INDEX_FILE = Path(app_path) / Path(self.UPLOAD_INDEX_FILE).name
+            self.CARD_STORE_FILE = Path(app_path) / Path(self.CARD_STORE_FILE).name
 
-        self._request_cache = self._load_cache()
         self.access_token, self.refresh_token = self.load_tokens()
         if not self.access_token or not self.refresh_token:
             # No tokens at all - need full authentication
@@ -376,6 +616,276 @@ class YotoAPI:
 
         self.response_history = []
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    def _transport_options(self) -> dict:
+        """Keyword arguments shared by the pooled sync and async transports."""
+        limits = httpx.Limits(
+            max_connections=getattr(self, "max_connections", 20),
+            max_keepalive_connections=getattr(self, "max_keepalive_connections", 10),
+        )
+        return {
+            "http2": bool(getattr(self, "http2", True)) and _HAVE_H2,
+            "limits": limits,
+        }
+
+    def _get_rate_limiter(self) -> RateLimiter:
+        """Return the limiter shared by every pooled client of this instance.
+
+        All threads and event loops draw from the same per-host buckets, so
+        parallel icon work and pipelined uploads are paced together.
+        """
+        limiter = getattr(self, "_rate_limiter", None)
+        if limiter is None:
+            with _CLIENT_INIT_LOCK:
+                limiter = getattr(self, "_rate_limiter", None)
+                if limiter is None:
+                    limiter = RateLimiter(
+                        getattr(self, "rate_limits", None),
+                        RetryPolicy(max_retries=getattr(self, "max_retries", 4)),
+                    )
+                    self._rate_limiter = limiter
+        return limiter
+
+    def _get_client(self) -> httpx.Client:
+        """Return the long-lived, connection-pooled sync client.
+
+        The client is shared by every thread using this API instance so bulk
+        operations (icon refreshes, parallel icon replacement) reuse
+        keep-alive connections instead of handshaking per request.
+        """
+        client = getattr(self, "_client", None)
+        if client is not None and not client.is_closed:
+            return client
+        limiter = self._get_rate_limiter()
+        with _CLIENT_INIT_LOCK:
+            client = getattr(self, "_client", None)
+            if client is None or client.is_closed:
+                transport = RateLimitedTransport(
+                    httpx.HTTPTransport(**self._transport_options()), limiter
+                )
+                client = httpx.Client(
+                    transport=transport,
+                    timeout=httpx.Timeout(getattr(self, "timeout", 30.0)),
+                )
+                self._client = client
+        return client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async client bound to the running event loop.
+
+        httpx async clients can't be shared between event loops, and the GUI
+        and CLI run uploads from short-lived loops (``asyncio.run``), so one
+        client is kept per loop and dropped once that loop has closed.
+        """
+        loop = asyncio.get_running_loop()
+        limiter = self._get_rate_limiter()
+        with _CLIENT_INIT_LOCK:
+            clients = getattr(self, "_async_clients", None)
+            if clients is None:
+                clients = {}
+                self._async_clients = clients
+            stale_clients = [
+                clients.pop(lp) for lp in [lp for lp in clients if lp.is_closed()]
+            ]
+            client = clients.get(loop)
+            if client is None or client.is_closed:
+                transport = AsyncRateLimitedTransport(
+                    httpx.AsyncHTTPTransport(**self._transport_options()), limiter
+                )
+                client = httpx.AsyncClient(
+                    transport=transport,
+                    timeout=httpx.Timeout(getattr(self, "timeout", 30.0)),
+                )
+                clients[loop] = client
+        for stale in stale_clients:
+            self._discard_async_client(stale, loop)
+        return client
+
+    def _discard_async_client(self, client: httpx.AsyncClient, loop) -> None:
+        """Release a client whose event loop has closed.
+
+        Its loop can no longer run ``aclose()``, so the close is attempted from
+        the current loop; sockets already torn down with the old loop make this
+        fail, which is only logged.
+        """
+        if client.is_closed:
+            return
+
+        async def _close():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Could not close async client of a closed event loop: {e}")
+
+        tasks = getattr(self, "_discard_tasks", None)
+        if tasks is None:
+            tasks = self._discard_tasks = set()
+        task = loop.create_task(_close())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def _get_transcode_poller(self) -> _TranscodePoller:
+        """Return the shared transcode poller for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with _CLIENT_INIT_LOCK:
+            pollers = getattr(self, "_transcode_pollers", None)
+            if pollers is None:
+                pollers = {}
+                self._transcode_pollers = pollers
+            for stale in [lp for lp in pollers if lp.is_closed()]:
+                pollers.pop(stale, None)
+            poller = pollers.get(loop)
+            if poller is None:
+                poller = _TranscodePoller(self)
+                pollers[loop] = poller
+        return poller
+
+    def close(self):
+        """Close the pooled sync client and the local upload index, request
+        cache and card store.
+
+        Async clients are closed by aclose.
+        """
+        client = getattr(self, "_client", None)
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+            self._client = None
+        index = getattr(self, "_upload_index", None)
+        if index is not None:
+            try:
+                index.close()
+            except Exception:
+                pass
+            self._upload_index = None
+        cache = getattr(self, "_request_cache", None)
+        if cache is not None:
+            try:
+                cache.close()
+            except Exception:
+                pass
+            self._request_cache = None
+        store = getattr(self, "_card_store", None)
+        if store is not None:
+            try:
+                store.close()
+            except Exception:
+                pass
+            self._card_store = None
+
+    async def aclose(self):
+        """Close the pooled clients, including the one for the running loop."""
+        await self._aclose_loop_client()
+        self.close()
+
+    async def _aclose_loop_client(self):
+        """Close only the async client bound to the running loop."""
+        clients = getattr(self, "_async_clients", None)
+        if clients is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                client = clients.pop(loop, None)
+                if client is not None:
+                    await client.aclose()
+            except Exception:
+                pass
+
+    def _run_async(self, coro):
+        """
+        Run `coro` to completion from sync code and return its result.
+
+        Uses a private event loop (on a helper thread if this thread already
+        runs one) and closes that loop's pooled client afterwards.
+        """
+
+        async def _runner():
+            try:
+                return await coro
+            finally:
+                await self._aclose_loop_client()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_runner())
+        import concurrent.futures
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+            return ex.submit(asyncio.run, _runner()).result()
+
+    def _get_upload_index(self) -> UploadIndex | None:
+        """Return the persistent upload index, or None when it is disabled."""
+        if not getattr(self, "use_upload_index", False):
+            return None
+        index = getattr(self, "_upload_index", None)
+        if index is None:
+            with _CLIENT_INIT_LOCK:
+                index = getattr(self, "_upload_index", None)
+                if index is None:
+                    try:
+                        index = UploadIndex(self.UPLOAD_INDEX_FILE)
+                    except Exception as e:
+                        logger.warning(f"Upload index unavailable: {e}")
+                        self.use_upload_index = False
+                        return None
+                    self._upload_index = index
+        return index
+
+    def _get_card_store(self) -> CardStore | None:
+        """Return the local card store, or None when it is disabled."""
+        if not getattr(self, "use_card_store", False):
+            return None
+        store = getattr(self, "_card_store", None)
+        if store is None:
+            with _CLIENT_INIT_LOCK:
+                store = getattr(self, "_card_store", None)
+                if store is None:
+                    try:
+                        store = CardStore(self.CARD_STORE_FILE)
+                    except Exception as e:
+                        logger.warning(f"Card store unavailable: {e}")
+                        self.use_card_store = False
+                        return None
+                    self._card_store = store
+        return store
+
+    def _sha256_for_upload(self, audio_path: str) -> str:
+        """Hash `audio_path`, reusing the indexed digest when the file is unchanged."""
+        index = self._get_upload_index()
+        if index is not None:
+            sha256 = index.get_sha256(audio_path)
+            if sha256:
+                logger.debug(f"Using indexed SHA256 for {audio_path}")
+                return sha256
+        sha256 = self.calculate_sha256(audio_path)
+        if index is not None:
+            index.put_sha256(audio_path, sha256)
+        return sha256
+
+    def _indexed_transcode(self, sha256: str, loudnorm: bool) -> TranscodedAudio | None:
+        index = self._get_upload_index()
+        return index.get_transcode(sha256, loudnorm) if index is not None else None
+
+    def _remember_transcode(
+        self, sha256: str, transcoded: TranscodedAudio, loudnorm: bool
+    ) -> None:
+        index = self._get_upload_index()
+        if index is not None:
+            index.put_transcode(sha256, transcoded, loudnorm)
+
     def _load_icon_upload_cache(self):
         # Return in-memory cache if already loaded
         if getattr(self, "_upload_icon_cache", None) is not None:
@@ -412,23 +922,27 @@ class YotoAPI:
             # Update in-memory cache so this API instance sees the change immediately
             self._upload_icon_cache = cache
 
-    def _load_cache(self):
-        if not self.cache_requests:
-            return {}
-        if self.CACHE_FILE.exists():
-            try:
-                with self.CACHE_FILE.open("r") as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
-
-    def _save_cache(self):
-        if not self.cache_requests:
-            return
-        with self._cache_lock:
-            with self.CACHE_FILE.open("w") as f:
-                json.dump(self._request_cache, f)
+    def _get_request_cache(self) -> RequestCache | None:
+        """Return the on-disk GET cache, or None when request caching is off."""
+        if not getattr(self, "cache_requests", False):
+            return None
+        cache = getattr(self, "_request_cache", None)
+        if cache is None:
+            with _CLIENT_INIT_LOCK:
+                cache = getattr(self, "_request_cache", None)
+                if cache is None:
+                    try:
+                        cache = RequestCache(
+                            self.CACHE_FILE,
+                            max_bytes=getattr(self, "cache_max_bytes", DEFAULT_MAX_BYTES),
+                            ttls=getattr(self, "cache_ttls", None),
+                        )
+                    except Exception as e:
+                        logger.warning(f"Request cache unavailable: {e}")
+                        self.cache_requests = False
+                        return None
+                    self._request_cache = cache
+        return cache
 
     def _ensure_versions_dir(self):
         try:
@@ -552,6 +1066,8 @@ class YotoAPI:
         console: Optional[Console] = None,
         output_name_template: Optional[str] = None,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        single_pass: bool = True,
+        max_workers: Optional[int] = None,
     ) -> list:
         """Thin wrapper that splits an audio file into multiple tracks.
 
@@ -568,6 +1084,8 @@ class YotoAPI:
             console=console,
             output_name_template=output_name_template,
             progress_callback=progress_callback,
+            single_pass=single_pass,
+            max_workers=max_workers,
         )
 
     def _make_cache_key(self, method, url, params=None, data=None, json_data=None):
@@ -585,48 +1103,83 @@ class YotoAPI:
     def _cached_request(
         self, method, url, headers=None, params=None, data=None, json_data=None
     ):
-        if not self.cache_requests:
-            return httpx.request(
+        """
+        Send a request, serving GETs from the on-disk cache when enabled.
+
+        Entries younger than cache_max_age_seconds (or the opted-in endpoint
+        TTL) are returned without a request; otherwise, including the default
+        max age of 0, they are revalidated with their ETag/Last-Modified.
+        Responses with signed URLs are not cached. Successful writes drop the
+        cached entries they affect.
+        """
+        cache = self._get_request_cache()
+        if cache is not None and method.upper() == "GET" and not is_cacheable(url, params):
+            return self._get_client().request(method, url, headers=headers, params=params)
+        if cache is None or method.upper() != "GET":
+            resp = self._get_client().request(
                 method, url, headers=headers, params=params, data=data, json=json_data
             )
+            if cache is not None and resp.is_success:
+                self._invalidate_cached(url, json_data)
+            return resp
         key = self._make_cache_key(method, url, params, data, json_data)
-        now = time.time()
-        cache_entry = self._request_cache.get(key)
-        if cache_entry:
-            age = now - cache_entry.get("timestamp", 0)
-            if age <= self.cache_max_age_seconds:
-                resp_data = cache_entry
-
-                class DummyResponse:
-                    def __init__(self, data):
-                        self._data = data
-                        self.status_code = data.get("status_code", 200)
-                        self.text = json.dumps(data.get("json", {}))
-                        self.ok = True
-
-                    def json(self):
-                        return self._data.get("json", {})
-
-                    def raise_for_status(self):
-                        pass
-
-                return DummyResponse(resp_data)
-        resp = httpx.request(
-            method, url, headers=headers, params=params, data=data, json=json_data
+        entry = cache.get(key)
+        max_age = getattr(self, "cache_max_age_seconds", 0) or 0
+        if entry and cache.is_fresh(entry, max_age if max_age > 0 else None):
+            return self._response_from_cache(method, url, entry)
+        req_headers = dict(headers or {})
+        if entry:
+            if entry["headers"].get("etag"):
+                req_headers["If-None-Match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                req_headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        resp = self._get_client().request(
+            method, url, headers=req_headers, params=params, data=data, json=json_data
         )
-        try:
-            resp_json = resp.json()
-        except Exception:
-            resp_json = None
-        self._request_cache[key] = {
-            "status_code": resp.status_code,
-            "json": resp_json,
-            "text": resp.text,
-            "timestamp": now,
-        }
-        self._save_cache()
+        if resp.status_code == 304 and entry:
+            cache.touch(key)
+            return self._response_from_cache(method, url, entry)
+        if resp.status_code == 200:
+            cache.put(
+                key,
+                url,
+                resp.status_code,
+                {
+                    k: resp.headers[k]
+                    for k in ("content-type", "etag", "last-modified")
+                    if k in resp.headers
+                },
+                resp.content,
+            )
         return resp
 
+    @staticmethod
+    def _response_from_cache(method, url, entry) -> httpx.Response:
+        return httpx.Response(
+            entry["status_code"],
+            headers=entry["headers"],
+            content=entry["body"],
+            request=httpx.Request(method, url),
+        )
+
+    def _invalidate_cached(self, url, json_data=None):
+        """Drop cached GETs that a successful write to `url` made stale."""
+        cache = self._get_request_cache()
+        if cache is None:
+            return
+        base = url.split("?", 1)[0].rstrip("/")
+        if base.startswith(self.CONTENT_URL):
+            # Card writes: the card itself and the card list
+            cache.invalidate(self.MYO_URL)
+            card_id = json_data.get("cardId") if isinstance(json_data, dict) else None
+            if base != self.CONTENT_URL:
+                cache.invalidate(base)
+            if card_id:
+                cache.invalidate(f"{self.CONTENT_URL}/{card_id}")
+        else:
+            # e.g. POST .../user/me/upload also stales the .../user/me listing
+            cache.invalidate(base.rsplit("/", 1)[0])
+
     def get_device_code(self):
         data = {
             "client_id": self.client_id,
@@ -635,7 +1188,7 @@ class YotoAPI:
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         logger.debug(f"Requesting device code: {data}")
-        response = httpx.post(self.DEVICE_AUTH_URL, data=data, headers=headers)
+        response = self._get_client().post(self.DEVICE_AUTH_URL, data=data, headers=headers)
         logger.debug(f"Device code response: {response.status_code} {response.text}")
         if not response.is_success:
             logger.error(f"Device authorization failed: {response.text}")
@@ -672,7 +1225,7 @@ class YotoAPI:
                 }
                 headers = {"Content-Type": "application/x-www-form-urlencoded"}
                 # logger.debug(f"Polling for token: {data}")
-                response = httpx.post(self.TOKEN_URL, data=data, headers=headers)
+                response = self._get_client().post(self.TOKEN_URL, data=data, headers=headers)
                 # logger.debug(f"Token poll response: {response.status_code} {response.text}")
                 resp_json = response.json()
                 if response.is_success:
@@ -744,7 +1297,7 @@ class YotoAPI:
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         logger.debug(f"Refreshing tokens: {data}")
-        response = httpx.post(self.TOKEN_URL, data=data, headers=headers)
+        response = self._get_client().post(self.TOKEN_URL, data=data, headers=headers)
         logger.debug(f"Token refresh response: {response.status_code} {response.text}")
         if not response.is_success:
             logger.error(f"Token refresh failed: {response.text}")
@@ -882,6 +1435,12 @@ class YotoAPI:
         response.raise_for_status()
         self.response_history.append(response)
         data = response.json()["card"]
+        return self._card_from_payload(data, playable, save_version_if_missing)
+
+    def _card_from_payload(
+        self, data: dict, playable=False, save_version_if_missing: bool = True
+    ) -> Card:
+        """Validate a fetched card payload and record it locally (versions, card store)."""
         # If requested, save a local version snapshot when none exist for this card yet.
         # This helps provide a recovery point if the card is later deleted.
         if save_version_if_missing:
@@ -907,7 +1466,114 @@ class YotoAPI:
                 pass
         if self.debug:
             find_extra_fields(Card, data, warn_extra=True)
-        return Card.model_validate(data)
+        card = Card.model_validate(data)
+        # Playable responses carry short-lived signed URLs, so don't keep them
+        store = self._get_card_store() if not playable else None
+        if store is not None:
+            store.put(card)
+        return card
+
+    async def get_cards_many_async(
+        self,
+        card_ids: list[str],
+        concurrency: int = 8,
+        playable: bool = False,
+        save_version_if_missing: bool = True,
+    ) -> list:
+        """
+        Fetch many cards concurrently, at most `concurrency` requests at once.
+
+        Returns one entry per id, in input order: the Card, or the exception
+        raised while fetching that id.
+        """
+        sem = asyncio.Semaphore(max(1, int(concurrency)))
+        client = self._get_async_client()
+
+        async def fetch(card_id):
+            url = f"{self.CONTENT_URL}/{card_id}"
+            if playable:
+                url += "/?playable=true"
+            try:
+                async with sem:
+                    logger.debug(f"GET {url}")
+                    response = await client.get(
+                        url, headers={"Authorization": f"Bearer {self.access_token}"}
+                    )
+                response.raise_for_status()
+                data = response.json()["card"]
+                return await asyncio.to_thread(
+                    self._card_from_payload, data, playable, save_version_if_missing
+                )
+            except Exception as e:
+                logger.debug(f"get_cards_many: failed to fetch {card_id}: {e}")
+                return e
+
+        return list(await asyncio.gather(*(fetch(cid) for cid in card_ids)))
+
+    def get_cards_many(
+        self,
+        card_ids: list[str],
+        concurrency: int = 8,
+        playable: bool = False,
+        save_version_if_missing: bool = True,
+    ) -> list:
+        """Sync wrapper for get_cards_many_async (Card or exception per id, in order)."""
+        if not card_ids:
+            return []
+        return self._run_async(
+            self.get_cards_many_async(
+                card_ids,
+                concurrency=concurrency,
+                playable=playable,
+                save_version_if_missing=save_version_if_missing,
+            )
+        )
+
+    def get_cards_synced(
+        self, summaries: list[Card] | None = None, concurrency: int = 8
+    ) -> list[Card]:
+        """
+        Return full card details for `summaries` (default: the whole MYO
+        library), in the same order.
+
+        Details come from the local card store when the stored copy was
+        fetched at the summary's updatedAt; only new or changed cards (or
+        summaries without an updatedAt) are fetched, `concurrency` at a time.
+        A card whose details can't be fetched is returned as its summary.
+        """
+        store = self._get_card_store()
+        full_library = summaries is None
+        if summaries is None:
+            summaries = self.get_myo_content()
+        results: list[Card] = list(summaries)
+        stale: list[int] = []
+        for i, summary in enumerate(summaries):
+            card_id = getattr(summary, "cardId", None)
+            stored = (
+                store.get(card_id, getattr(summary, "updatedAt", None))
+                if store is not None
+                else None
+            )
+            if stored is not None:
+                results[i] = stored
+            elif card_id:
+                stale.append(i)
+        fetched = self.get_cards_many(
+            [summaries[i].cardId for i in stale], concurrency=concurrency
+        )
+        for i, card in zip(stale, fetched):
+            if isinstance(card, BaseException):
+                continue
+            if store is not None:
+                # Record against the summary timestamp so the next sync matches
+                store.put(card, getattr(summaries[i], "updatedAt", None))
+            results[i] = card
+        if store is not None and full_library:
+            store.retain(getattr(c, "cardId", None) for c in summaries)
+        logger.debug(
+            f"get_cards_synced: fetched {len(stale)} of {len(summaries)} cards, rest from the card store"
+        )
+        return results
 
     def create_or_update_content(
         self, card, return_card=False, add_update_at=True, create_version: bool = True
@@ -953,7 +1619,11 @@ class YotoAPI:
             except Exception:
                 logger.debug("Failed to save local version after create/update")
         if return_card:
-            return Card.model_validate(response.json()["card"])
+            card = Card.model_validate(response.json()["card"])
+            store = self._get_card_store()
+            if store is not None:
+                store.put(card)
+            return card
         return response.json()
 
     def get_audio_upload_url(self, sha256: str, filename: Optional[str] = None):
@@ -968,19 +1638,55 @@ class YotoAPI:
         if filename:
             params["filename"] = filename
         logger.debug(f"GET {url} params={params}")
-        response = httpx.get(url, headers=headers, params=params)
+        response = self._get_client().get(url, headers=headers, params=params)
         logger.debug(f"Upload URL response: {response.status_code} {response.text}")
         response.raise_for_status()
         return response.json()
 
-    from typing import Tuple
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-    def calculate_sha256(self, audio_path: str) -> Tuple[str, bytes]:
-        import hashlib
+    def calculate_sha256(self, audio_path: str) -> str:
+        """Return the hex SHA256 of a file, hashed incrementally from disk.
 
+        The file is never held in memory as a whole, so hashing several large
+        audiobook files concurrently stays cheap.
+        """
         with open(audio_path, "rb") as f:
-            audio_bytes = f.read()
-        return hashlib.sha256(audio_bytes).hexdigest(), audio_bytes
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _iter_file_chunks(
+        self,
+        path: str | Path,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ):
+        """Yield a file's bytes in UPLOAD_CHUNK_SIZE pieces.
+
+        on_chunk(sent, total) is called after each chunk is handed to the
+        transport, which is what drives per-chunk upload progress.
+        """
+        total = os.path.getsize(path)
+        sent = 0
+        with open(path, "rb") as f:
+            while chunk := f.read(self.UPLOAD_CHUNK_SIZE):
+                yield chunk
+                sent += len(chunk)
+                if on_chunk:
+                    on_chunk(sent, total)
+
+    async def _aiter_file_chunks(
+        self,
+        path: str | Path,
+        on_chunk: Optional[Callable[[int, int], None]] = None,
+    ):
+        """Async variant of _iter_file_chunks; reads happen off the event loop."""
+        total = os.path.getsize(path)
+        sent = 0
+        with open(path, "rb") as f:
+            while chunk := await asyncio.to_thread(f.read, self.UPLOAD_CHUNK_SIZE):
+                yield chunk
+                sent += len(chunk)
+                if on_chunk:
+                    on_chunk(sent, total)
 
     async def upload_and_transcode_audio_async(
         self,
@@ -994,28 +1700,138 @@ class YotoAPI:
         upload_task_id: TaskID | None = None,
         transcode_task_id: TaskID | None = None,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        journal: Optional[UploadJournal] = None,
+        journal_key: Optional[str] = None,
     ) -> TranscodedAudio:
         """
         Async version: Handles hashing, upload URL, upload, and transcoding for an audio file.
         Returns a TranscodedAudio instance.
         Supports rich progress for upload and transcode phases.
         Accepts an optional progress_callback(msg, frac) for external UI updates.
+        With a journal, each finished step is recorded under journal_key
+        (default: the resolved audio_path) and steps already recorded are skipped.
         """
         logger.debug(
             f"Starting upload_and_transcode_audio_async for {audio_path} with filename={filename}"
         )
 
-        def _call_cb(msg: str | None = None):
+        def _call_cb(msg: str | None = None, frac: float | None = None):
             try:
                 if callable(progress_callback):
-                    progress_callback(msg or "", 0.0)
+                    progress_callback(msg or "", frac or 0.0)
             except Exception:
                 pass
 
-        sha256, audio_bytes = self.calculate_sha256(audio_path)
-        logger.trace(f"SHA256: {sha256}")
-        _call_cb("Hash calculated")
-        upload_resp = self.get_audio_upload_url(sha256, filename)
+        key = journal_key or UploadJournal.key_for(audio_path)
+        pending = None
+        if journal is not None:
+            resumed = journal.transcoded(key)
+            if resumed is not None:
+                self._report_indexed_transcode(
+                    audio_path, progress, upload_task_id, transcode_task_id, max_attempts
+                )
+                _call_cb("Already transcoded (resumed)", 1.0)
+                return resumed
+            pending = journal.upload_id(key)
+
+        if pending is not None:
+            sha256, upload_id = pending
+            logger.debug(f"Resuming transcode poll for {audio_path} (upload {upload_id})")
+            if progress and upload_task_id is not None:
+                progress.update(
+                    upload_task_id, completed=100, description="Upload skipped (resumed)"
+                )
+        else:
+            sha256 = journal.sha256(key, audio_path) if journal is not None else None
+            if sha256 is None:
+                sha256 = await asyncio.to_thread(self._sha256_for_upload, audio_path)
+                if journal is not None:
+                    journal.mark_hashed(key, audio_path, sha256)
+            logger.trace(f"SHA256: {sha256}")
+            _call_cb("Hash calculated")
+            known = self._indexed_transcode(sha256, loudnorm)
+            if known is not None:
+                self._report_indexed_transcode(
+                    audio_path, progress, upload_task_id, transcode_task_id, max_attempts
+                )
+                if journal is not None:
+                    journal.mark_transcoded(key, known)
+                _call_cb("Already uploaded", 1.0)
+                return known
+            upload_id = await self._upload_audio_async(
+                audio_path,
+                sha256,
+                filename=filename,
+                progress=progress,
+                upload_task_id=upload_task_id,
+                progress_callback=progress_callback,
+            )
+            if journal is not None:
+                journal.mark_uploaded(key, upload_id)
+        _call_cb("Transcoding...")
+        transcoded_audio = await self.poll_for_transcoding_async(
+            upload_id,
+            loudnorm,
+            poll_interval,
+            max_attempts,
+            show_progress,
+            progress=progress,
+            transcode_task_id=transcode_task_id,
+            progress_callback=progress_callback,
+        )
+        logger.debug(f"Transcoded audio info: {transcoded_audio}")
+        self._remember_transcode(sha256, transcoded_audio, loudnorm)
+        if journal is not None:
+            journal.mark_transcoded(key, transcoded_audio)
+        _call_cb("Transcode complete")
+        return transcoded_audio
+
+    def _report_indexed_transcode(
+        self,
+        audio_path: str,
+        progress: Optional["Progress"] = None,
+        upload_task_id: TaskID | None = None,
+        transcode_task_id: TaskID | None = None,
+        max_attempts: int = 60,
+    ):
+        logger.debug(f"Reusing indexed transcode for {audio_path}")
+        if progress and upload_task_id is not None:
+            progress.update(
+                upload_task_id,
+                completed=100,
+                description="Upload skipped (already uploaded)",
+            )
+        if progress and transcode_task_id is not None:
+            progress.update(
+                transcode_task_id,
+                completed=max_attempts,
+                description="Transcode complete (cached)",
+            )
+
+    async def _upload_audio_async(
+        self,
+        audio_path: str,
+        sha256: str,
+        filename: Optional[str] = None,
+        progress: Optional["Progress"] = None,
+        upload_task_id: TaskID | None = None,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> str:
+        """
+        Request an upload URL for `sha256` and stream the file to it when the
+        server doesn't already have it. Returns the uploadId to poll.
+        """
+
+        def _call_cb(msg: str | None = None, frac: float | None = None):
+            try:
+                if callable(progress_callback):
+                    progress_callback(msg or "", frac or 0.0)
+            except Exception:
+                pass
+
+        upload_resp = await asyncio.to_thread(
+            self.get_audio_upload_url, sha256, filename
+        )
         upload = upload_resp.get("upload", upload_resp)
         audio_upload_url = upload.get("uploadUrl")
         upload_id = upload.get("uploadId")
@@ -1043,44 +1859,40 @@ class YotoAPI:
                 progress.update(upload_task_id, description="Uploading audio...")
             _call_cb("Uploading audio...")
 
-            async with httpx.AsyncClient() as client:
-                put_resp = await client.put(
-                    audio_upload_url,
-                    content=audio_bytes,
-                    headers={"Content-Type": "audio/mpeg"},
-                    timeout=300,
-                )
-                if put_resp.status_code >= 400:
-                    logger.error(f"Audio upload failed: {put_resp.text}")
-                    if progress and upload_task_id is not None:
-                        progress.update(
-                            upload_task_id, completed=100, description="Upload failed"
-                        )
-                    _call_cb("Audio upload failed")
-                    raise Exception(f"Audio upload failed: {put_resp.text}")
-                logger.debug("Audio uploaded successfully.")
+            def _on_chunk(sent: int, total: int):
+                frac = sent / total if total else 1.0
+                if progress and upload_task_id is not None:
+                    progress.update(upload_task_id, completed=int(frac * 100))
+                _call_cb(f"Uploading audio... {int(frac * 100)}%", frac)
+
+            client = self._get_async_client()
+            put_resp = await client.put(
+                audio_upload_url,
+                content=self._aiter_file_chunks(audio_path, _on_chunk),
+                headers={
+                    "Content-Type": "audio/mpeg",
+                    "Content-Length": str(os.path.getsize(audio_path)),
+                },
+                timeout=300,
+            )
+            if put_resp.status_code >= 400:
+                logger.error(f"Audio upload failed: {put_resp.text}")
                 if progress and upload_task_id is not None:
-                    file_label = filename if filename else audio_path
                     progress.update(
-                        upload_task_id,
-                        completed=100,
-                        description=f"Upload complete: {file_label}",
+                        upload_task_id, completed=100, description="Upload failed"
                     )
+                _call_cb("Audio upload failed")
+                raise Exception(f"Audio upload failed: {put_resp.text}")
+            logger.debug("Audio uploaded successfully.")
+            if progress and upload_task_id is not None:
+                file_label = filename if filename else audio_path
+                progress.update(
+                    upload_task_id,
+                    completed=100,
+                    description=f"Upload complete: {file_label}",
+                )
             _call_cb("Upload complete")
-        _call_cb("Transcoding...")
-        transcoded_audio = await self.poll_for_transcoding_async(
-            upload_id,
-            loudnorm,
-            poll_interval,
-            max_attempts,
-            show_progress,
-            progress=progress,
-            transcode_task_id=transcode_task_id,
-            progress_callback=progress_callback,
-        )
-        logger.debug(f"Transcoded audio info: {transcoded_audio}")
-        _call_cb("Transcode complete")
-        return transcoded_audio
+        return upload_id
 
     async def poll_for_transcoding_async(
         self,
@@ -1093,6 +1905,14 @@ class YotoAPI:
         transcode_task_id: TaskID | None = None,
         progress_callback: Optional[Callable[[str, float], None]] = None,
     ) -> TranscodedAudio:
+        """
+        Wait for the server to finish transcoding `upload_id`.
+
+        All uploads awaited on the same event loop share one poller (see
+        _TranscodePoller), which backs off adaptively instead of polling every
+        `poll_interval` seconds. Raises if the transcode doesn't finish within
+        poll_interval * max_attempts seconds.
+        """
         def _call_cb(msg: str | None = None, frac: float | None = None):
             try:
                 if callable(progress_callback):
@@ -1100,53 +1920,41 @@ class YotoAPI:
             except Exception:
                 pass
 
-        transcode_url = f"https://api.yotoplay.com/media/upload/{upload_id}/transcoded?loudnorm={'true' if loudnorm else 'false'}"
-        attempts = 0
-        transcoded_audio = None
-        data = None
         if progress and transcode_task_id is not None:
             progress.update(transcode_task_id, description="Transcoding audio...")
-        async with httpx.AsyncClient() as client:
-            while attempts < max_attempts:
-                poll_resp = await client.get(
-                    transcode_url,
-                    headers={"Authorization": f"Bearer {self.access_token}"},
-                )
-                logger.debug(
-                    f"Transcode poll response: {poll_resp.status_code} {poll_resp.text}"
+
+        def _on_progress(percent: float):
+            if progress and transcode_task_id is not None:
+                progress.update(
+                    transcode_task_id, completed=max_attempts * percent / 100
                 )
-                if poll_resp.status_code == 200:
-                    data = poll_resp.json()
-                    transcode = data.get("transcode", data)
-                    if transcode.get("transcodedSha256"):
-                        transcoded_audio = transcode
-                        if progress and transcode_task_id is not None:
-                            progress.update(
-                                transcode_task_id,
-                                completed=max_attempts,
-                                description="Transcode complete",
-                            )
-                        break
-                elif poll_resp.status_code >= 202:
-                    if "progress" in poll_resp.json()["transcode"]:
-                        percent = poll_resp.json()["transcode"]["progress"]["percent"]
-                        _call_cb("Transcoding...", percent / 100)
-                await asyncio.sleep(poll_interval)
-                attempts += 1
-                if progress and transcode_task_id is not None:
-                    progress.update(transcode_task_id, completed=attempts)
-        if not transcoded_audio:
-            logger.debug(data)
-            logger.error("Transcoding timed out.")
+            _call_cb("Transcoding...", percent / 100)
+
+        # poll_interval * max_attempts is kept as the overall time budget; the
+        # shared poller decides when to actually poll.
+        try:
+            transcoded_audio = await self._get_transcode_poller().track(
+                upload_id,
+                loudnorm,
+                timeout=poll_interval * max_attempts,
+                on_progress=_on_progress,
+            )
+        except Exception as e:
+            logger.error(f"Transcoding of {upload_id} failed: {e}")
             if progress and transcode_task_id is not None:
                 progress.update(
                     transcode_task_id,
                     completed=max_attempts,
-                    description="Transcode timed out",
+                    description=f"Transcode failed: {e}",
                 )
-            if progress_callback:
-                progress_callback("Transcode timed out", 1.0)
-            raise Exception("Transcoding timed out.")
+            _call_cb(f"Transcode failed: {e}", 1.0)
+            raise
+        if progress and transcode_task_id is not None:
+            progress.update(
+                transcode_task_id,
+                completed=max_attempts,
+                description="Transcode complete",
+            )
 
         # Convert the raw transcode dict into a TranscodedAudio model instance
         try:
@@ -1157,6 +1965,167 @@ class YotoAPI:
             )
             raise
 
+    async def _upload_pipeline_async(
+        self,
+        media_files,
+        filename_list=None,
+        loudnorm: bool = False,
+        poll_interval: float = 2,
+        max_attempts: int = 60,
+        max_concurrent_uploads: int = 4,
+        progress: Optional["Progress"] = None,
+        upload_task_ids: Optional[list] = None,
+        transcode_task_ids: Optional[list] = None,
+        on_file_done: Optional[Callable[[int, Any], None]] = None,
+        journal: Optional[UploadJournal] = None,
+        journal_keys: Optional[list] = None,
+    ) -> list:
+        """
+        Hash, upload and await transcodes for many files as a pipeline.
+
+        The three stages are bounded separately so server-side transcoding
+        never holds an upload slot:
+          - hashing runs in worker threads, at most one per CPU core
+          - uploads are limited to `max_concurrent_uploads` workers, fed by
+            an asyncio.Queue from the hashing stage
+          - transcode waits are unbounded and share the per-loop poller
+
+        Returns one entry per input file, in input order: a TranscodedAudio
+        on success or the exception raised for that file.
+        on_file_done(idx, result_or_exception) fires as each file finishes.
+
+        With a journal, every finished stage is recorded under the file's
+        journal key (journal_keys[idx], default: the resolved path). Files the
+        journal already has as transcoded are returned as-is and uploaded
+        files go straight to the transcode wait.
+        """
+        total = len(media_files)
+        results: list[Any] = [None] * total
+        upload_workers = max(1, int(max_concurrent_uploads))
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=upload_workers * 2)
+        hash_slots = asyncio.Semaphore(max(1, os.cpu_count() or 1))
+        transcode_tasks: list[asyncio.Task] = []
+
+        def _task_id(ids, idx):
+            return ids[idx] if ids and idx < len(ids) else None
+
+        def _journal_key(idx):
+            if journal_keys and idx < len(journal_keys):
+                return str(journal_keys[idx])
+            return UploadJournal.key_for(media_files[idx])
+
+        def _done(idx, result):
+            results[idx] = result
+            if callable(on_file_done):
+                try:
+                    on_file_done(idx, result)
+                except Exception:
+                    pass
+
+        async def hash_stage(idx):
+            try:
+                path = str(media_files[idx])
+                key = _journal_key(idx)
+                sha256 = None
+                if journal is not None:
+                    resumed = journal.transcoded(key)
+                    if resumed is not None:
+                        self._report_indexed_transcode(
+                            path,
+                            progress,
+                            _task_id(upload_task_ids, idx),
+                            _task_id(transcode_task_ids, idx),
+                            max_attempts,
+                        )
+                        _done(idx, resumed)
+                        return
+                    pending = journal.upload_id(key)
+                    if pending is not None:
+                        upload_task_id = _task_id(upload_task_ids, idx)
+                        if progress and upload_task_id is not None:
+                            progress.update(
+                                upload_task_id,
+                                completed=100,
+                                description="Upload skipped (resumed)",
+                            )
+                        transcode_tasks.append(
+                            asyncio.create_task(transcode_stage(idx, *pending))
+                        )
+                        return
+                    sha256 = journal.sha256(key, path)
+                if sha256 is None:
+                    async with hash_slots:
+                        sha256 = await asyncio.to_thread(self._sha256_for_upload, path)
+                    if journal is not None:
+                        journal.mark_hashed(key, path, sha256)
+                known = self._indexed_transcode(sha256, loudnorm)
+                if known is not None:
+                    self._report_indexed_transcode(
+                        path,
+                        progress,
+                        _task_id(upload_task_ids, idx),
+                        _task_id(transcode_task_ids, idx),
+                        max_attempts,
+                    )
+                    if journal is not None:
+                        journal.mark_transcoded(key, known)
+                    _done(idx, known)
+                    return
+                await upload_queue.put((idx, sha256))
+            except Exception as e:
+                _done(idx, e)
+
+        async def transcode_stage(idx, sha256, upload_id):
+            try:
+                tr = await self.poll_for_transcoding_async(
+                    upload_id,
+                    loudnorm,
+                    poll_interval,
+                    max_attempts,
+                    progress=progress,
+                    transcode_task_id=_task_id(transcode_task_ids, idx),
+                )
+                self._remember_transcode(sha256, tr, loudnorm)
+                if journal is not None:
+                    journal.mark_transcoded(_journal_key(idx), tr)
+                _done(idx, tr)
+            except Exception as e:
+                _done(idx, e)
+
+        async def upload_stage():
+            while True:
+                item = await upload_queue.get()
+                if item is None:
+                    return
+                idx, sha256 = item
+                try:
+                    upload_id = await self._upload_audio_async(
+                        str(media_files[idx]),
+                        sha256,
+                        filename=filename_list[idx] if filename_list else None,
+                        progress=progress,
+                        upload_task_id=_task_id(upload_task_ids, idx),
+                    )
+                    if journal is not None:
+                        journal.mark_uploaded(_journal_key(idx), upload_id)
+                except Exception as e:
+                    _done(idx, e)
+                    continue
+                transcode_tasks.append(
+                    asyncio.create_task(transcode_stage(idx, sha256, upload_id))
+                )
+
+        uploaders = [asyncio.create_task(upload_stage()) for _worker in range(upload_workers)]
+        try:
+            await asyncio.gather(*(hash_stage(i) for i in range(total)))
+        finally:
+            # Stop the uploaders even if hashing was aborted
+            for _ in uploaders:
+                await upload_queue.put(None)
+        await asyncio.gather(*uploaders)
+        await asyncio.gather(*transcode_tasks)
+        return results
+
     async def upload_and_transcode_many_async(
         self,
         media_files,
@@ -1166,22 +2135,20 @@ class YotoAPI:
         max_attempts=60,
         show_progress=True,
         max_concurrent_uploads: int = 4,
+        journal: Optional[UploadJournal] = None,
+        journal_keys: Optional[list] = None,
     ):
         """
-        Launch parallel async uploads and transcodes for a list of media files.
-        Returns a list of transcoded audio info dicts (same order as input).
+        Launch pipelined async uploads and transcodes for a list of media files.
+        Returns a list of TranscodedAudio results (same order as input).
         Shows rich progress bars for each upload and transcode.
-        Limits the number of concurrent uploads using a semaphore.
+        At most `max_concurrent_uploads` files are uploading at once; files
+        waiting on the server to transcode don't count against that limit.
+        Raises the first (in input order) per-file error once all files finish.
+        Pass an UploadJournal to record progress and resume an interrupted job
+        (see _upload_pipeline_async).
         """
-        results = []
         console = Console()
-        semaphore = asyncio.Semaphore(max_concurrent_uploads)
-
-        async def sem_task(*args, **kwargs):
-            async with semaphore:
-                return await self.upload_and_transcode_audio_async(*args, **kwargs)
-
-        tasks = []
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -1189,6 +2156,7 @@ class YotoAPI:
             TimeElapsedColumn(),
             transient=False,
             console=console,
+            disable=not show_progress,
         ) as progress:
             upload_task_ids = []
             transcode_task_ids = []
@@ -1197,104 +2165,73 @@ class YotoAPI:
             visible_upload_tasks = set()
             visible_transcode_tasks = set()
 
-            def add_visible_task(label, total, task_type, idx):
-                # Remove completed tasks from visible sets
-                def cleanup_visible_tasks():
-                    # Remove tasks that are no longer visible or completed
-                    for tid in list(visible_upload_tasks):
-                        t = progress.tasks[tid]
-                        if t.finished or not t.visible:
-                            visible_upload_tasks.remove(tid)
-                    for tid in list(visible_transcode_tasks):
-                        t = progress.tasks[tid]
-                        if t.finished or not t.visible:
-                            visible_transcode_tasks.remove(tid)
-
-                cleanup_visible_tasks()
-                if task_type == "upload":
-                    if len(visible_upload_tasks) < visible_limit:
-                        tid = progress.add_task(label, total=total)
-                        visible_upload_tasks.add(tid)
-                        return tid
-                    else:
-                        return progress.add_task(label, total=total, visible=False)
-                elif task_type == "transcode":
-                    if len(visible_transcode_tasks) < visible_limit:
-                        tid = progress.add_task(label, total=total)
-                        visible_transcode_tasks.add(tid)
-                        return tid
-                    else:
-                        return progress.add_task(label, total=total, visible=False)
-                else:
-                    return progress.add_task(label, total=total)
+            def add_visible_task(label, total, visible_tasks):
+                if len(visible_tasks) < visible_limit:
+                    tid = progress.add_task(label, total=total)
+                    visible_tasks.add(tid)
+                    return tid
+                return progress.add_task(label, total=total, visible=False)
+
+            def make_task_visible(task_id, visible_tasks):
+                # Make a hidden, unfinished task visible if there's a slot
+                task = progress.tasks[task_id]
+                if (
+                    not task.visible
+                    and not task.finished
+                    and len(visible_tasks) < visible_limit
+                ):
+                    progress.update(task_id, visible=True)
+                    visible_tasks.add(task_id)
 
-            def make_task_visible(task_id, task_type):
-                # Make a hidden task visible if there's a slot
-                if task_type == "upload":
-                    if (
-                        not progress.tasks[task_id].visible
-                        and len(visible_upload_tasks) < visible_limit
-                    ):
-                        progress.update(task_id, visible=True)
-                        visible_upload_tasks.add(task_id)
-                elif task_type == "transcode":
-                    if (
-                        not progress.tasks[task_id].visible
-                        and len(visible_transcode_tasks) < visible_limit
-                    ):
-                        progress.update(task_id, visible=True)
-                        visible_transcode_tasks.add(task_id)
-
-            # Patch wrapped_task to make next hidden task visible when one finishes
-            async def wrapped_task(
-                idx: int = 0,
-                upload_task_id: Optional[TaskID] = None,
-                transcode_task_id: Optional[TaskID] = None,
-            ):
-                result = await sem_task(
-                    audio_path=str(media_files[idx]),
-                    filename=filename_list[idx] if filename_list else None,
-                    loudnorm=loudnorm,
-                    poll_interval=poll_interval,
-                    max_attempts=max_attempts,
-                    show_progress=show_progress,
-                    progress=progress,
-                    upload_task_id=upload_task_id,
-                    transcode_task_id=transcode_task_id,
-                )
+            def on_file_done(idx, result):
                 progress.update(overall_task_id, advance=1)
                 # Hide completed upload/transcode tasks to keep UI clean
-                if upload_task_id is not None:
-                    progress.update(upload_task_id, visible=False)
-                if transcode_task_id is not None:
-                    progress.update(transcode_task_id, visible=False)
-                if upload_task_id in visible_upload_tasks:
-                    visible_upload_tasks.remove(upload_task_id)
-                if transcode_task_id in visible_transcode_tasks:
-                    visible_transcode_tasks.remove(transcode_task_id)
-                # Make next hidden upload/transcode task visible if slots available
+                for tid, visible_tasks in (
+                    (upload_task_ids[idx], visible_upload_tasks),
+                    (transcode_task_ids[idx], visible_transcode_tasks),
+                ):
+                    progress.update(tid, visible=False)
+                    visible_tasks.discard(tid)
+                # Make next hidden upload/transcode tasks visible if slots available
                 for tid in upload_task_ids:
-                    make_task_visible(tid, "upload")
+                    make_task_visible(tid, visible_upload_tasks)
                 for tid in transcode_task_ids:
-                    make_task_visible(tid, "transcode")
-                return result
+                    make_task_visible(tid, visible_transcode_tasks)
 
-            total_tasks = len(media_files)
-            overall_task_id = progress.add_task("Overall Progress", total=total_tasks)
+            overall_task_id = progress.add_task(
+                "Overall Progress", total=len(media_files)
+            )
             for idx, media_file in enumerate(media_files):
-                fname = None
-                if filename_list:
-                    fname = filename_list[idx]
-                upload_task_id = add_visible_task(
-                    f"Upload {fname or media_file}", 100, "upload", idx
+                fname = filename_list[idx] if filename_list else None
+                upload_task_ids.append(
+                    add_visible_task(
+                        f"Upload {fname or media_file}", 100, visible_upload_tasks
+                    )
                 )
-                transcode_task_id = add_visible_task(
-                    f"Transcode {fname or media_file}", max_attempts, "transcode", idx
+                transcode_task_ids.append(
+                    add_visible_task(
+                        f"Transcode {fname or media_file}",
+                        max_attempts,
+                        visible_transcode_tasks,
+                    )
                 )
-                upload_task_ids.append(upload_task_id)
-                transcode_task_ids.append(transcode_task_id)
-                tasks.append(wrapped_task())
-            results = await asyncio.gather(*tasks)
+            results = await self._upload_pipeline_async(
+                media_files,
+                filename_list=filename_list,
+                loudnorm=loudnorm,
+                poll_interval=poll_interval,
+                max_attempts=max_attempts,
+                max_concurrent_uploads=max_concurrent_uploads,
+                progress=progress,
+                upload_task_ids=upload_task_ids,
+                transcode_task_ids=transcode_task_ids,
+                on_file_done=on_file_done,
+                journal=journal,
+                journal_keys=journal_keys,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
         return results
 
     async def upload_and_transcode_and_create_card_async(
@@ -1325,52 +2262,39 @@ class YotoAPI:
         if filename_list and len(filename_list) != total:
             filename_list = None
 
-        semaphore = asyncio.Semaphore(max_concurrent_uploads)
-        results: list[TranscodedAudio | None] = [None] * total
-        errors = [None] * total
+        completed = 0
 
-        async def worker(idx, path, fname):
-            nonlocal results, errors
+        def on_file_done(idx, result):
+            nonlocal completed
+            completed += 1
+            if not callable(progress_callback):
+                return
+            label = (filename_list[idx] if filename_list else None) or str(
+                media_files[idx]
+            )
             try:
-                if callable(progress_callback):
-                    try:
-                        progress_callback(f"Uploading {fname or path}", idx / total)
-                    except Exception:
-                        pass
-                async with semaphore:
-                    tr = await self.upload_and_transcode_audio_async(
-                        audio_path=path,
-                        filename=fname,
-                        loudnorm=loudnorm,
-                        poll_interval=poll_interval,
-                        max_attempts=max_attempts,
-                        show_progress=show_progress,
-                    )
-                results[idx] = tr
-                if callable(progress_callback):
-                    try:
-                        progress_callback(
-                            f"Completed {fname or path}", (idx + 1) / total
-                        )
-                    except Exception:
-                        pass
-            except Exception as e:
-                errors[idx] = e
-                if callable(progress_callback):
-                    try:
-                        progress_callback(
-                            f"Error {fname or path}: {e}", (idx + 1) / total
-                        )
-                    except Exception:
-                        pass
+                if isinstance(result, BaseException):
+                    progress_callback(f"Error {label}: {result}", completed / total)
+                else:
+                    progress_callback(f"Completed {label}", completed / total)
+            except Exception:
+                pass
 
-        tasks = [
-            worker(
-                i, str(media_files[i]), (filename_list[i] if filename_list else None)
-            )
-            for i in range(total)
-        ]
-        await asyncio.gather(*tasks)
+        if callable(progress_callback):
+            try:
+                progress_callback(f"Uploading {total} files", 0.0)
+            except Exception:
+                pass
+        results = await self._upload_pipeline_async(
+            media_files,
+            filename_list=filename_list,
+            loudnorm=loudnorm,
+            poll_interval=poll_interval,
+            max_attempts=max_attempts,
+            max_concurrent_uploads=max_concurrent_uploads,
+            on_file_done=on_file_done,
+        )
+        errors = [r if isinstance(r, BaseException) else None for r in results]
 
         # If any worker errored, raise the first error
         for err in errors:
@@ -1470,10 +2394,25 @@ class YotoAPI:
         return created
 
     def upload_audio_file(
-        self, audio_upload_url: str, audio_bytes: bytes, mime_type: str = "audio/mpeg"
+        self,
+        audio_upload_url: str,
+        audio: bytes | str | Path,
+        mime_type: str = "audio/mpeg",
     ):
+        """PUT audio to a signed upload URL.
+
+        `audio` may be raw bytes or a file path; paths are streamed from disk
+        in chunks rather than read into memory.
+        """
         headers = {"Content-Type": mime_type}
-        put_resp = httpx.put(audio_upload_url, content=audio_bytes, headers=headers)
+        if isinstance(audio, (bytes, bytearray)):
+            content = audio
+        else:
+            headers["Content-Length"] = str(os.path.getsize(audio))
+            content = self._iter_file_chunks(audio)
+        put_resp = self._get_client().put(
+            audio_upload_url, content=content, headers=headers, timeout=300
+        )
         if not put_resp.is_success:
             logger.error(f"Audio upload failed: {put_resp.text}")
             raise Exception(f"Audio upload failed: {put_resp.text}")
@@ -1503,7 +2442,7 @@ class YotoAPI:
             ) as progress:
                 task = progress.add_task("Transcoding audio...", total=max_attempts)
                 while attempts < max_attempts:
-                    poll_resp = httpx.get(
+                    poll_resp = self._get_client().get(
                         transcode_url,
                         headers={"Authorization": f"Bearer {self.access_token}"},
                     )
@@ -1525,7 +2464,7 @@ class YotoAPI:
                     raise Exception("Transcoding timed out.")
         else:
             while attempts < max_attempts:
-                poll_resp = httpx.get(
+                poll_resp = self._get_client().get(
                     transcode_url,
                     headers={"Authorization": f"Bearer {self.access_token}"},
                 )
@@ -1748,25 +2687,14 @@ class YotoAPI:
         file_path = Path(audio_path)
 
         # Transcode audio
-        sha256, audio_bytes = self.calculate_sha256(audio_path)
-        logger.debug(f"SHA256: {sha256}")
-        upload_resp = self.get_audio_upload_url(sha256, filename)
-        upload = upload_resp.get("upload", upload_resp)
-        audio_upload_url = upload.get("uploadUrl")
-        upload_id = upload.get("uploadId")
-        if not audio_upload_url:
-            if upload.get("uploadId"):
-                logger.debug("File already exists on server, skipping upload.")
-            else:
-                logger.error("Failed to get upload URL.")
-                raise Exception("Failed to get upload URL.")
-        else:
-            logger.debug(f"Uploading audio to: {audio_upload_url}")
-            self.upload_audio_file(audio_upload_url, audio_bytes)
-        transcoded_audio_raw = self.poll_for_transcoding(
-            upload_id, loudnorm, poll_interval, max_attempts
+        transcoded_audio = self.upload_and_transcode_audio(
+            audio_path,
+            filename=filename,
+            loudnorm=loudnorm,
+            poll_interval=poll_interval,
+            max_attempts=max_attempts,
+            show_progress=False,
         )
-        transcoded_audio = TranscodedAudio.model_validate(transcoded_audio_raw)
         media_info = transcoded_audio.transcodedInfo
 
         # Determine next chapter key
@@ -1849,6 +2777,9 @@ class YotoAPI:
         if response.status_code == 404:
             logger.error("Content not found or not owned by user.")
         response.raise_for_status()
+        store = self._get_card_store()
+        if store is not None:
+            store.delete(content_id)
         return response.json() if response.text else {"status": response.status_code}
 
     def update_card(self, card: Card, return_card_model=True) -> dict | Card:
@@ -1871,10 +2802,15 @@ class YotoAPI:
     ):
         """
         Handles hashing, upload URL, upload, and transcoding for an audio file.
-        Returns transcoded audio info dict.
+        Returns a TranscodedAudio instance. Audio already recorded in the
+        upload index is returned without contacting the server.
         """
-        sha256, audio_bytes = self.calculate_sha256(audio_path)
+        sha256 = self._sha256_for_upload(audio_path)
         logger.debug(f"SHA256: {sha256}")
+        known = self._indexed_transcode(sha256, loudnorm)
+        if known is not None:
+            logger.debug(f"Reusing indexed transcode for {audio_path}")
+            return known
         upload_resp = self.get_audio_upload_url(sha256, filename)
         upload = upload_resp.get("upload", upload_resp)
         audio_upload_url = upload.get("uploadUrl")
@@ -1887,10 +2823,11 @@ class YotoAPI:
                 raise Exception("Failed to get upload URL.")
         else:
             logger.debug(f"Uploading audio to: {audio_upload_url}")
-            self.upload_audio_file(audio_upload_url, audio_bytes)
+            self.upload_audio_file(audio_upload_url, audio_path)
         transcoded_audio = self.poll_for_transcoding(
             upload_id, loudnorm, poll_interval, max_attempts, show_progress
         )
+        self._remember_transcode(sha256, transcoded_audio, loudnorm)
         return transcoded_audio
 
     def refresh_public_and_user_icons(
@@ -1929,7 +2866,7 @@ class YotoAPI:
                 icons = None
         if icons is None:
             headers = {"Authorization": f"Bearer {self.access_token}"}
-            resp = httpx.get(url, headers=headers)
+            resp = self._get_client().get(url, headers=headers)
             resp.raise_for_status()
             icons = resp.json().get("displayIcons", [])
         if show_in_console:
@@ -1954,7 +2891,7 @@ class YotoAPI:
                     icon_item["cache_path"] = str(cache_path)
                     if not cache_path.exists() or refresh_cache:
                         try:
-                            resp = httpx.get(url)
+                            resp = self._get_client().get(url)
                             resp.raise_for_status()
                             cache_path.write_bytes(resp.content)
                         except Exception as e:
@@ -2040,7 +2977,7 @@ class YotoAPI:
                     icon_item["cache_path"] = str(cache_path)
                     if not cache_path.exists() or refresh_cache:
                         try:
-                            resp = httpx.get(url)
+                            resp = self._get_client().get(url)
                             resp.raise_for_status()
                             cache_path.write_bytes(resp.content)
                         except Exception as e:
@@ -2085,7 +3022,7 @@ class YotoAPI:
             except Exception:
                 icons = None
         headers = {"Authorization": f"Bearer {self.access_token}"}
-        resp = httpx.get(url, headers=headers)
+        resp = self._get_client().get(url, headers=headers)
         resp.raise_for_status()
         user_icons = resp.json().get("displayIcons", [])
         # Merge user_icons into icons, avoiding duplicates by displayIconId
@@ -2119,7 +3056,7 @@ class YotoAPI:
                     icon["cache_path"] = str(cache_path)
                     if not cache_path.exists() or refresh_cache:
                         try:
-                            img_resp = httpx.get(icon["url"])
+                            img_resp = self._get_client().get(icon["url"])
                             img_resp.raise_for_status()
                             cache_path.write_bytes(img_resp.content)
                         except Exception as e:
@@ -2163,7 +3100,7 @@ class YotoAPI:
                 icon["cache_path"] = str(cache_path)
                 if not cache_path.exists() or refresh_cache:
                     try:
-                        img_resp = httpx.get(icon["url"])
+                        img_resp = self._get_client().get(icon["url"])
                         img_resp.raise_for_status()
                         cache_path.write_bytes(img_resp.content)
                     except Exception as e:
@@ -2380,7 +3317,7 @@ class YotoAPI:
                     console=console,
                 ) as progress:
                     scrape_task = progress.add_task("Scraping icons...", total=limit)
-                    resp = httpx.get(url)
+                    resp = self._get_client().get(url)
                     if resp.status_code != 200:
                         raise RuntimeError(f"Failed to fetch yotoicons: {resp.status_code}")
                     soup = BeautifulSoup(resp.text, "html.parser")
@@ -2418,7 +3355,7 @@ class YotoAPI:
                         if len(icons) >= limit:
                             break
             else:
-                resp = httpx.get(url)
+                resp = self._get_client().get(url)
                 if resp.status_code != 200:
                     raise RuntimeError(f"Failed to fetch yotoicons: {resp.status_code}")
                 soup = BeautifulSoup(resp.text, "html.parser")
@@ -2495,7 +3432,7 @@ class YotoAPI:
                     icon["cache_path"] = str(cache_path)
                     if refresh_cache or not cache_path.exists():
                         try:
-                            img_resp = httpx.get(icon["img_url"])
+                            img_resp = self._get_client().get(icon["img_url"])
                             img_resp.raise_for_status()
                             img_bytes = img_resp.content
                             # Resize to 16x16 if needed
@@ -2520,7 +3457,7 @@ class YotoAPI:
                 icon["cache_path"] = str(cache_path)
                 if refresh_cache or not cache_path.exists():
                     try:
-                        img_resp = httpx.get(icon["img_url"])
+                        img_resp = self._get_client().get(icon["img_url"])
                         img_resp.raise_for_status()
                         img_bytes = img_resp.content
                         try:
@@ -2875,7 +3812,7 @@ class YotoAPI:
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": mime_type,
         }
-        response = httpx.post(url, headers=headers, params=params, content=icon_bytes)
+        response = self._get_client().post(url, headers=headers, params=params, content=icon_bytes)
         try:
             response.raise_for_status()
         except httpx.HTTPError:
@@ -2982,9 +3919,9 @@ class YotoAPI:
 
         _call_cb("Uploading cover...", 0.0)
         if data is not None:
-            resp = httpx.post(url, headers=headers, params=params, content=data)
+            resp = self._get_client().post(url, headers=headers, params=params, content=data)
         else:
-            resp = httpx.post(url, headers=headers, params=params)
+            resp = self._get_client().post(url, headers=headers, params=params)
 
         logger.debug(
             f"Cover image upload response: {resp.status_code} {getattr(resp, 'text', '')[:200]}"
@@ -3106,7 +4043,7 @@ class YotoAPI:
                             return p
                         # Try to download now
                         try:
-                            resp = httpx.get(url)
+                            resp = self._get_client().get(url)
                             resp.raise_for_status()
                             p.write_bytes(resp.content)
                             return p
@@ -3128,7 +4065,7 @@ class YotoAPI:
                     if p.exists():
                         return p
                     try:
-                        resp = httpx.get(url)
+                        resp = self._get_client().get(url)
                         resp.raise_for_status()
                         p.write_bytes(resp.content)
                         return p
@@ -3629,7 +4566,7 @@ class YotoAPI:
             "Content-Type": "application/json",
         }
         payload = {"name": name, "config": config}
-        response = httpx.put(url, headers=headers, json=payload)
+        response = self._get_client().put(url, headers=headers, json=payload)
         if response.status_code != 200:
             logger.error(
                 f"Failed to update device config: {response.status_code} {response.text}"
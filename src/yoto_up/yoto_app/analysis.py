@@ -4,7 +4,8 @@ This module exposes per-window (sub-second) and per-second common-prefix
 analysis functions plus lower-level MFCC helpers used by the UI.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple, TypeAlias, Union
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, TypeAlias, Union
 import numpy as np
 import librosa
 from librosa.feature import mfcc as _librosa_mfcc
@@ -12,6 +13,13 @@ from librosa.feature import delta as _librosa_delta, rms as _librosa_rms, spectr
 from pathlib import Path
 import json
 
+from yoto_up.feature_cache import get_feature_cache
+from yoto_up.waveform_utils import load_audio as _decode_audio, run_pooled
+
+
+# Bump when a change alters the MFCC features computed here so that entries
+# in the persistent feature cache are recomputed
+FEATURE_VERSION = 1
 
 AudioPath: TypeAlias = str
 AudioPaths: TypeAlias = List[AudioPath]
@@ -45,8 +53,23 @@ class PerWindowCommonPrefixResult:
         }
 
 
-def load_audio_mono(path: str, sr: int = 22050) -> Tuple[np.ndarray, Union[int, float]]:
-    y, sr_out = librosa.load(path, sr=sr, mono=True)
+def load_audio_mono(
+    path: str,
+    sr: int = 22050,
+    offset: float = 0.0,
+    duration: Optional[float] = None,
+) -> Tuple[np.ndarray, Union[int, float]]:
+    """Load (part of) a file as mono audio at `sr`.
+
+    `offset`/`duration` are in seconds; a negative offset counts back from
+    the end of the file. ffmpeg seeks to the requested span so only that
+    part is decoded and resampled; librosa is used when ffmpeg cannot be.
+    """
+    y, sr_out = _decode_audio(path, sample_rate=sr, offset=offset, duration=duration)
+    if y is None:
+        if offset < 0:
+            offset = max(0.0, librosa.get_duration(path=path) + offset)
+        y, sr_out = librosa.load(path, sr=sr, mono=True, offset=offset, duration=duration)
     try:
         sr_out = int(sr_out)
     except Exception:
@@ -54,6 +77,13 @@ def load_audio_mono(path: str, sr: int = 22050) -> Tuple[np.ndarray, Union[int,
     return y, sr_out
 
 
+def _load_side(path: str, side: str, seconds: float, sr: int) -> Tuple[np.ndarray, Union[int, float]]:
+    """Decode only the first (intro) or last (outro) `seconds` of a file."""
+    if side == 'intro':
+        return load_audio_mono(path, sr=sr, duration=seconds)
+    return load_audio_mono(path, sr=sr, offset=-float(seconds))
+
+
 def mfcc_summary(y: np.ndarray, sr: int, n_mfcc: int = 20) -> np.ndarray:
     if y.size == 0:
         return np.zeros(n_mfcc * 2, dtype=float)
@@ -88,23 +118,67 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     return float(np.dot(a, b) / (na * nb))
 
 
-def _compute_mfcc_sequence(path: str, side: str, seconds: float, sr: int = 22050, n_mfcc: int = 20, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
-    y, sr_out = load_audio_mono(path, sr=sr)
+def _side_mfcc(
+    path: str,
+    side: str,
+    seconds: float,
+    sr: int = 22050,
+    n_mfcc: int = 20,
+    n_fft: int = 2048,
+    hop_length: int = 512,
+) -> Tuple[np.ndarray, int, int]:
+    """MFCC matrix of a file's intro/outro span, with the span's length in samples and its rate.
+
+    Results are kept in the persistent feature cache (as float16) and reused
+    while the file is unchanged. Files that decode to nothing give an empty
+    matrix and are not cached.
+    """
+    params = (FEATURE_VERSION, side, float(seconds), int(sr), int(n_mfcc), int(n_fft), int(hop_length))
+    cache = get_feature_cache()
+    if cache is not None:
+        cached = cache.get(path, params)
+        if cached is not None:
+            return cached
+    y, sr_out = _load_side(path, side, seconds, sr)
     if y.size == 0:
-        return np.zeros((n_mfcc, 1), dtype=float)
-    n_samples = int(seconds * sr_out)
-    if side == 'intro':
-        seg = y[:n_samples]
-    else:
-        seg = y[-n_samples:]
+        return np.zeros((n_mfcc, 0), dtype=float), 0, int(sr_out)
     try:
-        mf = _librosa_mfcc(y=seg, sr=sr_out, n_mfcc=n_mfcc, n_fft=n_fft, hop_length=hop_length)
+        mf = _librosa_mfcc(y=y, sr=sr_out, n_mfcc=n_mfcc, n_fft=n_fft, hop_length=hop_length)
     except Exception:
-        mf = _librosa_mfcc(y=seg, sr=sr_out, n_mfcc=n_mfcc)
+        mf = _librosa_mfcc(y=y, sr=sr_out, n_mfcc=n_mfcc)
+    if cache is not None:
+        cache.put(path, params, mf, len(y), int(sr_out))
+    return mf, len(y), int(sr_out)
+
+
+def _compute_mfcc_sequence(path: str, side: str, seconds: float, sr: int = 22050, n_mfcc: int = 20, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
+    mf, _, _ = _side_mfcc(path, side, seconds, sr=sr, n_mfcc=n_mfcc, n_fft=n_fft, hop_length=hop_length)
+    if mf.shape[1] == 0:
+        return np.zeros((n_mfcc, 1), dtype=float)
     return mf
 
 
-def _dtw_prefix_similarity(a_path: str, b_path: str, side: str, max_seconds: float, sr: int = 22050, n_mfcc: int = 20, hop_length: int = 512, step_seconds: float = 0.25, dtw_threshold: float = 0.5) -> tuple:
+def _dtw_prefix_similarity(
+    a_path: str,
+    b_path: str,
+    side: str,
+    max_seconds: float,
+    sr: int = 22050,
+    n_mfcc: int = 20,
+    hop_length: int = 512,
+    step_seconds: float = 0.25,
+    dtw_threshold: float = 0.5,
+    band_seconds: Optional[float] = None,
+) -> tuple:
+    """Find the prefix length (in `step_seconds` steps) at which two files align best.
+
+    Returns (best similarity, prefix seconds), where similarity is
+    1 / (1 + DTW cost per frame) and only prefixes scoring at least
+    `dtw_threshold` count; (0.0, 0.0) if none do. A single DTW over the longest prefix is enough:
+    its accumulated cost at (k-1, k-1) is the DTW cost of the first k
+    frames of both files. `band_seconds` restricts the alignment path to a
+    Sakoe-Chiba band of that radius around the diagonal.
+    """
     try:
         mf_a = _compute_mfcc_sequence(a_path, side=side, seconds=max_seconds, sr=sr, n_mfcc=n_mfcc)
     except Exception:
@@ -123,38 +197,81 @@ def _dtw_prefix_similarity(a_path: str, b_path: str, side: str, max_seconds: flo
         return 0.0, 0.0
 
     fps = float(sr) / float(max(1, hop_length))
-    best_sim = 0.0
-    best_t = 0.0
-    t = max(step_seconds, 0.25)
-    while t <= max_seconds + 1e-9:
-        n_frames = max(1, int(np.round(t * fps)))
-        avail = min(mf_a.shape[1], mf_b.shape[1])
-        take = min(n_frames, avail)
-        if take <= 0:
-            break
-        A = mf_a[:, :take]
-        B = mf_b[:, :take]
+    t0 = max(step_seconds, 0.25)
+    if t0 > max_seconds + 1e-9:
+        return 0.0, 0.0
+    steps = t0 + step_seconds * np.arange(int(np.floor((max_seconds + 1e-9 - t0) / step_seconds)) + 1)
+    avail = min(mf_a.shape[1], mf_b.shape[1])
+    takes = np.minimum(np.maximum(1, np.round(steps * fps).astype(int)), avail)
+
+    A = mf_a[:, :avail]
+    B = mf_b[:, :avail]
+    try:
+        sq = (A * A).sum(axis=0)[:, None] + (B * B).sum(axis=0)[None, :] - 2.0 * (A.T @ B)
+        D = np.sqrt(np.maximum(sq, 0.0))
         try:
-            D = np.linalg.norm(A[:, :, None] - B[:, None, :], axis=0)
-            try:
-                from librosa.sequence import dtw as _lib_dtw
-                wp_cost, wp = _lib_dtw(C=D)
-                dtw_cost = float(wp_cost[-1, -1])
-            except Exception:
-                dtw_cost = float(np.mean(D))
-            denom = max(1, take)
-            norm_cost = dtw_cost / float(denom)
-            dtw_sim = 1.0 / (1.0 + norm_cost)
+            from librosa.sequence import dtw as _lib_dtw
+
+            if band_seconds is not None:
+                acc = _lib_dtw(
+                    C=D,
+                    backtrack=False,
+                    global_constraints=True,
+                    band_rad=float(band_seconds) * fps / float(avail),
+                )
+            else:
+                acc = _lib_dtw(C=D, backtrack=False)
+            costs = acc[takes - 1, takes - 1]
         except Exception:
-            dtw_sim = 0.0
+            # mean of each leading k x k block, from 2-D prefix sums
+            csum = D.cumsum(axis=0).cumsum(axis=1)
+            costs = csum[takes - 1, takes - 1] / (takes.astype(float) ** 2)
+        sims = 1.0 / (1.0 + costs / takes)
+    except Exception:
+        return 0.0, 0.0
 
-        if dtw_sim >= float(dtw_threshold) and dtw_sim > best_sim:
-            best_sim = float(dtw_sim)
-            best_t = float(t)
+    sims = np.where(np.isfinite(sims) & (sims >= float(dtw_threshold)), sims, 0.0)
+    if not sims.any():
+        return 0.0, 0.0
+    best = int(np.argmax(sims))
+    return float(sims[best]), float(steps[best])
 
-        t += step_seconds
 
-    return float(best_sim), float(best_t)
+def _window_features(
+    path: str,
+    side: str,
+    max_seconds: float,
+    window_seconds: float,
+    sr: int = 22050,
+    n_mfcc: int = 13,
+    hop_length: int = 512,
+) -> np.ndarray:
+    """Mean MFCC vector of each `window_seconds` window of a file's intro/outro.
+
+    One MFCC pass covers the whole analysed span; each frame is assigned to
+    the window containing its centre and the window means are pooled from
+    those frames. Window 0 is at the start for intros and at the end for
+    outros. Returns an (n_windows, n_mfcc) array; windows past the end of
+    a short file, or of a file that fails to decode, are zero.
+    """
+    n_windows = max(0, int(np.floor(float(max_seconds) / float(max(1e-6, window_seconds)))))
+    out = np.zeros((n_windows, n_mfcc), dtype=float)
+    try:
+        mf, n_samples, sr_out = _side_mfcc(path, side, float(max_seconds), sr, n_mfcc, hop_length=hop_length)
+        if n_samples == 0 or n_windows == 0:
+            return out
+    except Exception:
+        return out
+    centres = np.arange(mf.shape[1]) * hop_length
+    if side != 'intro':
+        centres = n_samples - centres
+    win = np.floor(centres / (float(window_seconds) * sr_out)).astype(int)
+    keep = (win >= 0) & (win < n_windows) & (centres <= n_samples)
+    counts = np.bincount(win[keep], minlength=n_windows)
+    np.add.at(out, win[keep], mf[:, keep].T)
+    filled = counts > 0
+    out[filled] /= counts[filled, None]
+    return out
 
 
 def per_window_common_prefix(
@@ -166,73 +283,54 @@ def per_window_common_prefix(
     n_mfcc: int = 13,
     similarity_threshold: float = 0.95,
     min_files_fraction: float = 0.75,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_workers: Optional[int] = None,
+    executor: str = "auto",
 ) -> PerWindowCommonPrefixResult:
+    """Find how many leading (intro) or trailing (outro) windows most files share.
+
+    Features are extracted from up to `max_workers` files at once (default:
+    CPU count) by `waveform_utils.run_pooled`, in worker processes unless
+    `executor` says otherwise; `progress_callback(done, total)` is called
+    from the calling thread as each file finishes.
+    """
     result = PerWindowCommonPrefixResult(
         max_seconds=float(max_seconds),
         window_seconds=float(window_seconds),
     )
 
     n_windows = max(0, int(np.floor(float(max_seconds) / float(max(1e-6, window_seconds)))))
-    per_file_vectors = {}
-    for p in paths:
-        try:
-            y, sr_out = load_audio_mono(p, sr=sr)
-            if y.size == 0:
-                per_file_vectors[p] = [np.zeros(n_mfcc, dtype=float)] * n_windows
-                continue
-            vecs = []
-            for w in range(n_windows):
-                if side == 'intro':
-                    start = int(w * window_seconds * sr_out)
-                    end = int(min((w + 1) * window_seconds * sr_out, len(y)))
-                else:
-                    end = len(y) - int(w * window_seconds * sr_out)
-                    start = max(0, len(y) - int((w + 1) * window_seconds * sr_out))
-                if start >= end:
-                    seg = np.zeros(1)
-                else:
-                    seg = y[start:end]
-                try:
-                    mf = _librosa_mfcc(y=seg, sr=sr_out, n_mfcc=n_mfcc)
-                    mv = np.mean(mf, axis=1)
-                except Exception:
-                    mv = np.zeros(n_mfcc, dtype=float)
-                vecs.append(np.asarray(mv, dtype=float))
-            per_file_vectors[p] = vecs
-        except Exception:
-            per_file_vectors[p] = [np.zeros(n_mfcc, dtype=float)] * n_windows
-
-    def _norm(v: np.ndarray) -> np.ndarray:
-        v = np.asarray(v, dtype=float)
-        v = v - np.mean(v)
-        n = np.linalg.norm(v)
-        if n < 1e-8:
-            return v
-        return v / n
-
-    for w in range(n_windows):
-        vecs = [per_file_vectors[p][w] for p in paths]
-        stacked = np.stack(vecs, axis=0) if vecs else np.zeros((0, n_mfcc))
-        if stacked.size == 0:
-            result.per_window_frac.append(0.0)
-            for p in paths:
-                result.per_file_per_window.setdefault(p, []).append(0.0)
-            break
-        tmpl = _norm(np.mean(stacked, axis=0))
-        sims = []
-        for p in paths:
-            v = _norm(per_file_vectors[p][w])
-            sim = float(np.dot(tmpl, v)) if tmpl.size and v.size else 0.0
-            sims.append(sim)
-            result.per_file_per_window.setdefault(p, []).append(sim)
-        frac = float(sum(1 for x in sims if x >= float(similarity_threshold))) / float(len(sims)) if sims else 0.0
-        result.per_window_frac.append(float(frac))
-        if frac >= float(min_files_fraction):
-            result.windows_matched += 1
-            result.seconds_matched = result.windows_matched * float(window_seconds)
-            continue
-        else:
-            break
+    feats = np.zeros((len(paths), n_windows, n_mfcc), dtype=float)
+    extract = partial(
+        _window_features,
+        side=side,
+        max_seconds=max_seconds,
+        window_seconds=window_seconds,
+        sr=sr,
+        n_mfcc=n_mfcc,
+    )
+    for i, f in enumerate(run_pooled(paths, extract, progress_callback, max_workers, executor)):
+        feats[i] = f
+
+    if n_windows and not paths:
+        result.per_window_frac.append(0.0)
+    elif n_windows:
+        def _norm(v: np.ndarray) -> np.ndarray:
+            v = v - v.mean(axis=-1, keepdims=True)
+            n = np.linalg.norm(v, axis=-1, keepdims=True)
+            return np.where(n < 1e-8, v, v / np.maximum(n, 1e-8))
+
+        tmpl = _norm(feats.mean(axis=0))  # (windows, n_mfcc)
+        sims = np.einsum('fwk,wk->fw', _norm(feats), tmpl)  # (files, windows)
+        frac = np.mean(sims >= float(similarity_threshold), axis=0)
+        failing = np.flatnonzero(frac < float(min_files_fraction))
+        result.windows_matched = int(failing[0]) if failing.size else n_windows
+        result.seconds_matched = result.windows_matched * float(window_seconds)
+        # Report scores up to and including the first window that failed
+        shown = min(n_windows, result.windows_matched + 1)
+        result.per_window_frac = [float(v) for v in frac[:shown]]
+        for i, p in enumerate(paths):
+            result.per_file_per_window[p] = [float(v) for v in sims[i, :shown]]
 
     try:
         out_dir = Path('.tmp_trim/previews')
@@ -253,8 +351,10 @@ def per_second_common_prefix(
     n_mfcc: int = 13,
     similarity_threshold: float = 0.95,
     min_files_fraction: float = 0.75,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_workers: Optional[int] = None,
 ) -> PerWindowCommonPrefixResult:
-    return per_window_common_prefix(paths=paths, side=side, max_seconds=max_seconds, window_seconds=1.0, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction)
+    return per_window_common_prefix(paths=paths, side=side, max_seconds=max_seconds, window_seconds=1.0, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction, progress_callback=progress_callback, max_workers=max_workers)
 
 
 def common_prefix_duration(*args, **kwargs):
@@ -19,7 +19,7 @@ Notes / limitations:
   `requirements.txt`.
 """
 
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 import os
 import numpy as np
 from .analysis import AudioPaths, PerWindowCommonPrefixResult
@@ -58,6 +58,8 @@ def per_second_common_prefix(
     n_mfcc: int = 13,
     similarity_threshold: float = 0.95,
     min_files_fraction: float = 0.75,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_workers: Optional[int] = None,
 ) -> PerWindowCommonPrefixResult:
     # Lazy import to avoid import-time failures when analysis deps are not present
     try:
@@ -72,7 +74,7 @@ def per_second_common_prefix(
             max_seconds=float(max_seconds),
             window_seconds=1.0,
         )
-    return _analysis_per_second_common_prefix(paths=paths, side=side, max_seconds=max_seconds, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction)
+    return _analysis_per_second_common_prefix(paths=paths, side=side, max_seconds=max_seconds, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction, progress_callback=progress_callback, max_workers=max_workers)
 
 
 def per_window_common_prefix(
@@ -84,6 +86,8 @@ def per_window_common_prefix(
     n_mfcc: int = 13,
     similarity_threshold: float = 0.95,
     min_files_fraction: float = 0.75,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_workers: Optional[int] = None,
 ) -> PerWindowCommonPrefixResult:
     # Lazy import to avoid import-time failures when analysis deps are not present
     try:
@@ -98,7 +102,7 @@ def per_window_common_prefix(
             max_seconds=float(max_seconds),
             window_seconds=float(window_seconds),
         )
-    return _analysis_per_window_common_prefix(paths=paths, side=side, max_seconds=max_seconds, window_seconds=window_seconds, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction)
+    return _analysis_per_window_common_prefix(paths=paths, side=side, max_seconds=max_seconds, window_seconds=window_seconds, sr=sr, n_mfcc=n_mfcc, similarity_threshold=similarity_threshold, min_files_fraction=min_files_fraction, progress_callback=progress_callback, max_workers=max_workers)
 
 
 def _compute_mfcc_sequence(path: str, side: str, seconds: float, sr: int = 22050, n_mfcc: int = 20, n_fft: int = 2048, hop_length: int = 512) -> np.ndarray:
@@ -109,12 +113,12 @@ def _compute_mfcc_sequence(path: str, side: str, seconds: float, sr: int = 22050
     return _analysis_compute_mfcc_sequence(path=path, side=side, seconds=seconds, sr=sr, n_mfcc=n_mfcc, n_fft=n_fft, hop_length=hop_length)
 
 
-def _dtw_prefix_similarity(a_path: str, b_path: str, side: str, max_seconds: float, sr: int = 22050, n_mfcc: int = 20, hop_length: int = 512, step_seconds: float = 0.25, dtw_threshold: float = 0.5) -> tuple:
+def _dtw_prefix_similarity(a_path: str, b_path: str, side: str, max_seconds: float, sr: int = 22050, n_mfcc: int = 20, hop_length: int = 512, step_seconds: float = 0.25, dtw_threshold: float = 0.5, band_seconds: Optional[float] = None) -> tuple:
     try:
         from .analysis import _dtw_prefix_similarity as _analysis_dtw_prefix_similarity
     except Exception:
         raise RuntimeError("analysis DTW helper unavailable")
-    return _analysis_dtw_prefix_similarity(a_path=a_path, b_path=b_path, side=side, max_seconds=max_seconds, sr=sr, n_mfcc=n_mfcc, hop_length=hop_length, step_seconds=step_seconds, dtw_threshold=dtw_threshold)
+    return _analysis_dtw_prefix_similarity(a_path=a_path, b_path=b_path, side=side, max_seconds=max_seconds, sr=sr, n_mfcc=n_mfcc, hop_length=hop_length, step_seconds=step_seconds, dtw_threshold=dtw_threshold, band_seconds=band_seconds)
 
 def common_prefix_duration(*args, **kwargs):
     """Legacy API: keep in analysis for callers that want the heavier frame-based method.
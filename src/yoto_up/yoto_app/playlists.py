@@ -55,6 +55,14 @@ def _get_playlist_checkbox_control(ctrl: object) -> ft.Checkbox | None:
     return None
 
 
+def _fetch_cards(api: YotoAPI, card_ids: list[str]) -> dict[str, Any]:
+    """Fetch full cards for the selected ids in parallel.
+
+    Maps each id to its Card, or to the exception raised while fetching it.
+    """
+    return dict(zip(card_ids, api.get_cards_many(card_ids)))
+
+
 def card_matches_filters(card_obj: Card, filters: Dict[str, Any]):
     tf = (filters.get("title") or "").strip().lower()
     if tf:
@@ -833,9 +841,11 @@ def build_playlists_panel(
             updated = 0
             CategoryType = Literal["", "none", "stories", "music", "radio", "podcast", "sfx", "activities", "alarms"]
             allowed_categories = {"", "none", "stories", "music", "radio", "podcast", "sfx", "activities", "alarms"}
-            for cid in list(page.selected_playlist_ids):
+            fetched = _fetch_cards(api, list(page.selected_playlist_ids))
+            for cid, card in fetched.items():
                 try:
-                    card = api.get_card(cid)
+                    if isinstance(card, Exception):
+                        raise card
                     meta = getattr(card, "metadata", CardMetadata())
                     if new_cat == "":
                         # interpret empty as clearing category
@@ -862,9 +872,11 @@ def build_playlists_panel(
         def do_remove_category(_e=None):
             # Explicitly remove/clear category for selected playlists
             removed = 0
-            for cid in list(page.selected_playlist_ids):
+            fetched = _fetch_cards(api, list(page.selected_playlist_ids))
+            for cid, card in fetched.items():
                 try:
-                    card = api.get_card(cid)
+                    if isinstance(card, Exception):
+                        raise card
                     meta = getattr(card, "metadata", CardMetadata())
                     try:
                         meta.category = ""
@@ -915,9 +927,11 @@ def build_playlists_panel(
                 return
             updated = 0
             failed = 0
-            for cid in list(page.selected_playlist_ids):
+            fetched = _fetch_cards(api, list(page.selected_playlist_ids))
+            for cid, card in fetched.items():
                 logger.error(f"Adding tags {tags} to playlist {cid}")
-                card = api.get_card(cid)
+                if isinstance(card, Exception):
+                    raise card
                 meta = getattr(card, "metadata", CardMetadata())
                 print(f"Existing metadata for {cid}: {meta}")
                 card_tags = getattr(meta, "tags", None)
@@ -962,9 +976,11 @@ def build_playlists_panel(
         def do_set_author(_e=None):
             new_author = (author_field.value or "").strip()
             updated = 0
-            for cid in list(page.selected_playlist_ids):
+            fetched = _fetch_cards(api, list(page.selected_playlist_ids))
+            for cid, card in fetched.items():
                 try:
-                    card = api.get_card(cid)
+                    if isinstance(card, Exception):
+                        raise card
                     meta = getattr(card, "metadata", CardMetadata())
                     try:
                         meta.author = new_author
@@ -983,9 +999,11 @@ def build_playlists_panel(
 
         def do_remove_author(_e=None):
             removed = 0
-            for cid in list(page.selected_playlist_ids):
+            fetched = _fetch_cards(api, list(page.selected_playlist_ids))
+            for cid, card in fetched.items():
                 try:
-                    card = api.get_card(cid)
+                    if isinstance(card, Exception):
+                        raise card
                     meta = getattr(card, "metadata", CardMetadata())
                     try:
                         meta.author = ""
@@ -1119,9 +1137,23 @@ def build_playlists_panel(
         out_dir = Path("cards")
         out_dir.mkdir(parents=True, exist_ok=True)
         exported = 0
+        # Unchanged cards come from the local card store; only changed ones are fetched
+        summaries = {c.cardId: c for c in (getattr(page, "cards", None) or [])}
+        try:
+            synced = {
+                c.cardId: c
+                for c in api.get_cards_synced(
+                    [summaries[cid] for cid in to_export if cid in summaries]
+                )
+            }
+        except Exception as e:
+            logger.debug(f"[export] card sync failed, fetching individually: {e}")
+            synced = {}
         for cid in to_export:
             try:
-                card = api.get_card(cid)
+                card = synced.get(cid)
+                if card is None or card is summaries.get(cid):
+                    card = api.get_card(cid)
                 try:
                     data = card.model_dump(exclude_none=True)
                 except Exception:
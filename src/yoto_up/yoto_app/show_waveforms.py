@@ -1,6 +1,5 @@
 import flet as ft
 from loguru import logger
-import numpy as np
 import matplotlib
 
 # Use non-GUI backend to avoid Tk/Tcl dependency when running headless
@@ -8,11 +7,10 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import io
 import base64
-import contextlib
-import wave
 import os
 import tempfile
-from yoto_up.waveform_utils import batch_audio_stats
+from yoto_up.waveform_utils import batch_audio_stats, can_decode, load_audio
+from yoto_up.analysis_cache import get_analysis_cache
 
 WAVEFORM_DIALOG = None
 
@@ -54,56 +52,51 @@ def show_waveforms_popup(
         page.update()
 
     stats_results = batch_audio_stats(
-        files, waveform_cache, progress_callback=progress_callback
+        files,
+        waveform_cache,
+        progress_callback=progress_callback,
+        disk_cache=get_analysis_cache(),
     )
     page.update()
 
     skipped_files = []
+    # filepath -> (max_amp, avg_amp, lufs) measured at 0 dB gain
+    base_stats = {}
     for idx, stat in enumerate(stats_results):
-        audio, max_amp, avg_amp, lufs, ext, filepath = stat
-        if audio is None:
-            reason = None
-            if ext is None:
-                reason = "Unrecognized or missing file extension."
-            elif ext not in [".wav", ".mp3"]:
-                reason = f"Unsupported extension: {ext}"
-            elif not filepath or not os.path.exists(filepath):
-                reason = "File does not exist."
-            else:
-                reason = "Could not decode audio or file is empty/corrupt."
-            display_name = os.path.basename(filepath) if filepath else "(unknown)"
-            skipped_files.append(f"{display_name}: {reason}")
-
-    def plot_and_stats(audio, framerate, ext, filepath, gain_db=0.0):
-        import pyloudnorm as pyln
-
-        audio_adj = audio * (10 ** (gain_db / 20.0))
-        max_amp = float(np.max(np.abs(audio_adj)))
-        avg_amp = float(np.mean(np.abs(audio_adj)))
-        try:
-            meter = pyln.Meter(framerate)
-            lufs = float(meter.integrated_loudness(audio_adj))
-        except Exception:
-            lufs = None
-        max_points = 2000
-        n = len(audio_adj)
-        if n > max_points:
-            idx = np.linspace(0, n - 1, max_points).astype(int)
-            audio_plot = audio_adj[idx]
-        else:
-            audio_plot = audio_adj
-        if ext == ".wav":
-            with contextlib.closing(wave.open(filepath, "rb")) as wf:
-                framerate = wf.getframerate()
-                n_frames = wf.getnframes()
-                times = np.linspace(0, n_frames / framerate, num=n)
+        envelope, max_amp, avg_amp, lufs, ext, filepath = stat
+        if envelope is not None:
+            base_stats[filepath] = (max_amp, avg_amp, lufs)
+            continue
+        reason = None
+        if ext is None:
+            reason = "Unrecognized or missing file extension."
+        elif not can_decode(ext):
+            reason = f"Unsupported extension: {ext}"
+        elif not filepath or not os.path.exists(filepath):
+            reason = "File does not exist."
         else:
-            framerate = 44100
-            times = np.linspace(0, n / framerate, num=n)
-        if n > max_points:
-            times = times[idx]
+            reason = "Could not decode audio or file is empty/corrupt."
+        display_name = os.path.basename(filepath) if filepath else "(unknown)"
+        skipped_files.append(f"{display_name}: {reason}")
+
+    def _adjusted_samples(filepath, gain_db):
+        """Decode `filepath` and apply `gain_db`; returns (samples, framerate) for saving."""
+        samples, framerate = load_audio(filepath)
+        if samples is None:
+            raise RuntimeError("could not decode audio")
+        return samples * (10 ** (gain_db / 20.0)), framerate
+
+    def plot_and_stats(envelope, framerate, ext, filepath, gain_db=0.0):
+        # Gain scales amplitudes linearly and shifts loudness by gain_db, so the
+        # stats measured once at 0 dB are enough for any slider position.
+        gain = 10 ** (gain_db / 20.0)
+        base_max, base_avg, base_lufs = base_stats.get(filepath, (0.0, 0.0, None))
+        max_amp = float(base_max or 0.0) * gain
+        avg_amp = float(base_avg or 0.0) * gain
+        lufs = base_lufs + gain_db if base_lufs is not None else None
+        times, mins, maxs = envelope.points(max_points=2000)
         fig, ax = plt.subplots(figsize=(4, 1.2))
-        ax.plot(times, audio_plot, color="blue")
+        ax.fill_between(times, mins * gain, maxs * gain, color="blue", linewidth=0.5)
         ax.set_title(os.path.basename(filepath) if filepath else "(unknown)", fontsize=8)
         ax.set_xlabel("Time (s)", fontsize=7)
         ax.set_ylabel("Amplitude", fontsize=7)
@@ -146,13 +139,10 @@ def show_waveforms_popup(
 
     # Actually process stats_results to build per_track and n_images
     for stat in stats_results:
-        audio, max_amp, avg_amp, lufs, ext, filepath = stat
-        if audio is not None:
-            if ext == ".wav":
-                with contextlib.closing(wave.open(filepath, "rb")) as wf:
-                    framerate = wf.getframerate()
-            else:
-                framerate = 44100
+        envelope, max_amp, avg_amp, lufs, ext, filepath = stat
+        if envelope is not None:
+            # only the waveform envelope is kept; samples are decoded again to save
+            framerate = envelope.framerate
             # Use last gain value for this file if available
             last_gain = page._track_gains.get(filepath, 0.0)
             gain_slider = ft.Slider(
@@ -164,7 +154,7 @@ def show_waveforms_popup(
                 width=320,
             )
             label, warning, tmp_path, _lufs = plot_and_stats(
-                audio, framerate, ext, filepath, gain_db=last_gain
+                envelope, framerate, ext, filepath, gain_db=last_gain
             )
             img = ft.Image(src=tmp_path, width=320, height=100)
             col = ft.Column(controls=[])
@@ -172,7 +162,7 @@ def show_waveforms_popup(
 
             def on_gain_change(
                 e,
-                audio=audio,
+                envelope=envelope,
                 framerate=framerate,
                 ext=ext,
                 filepath=filepath,
@@ -183,7 +173,7 @@ def show_waveforms_popup(
                 gain_val["value"] = gain_db
                 page._track_gains[filepath] = gain_db
                 label, warning, tmp_path, _lufs = plot_and_stats(
-                    audio, framerate, ext, filepath, gain_db=gain_db
+                    envelope, framerate, ext, filepath, gain_db=gain_db
                 )
                 col.controls.clear()
                 col.controls.append(label)
@@ -208,8 +198,7 @@ def show_waveforms_popup(
                                 temp_path = getattr(
                                     audio_adjust_utils, "save_adjusted_audio"
                                 )(
-                                    audio * (10 ** (gain_db / 20.0)),
-                                    framerate,
+                                    *_adjusted_samples(filepath, gain_db),
                                     ext,
                                     filepath,
                                     gain_db,
@@ -235,7 +224,7 @@ def show_waveforms_popup(
 
             def on_save_adjusted_audio_click(
                 e,
-                audio=audio,
+                envelope=envelope,
                 framerate=framerate,
                 ext=ext,
                 filepath=filepath,
@@ -253,8 +242,7 @@ def show_waveforms_popup(
                 page.update()
                 try:
                     temp_path = getattr(audio_adjust_utils, "save_adjusted_audio")(
-                        audio * (10 ** (gain_val["value"] / 20.0)),
-                        framerate,
+                        *_adjusted_samples(filepath, gain_val["value"]),
                         ext,
                         filepath,
                         gain_val["value"],
@@ -305,7 +293,7 @@ def show_waveforms_popup(
             col.controls.append(img)
             col.controls.append(save_btn)
             per_track.append(
-                (audio, framerate, ext, filepath, gain_slider, col, gain_val)
+                (envelope, framerate, ext, filepath, gain_slider, col, gain_val)
             )
             n_images += 1
         else:
@@ -338,7 +326,7 @@ def show_waveforms_popup(
         total = len(per_track)
         completed = 0
         for i, (
-            audio,
+            envelope,
             framerate,
             ext,
             filepath,
@@ -346,7 +334,7 @@ def show_waveforms_popup(
             col,
             gain_val,
         ) in enumerate(per_track):
-            if gain_slider is not None and audio is not None:
+            if gain_slider is not None and envelope is not None:
                 gain_slider.value = global_gain["value"]
                 gain_val["value"] = global_gain["value"]
                 page._track_gains[filepath] = global_gain["value"]
@@ -379,10 +367,10 @@ def show_waveforms_popup(
     # Auto-set controls: target LUFS and buttons to autoset per-file or global
     target_lufs_field = ft.TextField(label="Target LUFS", value=str(-16.0), width=120)
 
-    def apply_preview_to_track(audio, framerate, ext, filepath, col, gain_val, gain_db):
+    def apply_preview_to_track(envelope, framerate, ext, filepath, col, gain_val, gain_db):
         try:
             label, warning, tmp_path, _lufs = plot_and_stats(
-                audio, framerate, ext, filepath, gain_db=gain_db
+                envelope, framerate, ext, filepath, gain_db=gain_db
             )
         except Exception as ex:
             show_snack(f"Failed to generate preview for {filepath}: {ex}", error=True)
@@ -402,17 +390,11 @@ def show_waveforms_popup(
         except Exception:
             show_snack("Target LUFS must be a number", error=True)
             return
-        # For each track compute LUFS (no saving) and set slider to recommended gain
-        for audio, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
-            if audio is None or gain_slider is None:
+        # For each track use its measured LUFS and set slider to recommended gain
+        for envelope, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
+            if envelope is None or gain_slider is None:
                 continue
-            try:
-                import pyloudnorm as pyln
-
-                meter = pyln.Meter(framerate)
-                lufs = float(meter.integrated_loudness(audio))
-            except Exception:
-                lufs = None
+            lufs = base_stats.get(filepath, (None, None, None))[2]
             if lufs is None:
                 display_name = os.path.basename(filepath) if filepath else "(unknown)"
                 show_snack(
@@ -426,7 +408,7 @@ def show_waveforms_popup(
             gain_slider.value = rec_gain
             # regenerate preview
             apply_preview_to_track(
-                audio, framerate, ext, filepath, col, gain_val, rec_gain
+                envelope, framerate, ext, filepath, col, gain_val, rec_gain
             )
             page._track_gains[filepath] = rec_gain
         page.update()
@@ -439,16 +421,10 @@ def show_waveforms_popup(
             return
         # compute per-file recommended gains then apply mean
         recs = []
-        for audio, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
-            if audio is None:
+        for envelope, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
+            if envelope is None:
                 continue
-            try:
-                import pyloudnorm as pyln
-
-                meter = pyln.Meter(framerate)
-                lufs = float(meter.integrated_loudness(audio))
-            except Exception:
-                lufs = None
+            lufs = base_stats.get(filepath, (None, None, None))[2]
             if lufs is None:
                 continue
             recs.append(target - lufs)
@@ -457,13 +433,13 @@ def show_waveforms_popup(
             return
         mean_gain = float(sum(recs) / len(recs))
         # apply mean to all sliders and regenerate previews
-        for audio, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
-            if audio is None or gain_slider is None:
+        for envelope, framerate, ext, filepath, gain_slider, col, gain_val in per_track:
+            if envelope is None or gain_slider is None:
                 continue
             rec_gain = max(min(mean_gain, gain_slider.max), gain_slider.min)
             gain_slider.value = rec_gain
             apply_preview_to_track(
-                audio, framerate, ext, filepath, col, gain_val, rec_gain
+                envelope, framerate, ext, filepath, col, gain_val, rec_gain
             )
             page._track_gains[filepath] = rec_gain
         page.update()
@@ -531,7 +507,7 @@ def show_waveforms_popup(
             completed = 0
             errors = []
             for (
-                audio,
+                envelope,
                 framerate,
                 ext,
                 filepath,
@@ -541,8 +517,7 @@ def show_waveforms_popup(
             ) in per_track:
                 try:
                     temp_path = getattr(audio_adjust_utils, "save_adjusted_audio")(
-                        audio * (10 ** (gain_val["value"] / 20.0)),
-                        framerate,
+                        *_adjusted_samples(filepath, gain_val["value"]),
                         ext,
                         filepath,
                         gain_val["value"],
@@ -609,7 +584,7 @@ def show_waveforms_popup(
         # Add autoset controls (target LUFS + auto-set buttons)
         images.append(auto_row)
         for idx, (
-            audio,
+            envelope,
             framerate,
             ext,
             filepath,
@@ -633,7 +608,7 @@ def show_waveforms_popup(
 
             # Group the controls for this track inside a bordered container so each track is visually distinct
             group_children = [header]
-            if gain_slider is not None and audio is not None:
+            if gain_slider is not None and envelope is not None:
                 group_children.append(gain_slider)
             # add the detailed column (label, warnings, image, buttons)
             group_children.append(col)
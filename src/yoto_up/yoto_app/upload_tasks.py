@@ -10,7 +10,9 @@ import subprocess
 from typing import Any
 from yoto_up.models import Chapter, ChapterDisplay, Card, CardContent, CardMetadata
 from yoto_up.yoto_api import YotoAPI
-from yoto_up.normalization import AudioNormalizer
+from yoto_up.audio_splitter import plan_split
+from yoto_up.normalization import AudioNormalizer, NormalizationError, cached_measurements
+from yoto_up.upload_journal import UploadJournal
 from yoto_up.yoto_app.replace_icons import start_replace_icons_background
 import re
 from loguru import logger
@@ -251,6 +253,50 @@ class FileUploadRow:
         min_silence_ms = ft.TextField(label="Min silence ms", value="800", width=120)
         output_dir = ft.TextField(label="Output directory (optional)", value="", width=400)
         name_tmpl = ft.TextField(label="Output name template (optional)", value="Track {index}", width=400)
+        plan_text = ft.Text(value="", size=12)
+        preview_state = {"shown": False, "generation": 0}
+
+        def preview_split(e=None):
+            """Show the planned cuts; the silence map is cached, so re-planning is instant."""
+            try:
+                params = dict(
+                    target_tracks=int(target_tracks.value),
+                    min_track_length_sec=int(min_len.value),
+                    silence_thresh_db=int(silence_thresh.value),
+                    min_silence_len_ms=int(min_silence_ms.value),
+                )
+            except (TypeError, ValueError):
+                plan_text.value = "Enter whole numbers to preview the split."
+                page.update()
+                return
+            preview_state["shown"] = True
+            preview_state["generation"] += 1
+            generation = preview_state["generation"]
+
+            async def _do_preview():
+                plan_text.value = "Analysing audio for silence..."
+                page.update()
+                try:
+                    segments = await asyncio.to_thread(plan_split, self.filepath, **params)
+                except Exception as exc:
+                    text = f"Preview failed: {exc}"
+                else:
+                    lengths = [_human_duration(end - start) for start, end in segments]
+                    text = f"{len(segments)} track(s): " + ", ".join(lengths)
+                # Ignore results overtaken by a newer preview
+                if generation == preview_state["generation"]:
+                    plan_text.value = text
+                    page.update()
+
+            page.run_task(_do_preview)
+
+        def _replan(e=None):
+            if preview_state["shown"]:
+                preview_split()
+
+        target_tracks.on_change = _replan
+        min_len.on_change = _replan
+        min_silence_ms.on_change = _replan
 
         def start_split(e=None):
             async def _do_split():
@@ -521,8 +567,10 @@ class FileUploadRow:
                 ft.Row(controls=[silence_thresh, min_silence_ms]),
                 output_dir,
                 name_tmpl,
+                plan_text,
             ], scroll=ft.ScrollMode.AUTO, width=600),
             actions=[
+                ft.TextButton(content=ft.Text(value="Preview"), on_click=preview_split),
                 ft.TextButton(content=ft.Text(value="Start Split"), on_click=start_split),
                 ft.TextButton(content=ft.Text(value="Cancel"), on_click=lambda e: page.pop_dialog()),
             ],
@@ -735,6 +783,10 @@ class UploadManager:
             page.update()
 
         start_btn = ft.TextButton(content=ft.Text(value="Start Upload"))
+        resume_btn = ft.TextButton(
+            content=ft.Text(value="Resume Upload"),
+            tooltip="Continue an interrupted upload of these files, skipping files already uploaded or transcoded",
+        )
         stop_btn = ft.TextButton(content=ft.Text(value="Stop Upload"), disabled=True)
         remove_uploaded_btn = ft.TextButton(content=ft.Text(value="Remove Uploaded"), on_click=remove_uploaded_files)
 
@@ -997,9 +1049,10 @@ class UploadManager:
             # Show spinner in the dialog's content column so the main dialog stays open
             content_col = dialog_controls["content_column"]
             content_col.controls.clear()
+            analyzing_text = ft.Text(value=f"Analyzing files... (0/{len(files)})")
             content_col.controls.append(
                 ft.Row(
-                    controls=[ft.ProgressRing(), ft.Text(value="Analyzing files...")],
+                    controls=[ft.ProgressRing(), analyzing_text],
                     alignment=ft.MainAxisAlignment.CENTER,
                 )
             )
@@ -1041,6 +1094,13 @@ class UploadManager:
                     except Exception:
                         min_files_fraction = 0.75
 
+                    def _analysis_progress(done, total):
+                        analyzing_text.value = f"Analyzing files... ({done}/{total})"
+                        try:
+                            page.update()
+                        except Exception:
+                            pass
+
                     result = await asyncio.to_thread(
                         lambda: per_window_common_prefix(
                             paths=files,
@@ -1051,6 +1111,7 @@ class UploadManager:
                             n_mfcc=n_mfcc,
                             similarity_threshold=similarity_threshold,
                             min_files_fraction=min_files_fraction,
+                            progress_callback=_analysis_progress,
                         )
                     )
                 except Exception:
@@ -1794,7 +1855,7 @@ class UploadManager:
             show_waveforms_btn.disabled = not has_files
             page.update()
 
-        def _start_click(e):
+        def _start_click(e, resume=False):
             nonlocal ctx
             # update ctx with the current checkbox value
             try:
@@ -1812,6 +1873,12 @@ class UploadManager:
                 ctx["local_normalization_enabled"] = False
                 ctx["local_normalization_target"] = -23.0
                 ctx["local_normalization_batch"] = False
+            try:
+                ctx["local_normalization_workers"] = (
+                    int(local_norm_workers.value) if local_norm_workers.value else None
+                )
+            except Exception:
+                ctx["local_normalization_workers"] = None
 
             # intro/outro analysis is manual via the Analyze dialog; no automatic flag
             try:
@@ -1829,6 +1896,7 @@ class UploadManager:
 
             ctx["upload_mode_dropdown"] = upload_mode_dropdown
             ctx["start_btn"] = start_btn
+            ctx["resume_btn"] = resume_btn
             ctx["stop_btn"] = stop_btn
 
             target = getattr(upload_target_dropdown, "value", "Create new card")
@@ -1844,14 +1912,20 @@ class UploadManager:
                 new_card_title=new_card_title.value,
                 existing_card_id=card_id,
                 ctx=ctx,
+                resume=resume,
             )
 
+        def _resume_click(e):
+            _start_click(e, resume=True)
+
         def _stop_click(e):
             page.run_task(stop_uploads, e, page)
 
         start_btn.on_click = _start_click
+        resume_btn.on_click = _resume_click
         stop_btn.on_click = _stop_click
         self.start_btn = start_btn
+        self.resume_btn = resume_btn
         self.stop_btn = stop_btn
 
         # Upload page (appears after Playlists)
@@ -1900,6 +1974,16 @@ class UploadManager:
             ),
         )
 
+        local_norm_workers = ft.TextField(
+            label="Parallel files",
+            value=get_state("gui", "local_norm_workers", ""),
+            width=110,
+            tooltip="Files to normalize at once when not in batch mode (blank = CPU count)",
+            on_change=lambda e: set_state(
+                "gui", "local_norm_workers", local_norm_workers.value
+            ),
+        )
+
         # Collapsible local normalization controls (collapsed by default)
         # Build the inner container and expander before creating the upload column
         _local_norm_inner = ft.Container(
@@ -1910,7 +1994,14 @@ class UploadManager:
                         size=12,
                         color=ft.Colors.GREY,
                     ),
-                    ft.Row(controls=[local_norm_checkbox, local_norm_target, local_norm_batch]),
+                    ft.Row(
+                        controls=[
+                            local_norm_checkbox,
+                            local_norm_target,
+                            local_norm_batch,
+                            local_norm_workers,
+                        ]
+                    ),
                     ft.Text(
                         value="For waveform-based inspection and additional normalisation options, click 'Show Waveforms'.",
                         size=11,
@@ -1965,7 +2056,7 @@ class UploadManager:
                         ),
                     ]
                 ),
-                ft.Row(controls=[start_btn, stop_btn, remove_uploaded_btn]),
+                ft.Row(controls=[start_btn, resume_btn, stop_btn, remove_uploaded_btn]),
                 ft.Divider(),
                 overall_text,
                 overall_bar,
@@ -2199,8 +2290,14 @@ async def start_uploads(
     new_card_title: str | None = None,
     existing_card_id: str | None = None,
     ctx: dict | None = None,
+    resume: bool = False,
 ):
-    """Start uploads migrated from gui; ctx is the UI/context dict."""
+    """Start uploads migrated from gui; ctx is the UI/context dict.
+
+    Per-file progress is journaled (see UploadJournal); with resume=True a
+    previous, interrupted run over the same files and target continues where
+    it stopped instead of re-uploading finished files.
+    """
     if gain_adjusted_files is None:
         gain_adjusted_files = {}
     if ctx is None:
@@ -2250,7 +2347,12 @@ async def start_uploads(
         return progress_cb
 
     async def upload_and_transcode_idx(
-        idx, audio_path, filename_for_api, loudnorm=False, show_progress=True
+        idx,
+        audio_path,
+        filename_for_api,
+        loudnorm=False,
+        show_progress=True,
+        journal_key=None,
     ):
         """Upload a file and transcode via API, updating UI row state; returns transcode result or None on failure."""
         fileuploadrow = None
@@ -2275,6 +2377,8 @@ async def start_uploads(
                 poll_interval=2,
                 max_attempts=200,
                 progress_callback=progress_cb,
+                journal=journal,
+                journal_key=journal_key,
             )
 
             if tr is not None:
@@ -2315,6 +2419,7 @@ async def start_uploads(
                     filename_for_api=fname,
                     loudnorm=normalize_audio,
                     show_progress=show_progress,
+                    journal_key=journal_keys[i],
                 )
                 results[i] = tr
                 # update overall after each completes
@@ -2379,10 +2484,34 @@ async def start_uploads(
         page.update()
         return
 
+    # Journal entries are keyed by the original files: gain-adjusted and
+    # locally normalized copies are temp files that differ between runs.
+    journal_keys = [UploadJournal.key_for(f) for f in orig_files]
+    journal = UploadJournal(
+        UploadJournal.job_id_for(
+            target,
+            existing_card_id if target != "Create new card" else new_card_title,
+            *journal_keys,
+            *(gain_adjusted_files.get(f, {}).get("gain", 0.0) for f in orig_files),
+            normalize_audio,
+            ctx.get("local_normalization_enabled", False)
+            and ctx.get("local_normalization_target", -23.0),
+            ctx.get("local_normalization_enabled", False)
+            and ctx.get("local_normalization_batch", False),
+        ),
+        resume=resume,
+    )
+    if resume:
+        done = journal.summary()
+        logger.info(
+            f"[start_uploads] Resuming: {done['transcoded']} transcoded, {done['uploaded']} awaiting transcode"
+        )
+
     # --- Normalization Start ---
     local_norm_enabled = ctx.get("local_normalization_enabled", False)
     local_norm_target = ctx.get("local_normalization_target", -23.0)
     local_norm_batch = ctx.get("local_normalization_batch", False)
+    local_norm_workers = ctx.get("local_normalization_workers")
     temp_norm_dir = None
 
     if local_norm_enabled:
@@ -2400,15 +2529,22 @@ async def start_uploads(
             )
 
             normalizer = AudioNormalizer(
-                target_level=local_norm_target, batch_mode=local_norm_batch
+                target_level=local_norm_target,
+                batch_mode=local_norm_batch,
+                max_workers=local_norm_workers,
             )
 
             def norm_progress(msg, val):
                 status.value = f"Normalizing: {msg}"
                 page.update()
 
+            # Files measured by the waveform view skip the measurement pass
             normalized_files = await asyncio.to_thread(
-                normalizer.normalize, files, temp_norm_dir, norm_progress
+                normalizer.normalize,
+                files,
+                temp_norm_dir,
+                norm_progress,
+                measurements=cached_measurements(files),
             )
 
             if len(normalized_files) == len(files):
@@ -2419,6 +2555,15 @@ async def start_uploads(
                     "Normalization returned different number of files. Using original files."
                 )
 
+        except NormalizationError as e:
+            # Upload the files that normalized; fall back to originals for the rest
+            files = [out or src for out, src in zip(e.output_paths, files)]
+            logger.error(f"Normalization failed: {e}")
+            status.value = (
+                f"Normalization failed for {len(e.errors)} file(s); uploading those un-normalized"
+            )
+            page.update()
+            await asyncio.sleep(2)
         except Exception as e:
             logger.error(f"Normalization failed: {e}")
             status.value = f"Normalization failed: {e}"
@@ -2545,6 +2690,7 @@ async def start_uploads(
             cid = created.cardId
             status.value = f"Created card: {cid}" if cid else "Card created"
             show_snack(status.value)
+            journal.discard()
             page.update_card(created)
             # Optionally run autoselect (replace default icons) after upload/create
             try:
@@ -2681,6 +2827,7 @@ async def start_uploads(
             else:
                 status.value = "All chapters appended"
                 show_snack(status.value)
+                journal.discard()
                 for r in file_rows_column.controls:
                     fileuploadrow = getattr(r, "_fileuploadrow", None)
                     if fileuploadrow is None:
@@ -2699,6 +2846,8 @@ async def start_uploads(
 
     status.value = "Uploading..."
     page.upload_manager.start_btn.disabled = True
+    if getattr(page.upload_manager, "resume_btn", None) is not None:
+        page.upload_manager.resume_btn.disabled = True
     page.upload_manager.stop_btn.disabled = False
     logger.debug("[start_uploads] Upload tasks started")
     # Make per-file progress bars visible now that uploads have started
@@ -2730,6 +2879,9 @@ async def start_uploads(
             _sb = ctx.get("start_btn")
             if _sb is not None:
                 _sb.disabled = False
+            _rb = ctx.get("resume_btn")
+            if _rb is not None:
+                _rb.disabled = False
             _sp = ctx.get("stop_btn")
             if _sp is not None:
                 _sp.disabled = True
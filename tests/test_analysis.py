@@ -0,0 +1,133 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+
+from yoto_up import feature_cache, paths  # noqa: E402
+from yoto_up.yoto_app import analysis  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_feature_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "MFCC_FEATURE_CACHE_DIR", tmp_path / "features")
+    monkeypatch.setattr(feature_cache, "_shared_cache", None)
+
+
+def _tone_then_noise(path, tone_s=4, noise_s=4, sr=22050):
+    """A 440 Hz tone followed by noise, so intro and outro are distinguishable."""
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={tone_s}:sample_rate={sr}",
+            "-f", "lavfi", "-i", f"anoisesrc=duration={noise_s}:sample_rate={sr}:amplitude=0.3",
+            "-filter_complex", "[0:a][1:a]concat=n=2:v=0:a=1",
+            str(path),
+        ],
+        check=True,
+    )
+    return str(path)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_side_loading_decodes_only_the_requested_span(tmp_path):
+    path = _tone_then_noise(tmp_path / "ep.flac")
+
+    intro, sr = analysis._load_side(path, "intro", 2.0, 16000)
+    outro, _ = analysis._load_side(path, "outro", 2.0, 16000)
+
+    assert sr == 16000
+    assert len(intro) == pytest.approx(32000, abs=160)
+    assert len(outro) == pytest.approx(32000, abs=160)
+    # the tone is a pure sinusoid, the tail is broadband noise
+    assert np.abs(intro).max() == pytest.approx(0.125, abs=0.01)
+    assert np.abs(np.diff(outro)).mean() > 5 * np.abs(np.diff(intro)).mean()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_per_window_common_prefix_finds_shared_intro(tmp_path, monkeypatch, executor):
+    monkeypatch.chdir(tmp_path)  # the debug trace is written under the CWD
+    # Spawned workers import paths afresh; this keeps their feature cache out
+    # of the user's data directory
+    monkeypatch.setenv("FLET_APP_STORAGE_DATA", str(tmp_path / "data"))
+    paths = []
+    tails = [
+        "sine=frequency=440:duration=3:sample_rate=22050",
+        "anoisesrc=duration=3:color=brown:amplitude=0.5:sample_rate=22050",
+        "anullsrc=duration=3:sample_rate=22050",
+    ]
+    for i, tail in enumerate(tails):
+        path = tmp_path / f"{i}.wav"
+        subprocess.run(
+            [
+                "ffmpeg", "-v", "error", "-y",
+                "-f", "lavfi", "-i", "anoisesrc=duration=2:seed=1:amplitude=0.3:sample_rate=22050",
+                "-f", "lavfi", "-i", tail,
+                "-filter_complex", "[0:a][1:a]concat=n=2:v=0:a=1",
+                str(path),
+            ],
+            check=True,
+        )
+        paths.append(str(path))
+
+    result = analysis.per_window_common_prefix(paths, side="intro", max_seconds=4.0, executor=executor)
+
+    assert result.seconds_matched == pytest.approx(2.0, abs=0.25)
+    assert len(result.per_window_frac) == result.windows_matched + 1
+    assert set(result.per_file_per_window) == set(paths)
+    assert all(s > 0.95 for s in result.per_file_per_window[paths[0]][:-2])
+
+
+def test_dtw_prefix_similarity_matches_per_prefix_dtw(monkeypatch):
+    from librosa.sequence import dtw
+
+    rng = np.random.default_rng(3)
+    shared = rng.standard_normal((20, 120))
+    seqs = {
+        "a": np.concatenate([shared, rng.standard_normal((20, 300))], axis=1),
+        "b": np.concatenate(
+            [shared + 0.1 * rng.standard_normal((20, 120)), rng.standard_normal((20, 250))], axis=1
+        ),
+    }
+    monkeypatch.setattr(analysis, "_compute_mfcc_sequence", lambda path, **kw: seqs[path])
+
+    fps = 22050 / 512
+    expected = (0.0, 0.0)
+    for i in range(40):
+        t = 0.25 * (i + 1)
+        k = min(int(round(t * fps)), 370)
+        A, B = seqs["a"][:, :k], seqs["b"][:, :k]
+        D = np.linalg.norm(A[:, :, None] - B[:, None, :], axis=0)
+        sim = 1.0 / (1.0 + dtw(C=D)[0][-1, -1] / k)
+        if sim >= 0.2 and sim > expected[0]:
+            expected = (sim, t)
+
+    sim, t = analysis._dtw_prefix_similarity("a", "b", "intro", 10.0, dtw_threshold=0.2)
+    assert t == pytest.approx(expected[1])
+    assert sim == pytest.approx(expected[0])
+
+    banded = analysis._dtw_prefix_similarity(
+        "a", "b", "intro", 10.0, dtw_threshold=0.2, band_seconds=0.5
+    )
+    assert banded[0] <= sim + 1e-12
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not available")
+def test_mfcc_sequences_are_cached_on_disk(tmp_path, monkeypatch):
+    path = _tone_then_noise(tmp_path / "ep.wav")
+    first = analysis._compute_mfcc_sequence(path, side="outro", seconds=3.0)
+
+    decodes = []
+    real_load_side = analysis._load_side
+    monkeypatch.setattr(
+        analysis, "_load_side", lambda *a: decodes.append(a) or real_load_side(*a)
+    )
+    again = analysis._compute_mfcc_sequence(path, side="outro", seconds=3.0)
+    assert decodes == []
+    assert np.allclose(again, first, rtol=2e-3, atol=0.05)
+
+    analysis._compute_mfcc_sequence(path, side="intro", seconds=3.0)
+    assert len(decodes) == 1
@@ -0,0 +1,59 @@
+import os
+import wave
+
+import numpy as np
+
+from yoto_up import waveform_utils
+from yoto_up.analysis_cache import AnalysisCache
+from yoto_up.waveform_utils import audio_stats
+
+
+def _write_wav(path, seconds=1.0, rate=8000, amp=0.5):
+    t = np.arange(int(rate * seconds)) / rate
+    ints = (amp * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(ints.tobytes())
+
+
+def test_stats_are_reused_until_the_file_changes(tmp_path, monkeypatch):
+    src = tmp_path / "a.wav"
+    _write_wav(src)
+    cache = AnalysisCache(tmp_path / "cache")
+    first = audio_stats(str(src), {}, disk_cache=cache)
+
+    decodes = []
+    real_iter_blocks = waveform_utils._iter_blocks
+    monkeypatch.setattr(
+        waveform_utils,
+        "_iter_blocks",
+        lambda *a, **k: decodes.append(a) or real_iter_blocks(*a, **k),
+    )
+
+    cached = audio_stats(str(src), {}, disk_cache=cache)
+    assert decodes == []
+    assert cached[1:] == first[1:]
+    assert cached[0].n_frames == first[0].n_frames
+    assert np.array_equal(cached[0].levels[0][1], first[0].levels[0][1])
+    assert len(cached[0].levels) == len(first[0].levels)
+
+    _write_wav(src, amp=0.25)
+    os.utime(src, ns=(1, 1))
+    changed = audio_stats(str(src), {}, disk_cache=cache)
+    assert len(decodes) == 1
+    assert changed[1] < first[1]
+    cache.close()
+
+
+def test_entries_are_bounded(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache", max_entries=2)
+    for name in ("a", "b", "c"):
+        _write_wav(tmp_path / f"{name}.wav")
+        audio_stats(str(tmp_path / f"{name}.wav"), {}, disk_cache=cache)
+
+    assert cache.get(str(tmp_path / "a.wav")) is None
+    assert cache.get(str(tmp_path / "c.wav")) is not None
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+    cache.close()
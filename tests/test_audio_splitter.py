@@ -1,6 +1,11 @@
+import shutil
 import tempfile
 from pathlib import Path
-from yoto_up.audio_splitter import _format_output_name
+
+import pytest
+
+from yoto_up import audio_splitter
+from yoto_up.audio_splitter import _format_output_name, _get_duration, split_audio
 
 
 def test_format_output_name_defaults():
@@ -19,3 +24,208 @@ def test_format_output_name_template_stem_and_index():
     p = Path("/tmp/My Book.mp3")
     out = _format_output_name(p, index=9, total=12, out_dir=Path("/tmp"), template="{stem} - Track {index:02d}")
     assert out.name == "My Book - Track 10.mp3"
+
+
+def _make_tones_with_gaps(path: Path, tones: int = 3, tone_s: float = 2.0, gap_s: float = 1.0):
+    import subprocess
+
+    parts = []
+    for i in range(tones):
+        parts.append(f"sine=frequency={300 + 100 * i}:duration={tone_s}")
+        if i < tones - 1:
+            parts.append(f"anullsrc=r=44100:cl=mono:d={gap_s}")
+    inputs = []
+    for src in parts:
+        inputs += ["-f", "lavfi", "-i", src]
+    filt = "".join(f"[{i}:a]aresample=44100,aformat=channel_layouts=mono[a{i}];" for i in range(len(parts)))
+    filt += "".join(f"[a{i}]" for i in range(len(parts))) + f"concat=n={len(parts)}:v=0:a=1[out]"
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", *inputs, "-filter_complex", filt, "-map", "[out]", str(path)],
+        check=True,
+    )
+
+
+@pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg/ffprobe not installed",
+)
+@pytest.mark.parametrize("single_pass,max_workers", [(True, None), (False, 1), (False, 3)])
+def test_split_audio_cuts_at_silences(tmp_path, single_pass, max_workers):
+    src = tmp_path / "book.mp3"
+    _make_tones_with_gaps(src)
+    progress = []
+
+    outputs = split_audio(
+        src,
+        target_tracks=3,
+        min_track_length_sec=1,
+        min_silence_len_ms=500,
+        output_dir=tmp_path / "out",
+        show_progress=False,
+        progress_callback=lambda msg, frac: progress.append((msg, frac)),
+        single_pass=single_pass,
+        max_workers=max_workers,
+    )
+
+    assert [o.name for o in outputs] == ["book_part1.mp3", "book_part2.mp3", "book_part3.mp3"]
+    durations = [_get_duration(o) for o in outputs]
+    assert all(abs(d - want) < 0.2 for d, want in zip(durations, [2.5, 3.0, 2.5]))
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [o.name for o in outputs]
+    assert progress[-1] == ("Completed 3/3", 1.0)
+    assert [m for m, _ in progress if m.startswith("Completed")] == [
+        "Completed 1/3",
+        "Completed 2/3",
+        "Completed 3/3",
+    ]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_single_pass_keeps_metadata_and_leaves_cover_art_to_per_segment(tmp_path, monkeypatch):
+    import subprocess
+
+    src = tmp_path / "book.mp3"
+    tagged = tmp_path / "tagged.mp3"
+    _make_tones_with_gaps(src)
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", str(src), "-c", "copy", "-metadata", "artist=Narrator", str(tagged)],
+        check=True,
+    )
+    outs = [tmp_path / "a.mp3", tmp_path / "b.mp3"]
+    monkeypatch.setattr(audio_splitter, "_has_attached_picture", lambda path: False)
+
+    assert audio_splitter._extract_segments_single_pass(tagged, [(0.0, 2.5), (2.5, 5.0)], outs, lambda i: None, lambda i: None)
+    for out in outs:
+        probe = subprocess.run(["ffmpeg", "-i", str(out)], stderr=subprocess.PIPE, text=True)
+        assert "Narrator" in probe.stderr
+
+    monkeypatch.setattr(audio_splitter, "_has_attached_picture", lambda path: True)
+    monkeypatch.setattr(subprocess, "Popen", lambda *a, **k: pytest.fail("ffmpeg should not run"))
+    assert not audio_splitter._extract_segments_single_pass(tagged, [(0.0, 2.5), (2.5, 5.0)], outs, lambda i: None, lambda i: None)
+
+
+@pytest.mark.parametrize("returncode", [0, 1])
+def test_single_pass_reports_progress_only_once_it_succeeds(tmp_path, monkeypatch, returncode):
+    import subprocess
+
+    src = tmp_path / "book.mp3"
+    src.write_bytes(b"x")
+    segments = [(0.0, 2.5), (2.5, 5.0), (5.0, 8.0)]
+    outs = [tmp_path / f"{i}.mp3" for i in range(3)]
+    events = []
+
+    def fake_run(cmd, **kwargs):
+        for i in range(len(segments)):
+            Path(cmd[-1].replace("%05d", f"{i:05d}")).write_bytes(b"x")
+            events.append(("written", i))
+        return subprocess.CompletedProcess(cmd, returncode, stderr="boom" if returncode else "")
+
+    monkeypatch.setattr(audio_splitter, "_has_attached_picture", lambda path: False)
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    ok = audio_splitter._extract_segments_single_pass(
+        src,
+        segments,
+        outs,
+        lambda i: events.append(("start", i)),
+        lambda i: events.append(("done", i)),
+    )
+
+    written = [("written", i) for i in range(3)]
+    if returncode:
+        assert not ok
+        assert events == written
+        assert list(tmp_path.iterdir()) == [src]
+    else:
+        assert ok
+        assert events == written + [(kind, i) for i in range(3) for kind in ("start", "done")]
+        assert all(o.exists() for o in outs)
+
+
+def test_parallel_extraction_reports_in_segment_order(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_extract(input_path, idx, start, end, out_path):
+        with lock:
+            running.append(idx)
+            peak.append(len(running))
+        time.sleep(0.05 * (4 - idx))  # later segments finish first
+        out_path.write_bytes(b"x")
+        with lock:
+            running.remove(idx)
+
+    monkeypatch.setattr(audio_splitter, "_extract_segment", fake_extract)
+    segments = [(i * 10.0, (i + 1) * 10.0) for i in range(4)]
+    out_paths = [tmp_path / f"{i}.mp3" for i in range(4)]
+    events = []
+
+    audio_splitter._extract_segments_parallel(
+        Path("in.mp3"),
+        segments,
+        out_paths,
+        2,
+        lambda i: events.append(("start", i)),
+        lambda i: events.append(("done", i)),
+    )
+
+    assert max(peak) == 2
+    assert events == [(kind, i) for i in range(4) for kind in ("start", "done")]
+    assert all(p.exists() for p in out_paths)
+
+
+def test_silence_map_is_decoded_once_per_threshold(tmp_path, monkeypatch):
+    from collections import OrderedDict
+
+    src = tmp_path / "book.mp3"
+    src.write_bytes(b"not really audio")
+    decodes = []
+
+    def fake_silencedetect(path, thresh, min_len_s):
+        decodes.append((thresh, min_len_s))
+        return "\n".join(
+            f"[silencedetect] silence_start: {s}\n[silencedetect] silence_end: {e} | silence_duration: {e - s}"
+            for s, e in [(59.0, 59.3), (119.0, 121.0), (179.5, 180.5)]
+        )
+
+    monkeypatch.setattr(audio_splitter, "_silence_cache", OrderedDict())
+    monkeypatch.setattr(audio_splitter, "_ensure_ffmpeg", lambda: None)
+    monkeypatch.setattr(audio_splitter, "_get_duration", lambda path: 240.0)
+    monkeypatch.setattr(audio_splitter, "_run_ffmpeg_silencedetect", fake_silencedetect)
+
+    assert audio_splitter.plan_split(src, target_tracks=2, min_track_length_sec=10) == [
+        (0.0, 120.0),
+        (120.0, 240.0),
+    ]
+    assert len(audio_splitter.plan_split(src, target_tracks=4, min_track_length_sec=10)) == 3
+    # A shorter minimum silence brings the 0.3s gap back without re-decoding
+    assert len(audio_splitter.plan_split(src, target_tracks=4, min_track_length_sec=10, min_silence_len_ms=200)) == 4
+    assert decodes == [(-40, 0.1)]
+
+    audio_splitter.plan_split(src, target_tracks=4, silence_thresh_db=-30)
+    assert len(decodes) == 2
+
+
+def test_choose_cuts_balances_tracks_and_respects_min_length():
+    # Ideal cuts are at 100/200/300. Nearest-candidate picking takes 130 and
+    # then 140, leaving a 10s track that would be merged away.
+    candidates = [40.0, 130.0, 140.0, 350.0]
+    assert audio_splitter._choose_cuts(candidates, 400.0, 4, 30.0) == [40.0, 140.0, 350.0]
+    assert audio_splitter._choose_cuts([100.0, 110.0], 300.0, 3, 30.0) is None
+    assert audio_splitter._choose_cuts([100.0, 110.0], 300.0, 3, 0.0) == [100.0, 110.0]
+
+
+def test_choose_cuts_picks_exactly_tracks_minus_one_from_many_candidates():
+    import random
+
+    rng = random.Random(7)
+    total = 36000.0
+    candidates = sorted(rng.uniform(60, total - 60) for _ in range(5000))
+    cuts = audio_splitter._choose_cuts(candidates, total, 60, 120.0)
+    assert len(cuts) == 59
+    lengths = [b - a for a, b in zip([0.0] + cuts, cuts + [total])]
+    assert min(lengths) >= 120.0
+    assert max(abs(length - total / 60) for length in lengths) < 60
@@ -0,0 +1,44 @@
+from yoto_up.card_store import CardStore
+from yoto_up.models import Card, CardContent
+from yoto_up.yoto_api import YotoAPI
+
+
+def test_store_matches_on_updated_at(tmp_path):
+    store = CardStore(tmp_path / "cards.sqlite")
+    store.put(Card(cardId="c1", title="One", updatedAt="t1"))
+
+    assert store.get("c1", "t1").title == "One"
+    assert store.get("c1", "t2") is None
+    assert store.get("c1", None) is None
+
+    assert store.retain(["c2"]) == 1
+    assert store.get("c1", "t1") is None
+
+
+def test_get_cards_synced_only_fetches_changed_cards(tmp_path, monkeypatch):
+    api = YotoAPI(
+        "test-client",
+        app_path=tmp_path,
+        auto_start_authentication=False,
+        use_upload_index=False,
+    )
+    fetched = []
+
+    def fake_get_cards_many(card_ids, concurrency=8):
+        fetched.extend(card_ids)
+        return [Card(cardId=cid, title=f"full {cid}", content=CardContent()) for cid in card_ids]
+
+    monkeypatch.setattr(api, "get_cards_many", fake_get_cards_many)
+    summaries = [Card(cardId=cid, title=cid, updatedAt="t1") for cid in ("a", "b", "c")]
+
+    first = api.get_cards_synced(summaries)
+    assert [c.title for c in first] == ["full a", "full b", "full c"]
+    assert fetched == ["a", "b", "c"]
+
+    fetched.clear()
+    summaries[1] = Card(cardId="b", title="b", updatedAt="t2")
+    second = api.get_cards_synced(summaries)
+    assert fetched == ["b"]
+    assert [c.cardId for c in second] == ["a", "b", "c"]
+    assert all(c.content is not None for c in second)
+    api.close()
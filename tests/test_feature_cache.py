@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+
+from yoto_up.feature_cache import FeatureCache
+
+
+def test_features_are_reused_until_the_file_changes(tmp_path):
+    src = tmp_path / "a.mp3"
+    src.write_bytes(b"x" * 100)
+    cache = FeatureCache(tmp_path / "cache")
+    params = ("intro", 10.0, 22050, 13)
+    mfcc = np.linspace(-500, 100, 13 * 40).reshape(13, 40)
+    cache.put(str(src), params, mfcc, 20000, 22050)
+
+    got, n_samples, rate = cache.get(str(src), params)
+    assert got.dtype == np.float32 and got.shape == (13, 40)
+    assert np.allclose(got, mfcc, rtol=1e-3)
+    assert (n_samples, rate) == (20000, 22050)
+    assert cache.get(str(src), ("outro", 10.0, 22050, 13)) is None
+
+    src.write_bytes(b"y" * 101)
+    os.utime(src, ns=(1, 1))
+    assert cache.get(str(src), params) is None
+    cache.close()
+
+
+def test_size_is_bounded_least_recently_used_first(tmp_path):
+    mfcc = np.zeros((10, 50))  # 1000 bytes as float16
+    cache = FeatureCache(tmp_path / "cache", max_bytes=2500)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_bytes(name.encode())
+    cache.put(str(tmp_path / "a"), (), mfcc, 1, 1)
+    cache.put(str(tmp_path / "b"), (), mfcc, 1, 1)
+    assert cache.get(str(tmp_path / "a"), ()) is not None  # a is now newer than b
+    cache.put(str(tmp_path / "c"), (), mfcc, 1, 1)
+
+    assert cache.get(str(tmp_path / "b"), ()) is None
+    assert cache.get(str(tmp_path / "a"), ()) is not None
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+    cache.close()
+
@@ -0,0 +1,189 @@
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+pytest.importorskip("ffmpeg_normalize")
+if shutil.which("ffmpeg") is None:
+    pytest.skip("ffmpeg not available", allow_module_level=True)
+
+from yoto_up import normalization  # noqa: E402
+from yoto_up.normalization import AudioNormalizer, NormalizationError  # noqa: E402
+from yoto_up.waveform_utils import audio_stats  # noqa: E402
+
+
+def _tone(path, amp, channels=1):
+    layout = ",pan=stereo|c0=c0|c1=c0" if channels == 2 else ""
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y", "-f", "lavfi",
+            "-i", f"sine=frequency=440:duration=2,volume={amp}{layout}",
+            str(path),
+        ],
+        check=True,
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_measured_files_skip_the_measurement_pass(tmp_path, monkeypatch, channels):
+    pytest.importorskip("scipy")
+    files = [_tone(tmp_path / f"{i}.wav", amp, channels) for i, amp in enumerate([0.05, 0.1])]
+    measurements = {}
+    for f in files:
+        _, max_amp, _, lufs, _, _ = audio_stats(f, {})
+        measurements[f] = {"lufs": lufs, "max_amp": max_amp}
+
+    def no_two_pass(*args, **kwargs):
+        raise AssertionError("ffmpeg-normalize should not run")
+
+    monkeypatch.setattr(normalization, "FFmpegNormalize", no_two_pass)
+    progress = []
+    out = AudioNormalizer(target_level=-20.0).normalize(
+        files, str(tmp_path / "out"), lambda msg, val: progress.append(val),
+        measurements=measurements,
+    )
+
+    assert [p.split("/")[-1] for p in out] == ["0.wav", "1.wav"]
+    for p in out:
+        assert audio_stats(p, {})[3] == pytest.approx(-20.0, abs=0.1)
+        if channels == 2:
+            pyln = pytest.importorskip("pyloudnorm")
+            audio, rate = _read_wav(p)
+            assert audio.shape[1] == 2
+            assert pyln.Meter(rate).integrated_loudness(audio) == pytest.approx(-20.0, abs=0.1)
+    assert progress[-1] == 1.0 and len(progress) == len(files) + 2
+
+
+def _read_wav(path):
+    import wave
+
+    with wave.open(path, "rb") as wf:
+        frames = wf.readframes(wf.getnframes())
+        audio = np.frombuffer(frames, dtype=np.int16).reshape(-1, wf.getnchannels())
+        return audio / 32768.0, wf.getframerate()
+
+
+def test_unmeasured_or_clipping_files_fall_back_to_ffmpeg_normalize(tmp_path, monkeypatch):
+    files = [_tone(tmp_path / f"{i}.wav", 0.5) for i in range(2)]
+    measurements = {files[1]: {"lufs": -30.0, "max_amp": 0.5}}  # +10 dB would clip
+    ran = []
+
+    class FakeNormalize:
+        def __init__(self, **kwargs):
+            pass
+
+        def add_media_file(self, inp, outp):
+            self.files = (inp, outp)
+
+        def run_normalization(self):
+            ran.append(self.files[0])
+            shutil.copy(*self.files)
+
+    monkeypatch.setattr(normalization, "FFmpegNormalize", FakeNormalize)
+    monkeypatch.setattr(AudioNormalizer, "_render_linear", lambda *a: pytest.fail("rendered"))
+    AudioNormalizer(target_level=-20.0).normalize(
+        files, str(tmp_path / "out"), measurements=measurements
+    )
+    assert sorted(ran) == sorted(files)
+
+
+def test_failures_are_collected_per_file_in_order(tmp_path, monkeypatch):
+    files = [str(tmp_path / f"{i}.wav") for i in range(4)]
+
+    def fake_one(self, inp, outp, measurements):
+        if inp.endswith(("1.wav", "3.wav")):
+            raise RuntimeError("bad file")
+        return outp
+
+    monkeypatch.setattr(AudioNormalizer, "_normalize_one", fake_one)
+    out_dir = str(tmp_path / "out")
+    with pytest.raises(NormalizationError) as excinfo:
+        AudioNormalizer(max_workers=3).normalize(files, out_dir)
+
+    assert list(excinfo.value.errors) == [files[1], files[3]]
+    assert excinfo.value.output_paths == [
+        f"{out_dir}/0.wav", None, f"{out_dir}/2.wav", None
+    ]
+
+
+def test_cached_measurements_skip_the_measurement_pass(tmp_path, monkeypatch):
+    pytest.importorskip("scipy")
+    from yoto_up import analysis_cache
+
+    cache = analysis_cache.AnalysisCache(tmp_path / "cache")
+    monkeypatch.setattr(analysis_cache, "get_analysis_cache", lambda: cache)
+    measured, unmeasured = _tone(tmp_path / "a.wav", 0.1), _tone(tmp_path / "b.wav", 0.1)
+    audio_stats(measured, {}, disk_cache=cache)
+
+    measurements = normalization.cached_measurements([measured, unmeasured])
+    assert list(measurements) == [measured]
+
+    monkeypatch.setattr(normalization, "FFmpegNormalize", lambda **kw: pytest.fail("measured"))
+    out = AudioNormalizer(target_level=-20.0).normalize(
+        [measured], str(tmp_path / "out"), measurements=measurements
+    )
+    assert audio_stats(out[0], {})[3] == pytest.approx(-20.0, abs=0.1)
+    cache.close()
+
+
+def test_sample_peaks_get_true_peak_headroom():
+    normalizer = AudioNormalizer()
+    lufs, peak_db = normalizer._measured("a.wav", {"a.wav": {"lufs": -20.0, "max_amp": 0.5}})
+    assert peak_db == pytest.approx(-6.02 + normalization.SAMPLE_PEAK_HEADROOM_DB, abs=0.01)
+    assert normalizer._measured("a.wav", {"a.wav": {"lufs": -20.0, "true_peak": -3.0}})[1] == -3.0
+
+
+def test_normalize_command_applies_the_plan_gain_next_to_the_inputs(tmp_path, monkeypatch):
+    pytest.importorskip("scipy")
+    import hashlib
+
+    from typer.testing import CliRunner
+
+    from yoto_up import analysis_cache, yoto
+
+    monkeypatch.setattr(analysis_cache, "get_analysis_cache", lambda: None)
+    monkeypatch.setattr(normalization, "FFmpegNormalize", lambda **kw: pytest.fail("measured"))
+    src = _tone(tmp_path / "a.wav", 0.1)
+    before = hashlib.sha256(open(src, "rb").read()).hexdigest()
+    plan = yoto.analyze_gain_requirements([src], target_lufs=-20.0)
+    gain = plan[src]["recommended_gain_db"]
+    args = ["normalize", src, "--apply", "--per-file", "--target-lufs", "-20", "--dest", str(tmp_path)]
+
+    result = CliRunner().invoke(yoto.app, args)
+
+    assert result.exit_code == 0, result.output
+    out = tmp_path / f"a_norm_{int(gain * 100)}.wav"
+    assert yoto.apply_gain_plan(plan, str(tmp_path), dry_run=True) == [str(out)]
+    assert hashlib.sha256(open(src, "rb").read()).hexdigest() == before
+    assert audio_stats(str(out), {})[3] == pytest.approx(-20.0, abs=0.1)
+
+
+def test_apply_gain_refuses_to_overwrite_its_input(tmp_path):
+    src = _tone(tmp_path / "a.wav", 0.1)
+    with pytest.raises(ValueError):
+        AudioNormalizer().apply_gain(src, str(tmp_path / "." / "a.wav"), 3.0)
+
+
+def test_linear_render_keeps_cover_art(tmp_path):
+    cover = tmp_path / "cover.png"
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "color=c=red:s=32x32", "-frames:v", "1", str(cover)],
+        check=True,
+    )
+    src = str(tmp_path / "art.mp3")
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y", "-i", _tone(tmp_path / "tone.wav", 0.1), "-i", str(cover),
+            "-map", "0", "-map", "1", "-c:v", "copy", "-disposition:v", "attached_pic", src,
+        ],
+        check=True,
+    )
+
+    out = str(tmp_path / "out.mp3")
+    AudioNormalizer()._render_linear(src, out, 3.0, "libmp3lame")
+
+    probe = subprocess.run(["ffmpeg", "-i", out], stderr=subprocess.PIPE, text=True).stderr
+    assert "Audio: mp3" in probe
+    assert "Video: png" in probe and "attached pic" in probe
@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from yoto_up import rate_limit
+from yoto_up.rate_limit import (
+    AsyncRateLimitedTransport,
+    RateLimitedTransport,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    host_class,
+)
+
+
+def _client(statuses, limiter, calls):
+    def handler(request):
+        calls.append(request.method)
+        status = statuses.pop(0) if statuses else 200
+        return httpx.Response(status, headers={"Retry-After": "0"} if status == 429 else {})
+
+    return httpx.Client(
+        transport=RateLimitedTransport(httpx.MockTransport(handler), limiter)
+    )
+
+
+def test_host_class_buckets():
+    assert host_class("api.yotoplay.com") == "api"
+    assert host_class("www.yotoicons.com") == "yotoicons"
+    assert host_class("card-content.yotoplay.com") == "cdn"
+
+
+def test_retries_transient_errors_for_idempotent_requests(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+    limiter = RateLimiter(retry_policy=RetryPolicy(max_retries=3, jitter=0))
+
+    calls = []
+    resp = _client([503, 502], limiter, calls).get("https://api.yotoplay.com/content/mine")
+    assert resp.status_code == 200
+    assert calls == ["GET"] * 3
+    assert sleeps == [0.5, 1.0]
+
+    # POST is retried after a 429 (not processed) but not after a 500
+    calls = []
+    resp = _client([429, 500], limiter, calls).post("https://api.yotoplay.com/content", json={})
+    assert resp.status_code == 500
+    assert calls == ["POST", "POST"]
+
+
+def test_streamed_bodies_are_not_retried():
+    async def body():
+        yield b"audio"
+
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        await request.aread()
+        return httpx.Response(503)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=AsyncRateLimitedTransport(httpx.MockTransport(handler), RateLimiter())
+        ) as client:
+            return await client.put("https://uploads.example/a", content=body())
+
+    assert asyncio.run(run()).status_code == 503
+    assert calls == ["PUT"]
+
+
+def test_token_bucket_paces_after_burst(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2.0, burst=2)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    bucket.pause(5)
+    now[0] += 10
+    assert bucket.reserve() == 0.0
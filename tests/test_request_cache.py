@@ -0,0 +1,78 @@
+import httpx
+
+from yoto_up.request_cache import RECOMMENDED_TTLS, RequestCache, endpoint_class
+from yoto_up.yoto_api import YotoAPI
+
+
+def test_endpoint_classes():
+    assert endpoint_class("https://api.yotoplay.com/content/mine") == "content_list"
+    assert endpoint_class("https://api.yotoplay.com/content/abc12") == "card"
+    assert endpoint_class("https://api.yotoplay.com/media/displayIcons/user/me") == "icons"
+    assert endpoint_class("https://api.yotoplay.com/device-v2/d1/status") == "device"
+
+
+def test_lru_eviction_keeps_cache_within_bound(tmp_path):
+    cache = RequestCache(tmp_path / "cache.sqlite", max_bytes=250)
+    for i in range(3):
+        cache.put(f"k{i}", f"https://x/{i}", 200, {}, b"x" * 100)
+        cache.get("k0")  # keep k0 recently used
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None and cache.get("k2") is not None
+    assert cache.stats()["bytes"] == 200
+
+    assert cache.prune(max_bytes=100) == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_cached_request_revalidates_with_etag_and_invalidates_on_write(tmp_path, monkeypatch):
+    api = YotoAPI(
+        "test-client",
+        app_path=tmp_path,
+        auto_start_authentication=False,
+        cache_requests=True,
+        use_upload_index=False,
+    )
+    seen = []
+
+    def handler(request):
+        seen.append((request.method, request.headers.get("If-None-Match")))
+        if request.method == "POST":
+            return httpx.Response(200, json={"card": {"cardId": "c1"}})
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"card": {"cardId": "c1"}}, headers={"ETag": '"v1"'})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api, "_get_client", lambda: client)
+    url = f"{api.CONTENT_URL}/c1"
+
+    assert api._cached_request("GET", url).json() == {"card": {"cardId": "c1"}}
+    # Max age 0 (the default): every use is revalidated
+    assert api._cached_request("GET", url).json() == {"card": {"cardId": "c1"}}
+    assert seen == [("GET", None), ("GET", '"v1"')]
+
+    api.cache_max_age_seconds = 60  # served without a request while younger
+    assert api._cached_request("GET", url).status_code == 200
+    assert len(seen) == 2
+
+    # Playable cards carry signed URLs and are never cached
+    api._cached_request("GET", f"{url}/?playable=true")
+    api._cached_request("GET", f"{url}/?playable=true")
+    assert seen[-2:] == [("GET", None), ("GET", None)]
+    api.cache_max_age_seconds = 0
+
+    api._cached_request("POST", api.CONTENT_URL, json_data={"cardId": "c1"})
+    assert api._get_request_cache().stats()["entries"] == 0
+    api.close()
+
+
+def test_endpoint_ttls_are_opt_in(tmp_path):
+    url = "https://api.yotoplay.com/content/c1"
+    default = RequestCache(tmp_path / "a.sqlite")
+    default.put("k", url, 200, {}, b"{}")
+    assert not default.is_fresh(default.get("k"))
+
+    opted = RequestCache(tmp_path / "b.sqlite", ttls=RECOMMENDED_TTLS)
+    opted.put("k", url, 200, {}, b"{}")
+    assert opted.is_fresh(opted.get("k"))
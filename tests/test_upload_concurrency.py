@@ -32,8 +32,8 @@ def test_concurrent_upload_writes(tmp_path, monkeypatch):
     icon1.write_bytes(b"\x00" * 128)
     icon2.write_bytes(b"\x01" * 128)
 
-    # Fake httpx.post to return different URLs based on content
-    def fake_post(url, headers=None, params=None, content=None):
+    # Fake the pooled client's post to return different URLs based on content
+    def fake_post(self, url, headers=None, params=None, content=None):
         # Use first byte to pick a stable response per file
         first = content[0] if content else 0
         if first % 2 == 0:
@@ -42,7 +42,7 @@ def test_concurrent_upload_writes(tmp_path, monkeypatch):
             data = {"displayIcon": {"mediaId": "MID-ODD", "url": "https://cdn.example/icon_odd.png"}}
         return FakeResp(data)
 
-    monkeypatch.setattr(httpx, "post", fake_post)
+    monkeypatch.setattr(httpx.Client, "post", fake_post)
 
     # Run many concurrent uploads (some duplicates) to simulate race
     paths = [str(icon1), str(icon2), str(icon1), str(icon2), str(icon1)]
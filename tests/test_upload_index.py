@@ -0,0 +1,72 @@
+import os
+
+from yoto_up.models import TranscodedAudio
+from yoto_up.upload_index import UploadIndex
+from yoto_up.yoto_api import YotoAPI
+
+
+def test_sha256_is_invalidated_when_file_changes(tmp_path):
+    index = UploadIndex(tmp_path / "index.sqlite")
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"one")
+    index.put_sha256(audio, "sha-one")
+    assert index.get_sha256(audio) == "sha-one"
+
+    audio.write_bytes(b"changed")
+    st = audio.stat()
+    os.utime(audio, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert index.get_sha256(audio) is None
+
+
+def test_transcode_roundtrip_is_keyed_by_loudnorm(tmp_path):
+    index = UploadIndex(tmp_path / "index.sqlite")
+    tr = TranscodedAudio.model_validate(
+        {"transcodedSha256": "t1", "transcodedInfo": {"duration": 12.0}}
+    )
+    index.put_transcode("sha", tr, loudnorm=False)
+
+    reopened = UploadIndex(tmp_path / "index.sqlite")
+    assert reopened.get_transcode("sha", loudnorm=False) == tr
+    assert reopened.get_transcode("sha", loudnorm=True) is None
+
+
+def test_upload_and_transcode_audio_skips_server_for_indexed_audio(tmp_path, monkeypatch):
+    api = YotoAPI("test-client", app_path=tmp_path, auto_start_authentication=False)
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"audio")
+
+    calls = []
+    monkeypatch.setattr(
+        api,
+        "get_audio_upload_url",
+        lambda sha, filename=None: calls.append(sha) or {"upload": {"uploadId": "u1"}},
+    )
+    monkeypatch.setattr(
+        api,
+        "poll_for_transcoding",
+        lambda *a, **k: TranscodedAudio.model_validate({"transcodedSha256": "t1"}),
+    )
+    first = api.upload_and_transcode_audio(str(audio), show_progress=False)
+
+    monkeypatch.setattr(api, "calculate_sha256", lambda p: (_ for _ in ()).throw(AssertionError))
+    second = api.upload_and_transcode_audio(str(audio), show_progress=False)
+
+    assert len(calls) == 1
+    assert second == first
+    api.close()
+
+
+def test_transcodes_expire_after_max_age(tmp_path, monkeypatch):
+    from yoto_up import upload_index
+
+    now = [1000.0]
+    monkeypatch.setattr(upload_index.time, "time", lambda: now[0])
+    index = UploadIndex(tmp_path / "index.sqlite", transcode_max_age=60)
+    tr = TranscodedAudio.model_validate({"transcodedSha256": "t1"})
+    index.put_transcode("sha", tr)
+
+    now[0] += 59
+    assert index.get_transcode("sha") == tr
+    now[0] += 2
+    assert index.get_transcode("sha") is None
+    assert UploadIndex(tmp_path / "index.sqlite", transcode_max_age=None).get_transcode("sha") is None
@@ -0,0 +1,126 @@
+import asyncio
+from pathlib import Path
+
+from yoto_up.models import TranscodedAudio
+from yoto_up.upload_journal import UploadJournal
+from yoto_up.yoto_api import YotoAPI
+
+
+def test_journal_persists_per_file_state(tmp_path):
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"audio")
+    key = UploadJournal.key_for(audio)
+    tr = TranscodedAudio.model_validate({"transcodedSha256": "t1"})
+
+    journal = UploadJournal("job", journal_dir=tmp_path)
+    journal.mark_hashed(key, audio, "sha")
+    journal.mark_uploaded(key, "u1")
+
+    reopened = UploadJournal("job", journal_dir=tmp_path)
+    assert reopened.sha256(key, audio) == "sha"
+    assert reopened.upload_id(key) == ("sha", "u1")
+    reopened.mark_transcoded(key, tr)
+    assert UploadJournal("job", journal_dir=tmp_path).transcoded(key) == tr
+
+    assert UploadJournal("job", journal_dir=tmp_path, resume=False).state(key) is None
+    reopened.discard()
+    assert not (tmp_path / "job.jsonl").exists()
+
+
+def test_journal_appends_updates_and_compacts_on_load(tmp_path):
+    journal = UploadJournal("job", journal_dir=tmp_path)
+    for i in range(50):
+        journal.mark_uploaded(f"k{i % 5}", f"u{i}")
+    log = tmp_path / "job.jsonl"
+    assert len(log.read_text().splitlines()) == 50
+    with open(log, "a") as f:
+        f.write('{"key": "k0", "fie')  # torn final write
+
+    reopened = UploadJournal("job", journal_dir=tmp_path)
+    assert reopened.upload_id("k0") == ("", "u45")
+    assert reopened.upload_id("k4") == ("", "u49")
+    assert len(log.read_text().splitlines()) == 5
+
+
+def test_upload_many_resumes_from_journal(tmp_path, monkeypatch):
+    api = YotoAPI.__new__(YotoAPI)
+    files = []
+    for name in ("done", "uploaded", "new"):
+        p = tmp_path / f"{name}.mp3"
+        p.write_bytes(name.encode())
+        files.append(p)
+
+    journal = UploadJournal("job", journal_dir=tmp_path)
+    journal.mark_transcoded(
+        UploadJournal.key_for(files[0]),
+        TranscodedAudio.model_validate({"transcodedSha256": "t-done"}),
+    )
+    journal.mark_hashed(UploadJournal.key_for(files[1]), files[1], "uploaded")
+    journal.mark_uploaded(UploadJournal.key_for(files[1]), "up-uploaded")
+
+    hashed, uploaded, polled = [], [], []
+
+    def _fake_sha(path):
+        hashed.append(path)
+        return "new"
+
+    async def _fake_upload(path, sha256, filename=None, **kwargs):
+        uploaded.append(path)
+        return f"up-{sha256}"
+
+    async def _fake_poll(upload_id, *args, **kwargs):
+        polled.append(upload_id)
+        return TranscodedAudio.model_validate({"transcodedSha256": f"t-{upload_id}"})
+
+    monkeypatch.setattr(api, "_sha256_for_upload", _fake_sha)
+    monkeypatch.setattr(api, "_upload_audio_async", _fake_upload)
+    monkeypatch.setattr(api, "poll_for_transcoding_async", _fake_poll)
+
+    results = asyncio.run(
+        api.upload_and_transcode_many_async(files, show_progress=False, journal=journal)
+    )
+
+    assert [r.transcodedSha256 for r in results] == [
+        "t-done",
+        "t-up-uploaded",
+        "t-up-new",
+    ]
+    assert hashed == [str(files[2])]
+    assert uploaded == [str(files[2])]
+    assert sorted(polled) == ["up-new", "up-uploaded"]
+    assert UploadJournal("job", journal_dir=tmp_path).summary()["transcoded"] == 3
+
+
+def test_pipeline_reports_journal_errors_per_file(tmp_path, monkeypatch):
+    api = YotoAPI.__new__(YotoAPI)
+    files = []
+    for name in ("bad", "good"):
+        p = tmp_path / f"{name}.mp3"
+        p.write_bytes(name.encode())
+        files.append(p)
+
+    journal = UploadJournal("job", journal_dir=tmp_path)
+    real_mark_hashed = journal.mark_hashed
+
+    def _mark_hashed(key, path, sha256):
+        if sha256 == "bad":
+            raise OSError("disk full")
+        real_mark_hashed(key, path, sha256)
+
+    async def _fake_upload(path, sha256, filename=None, **kwargs):
+        return f"up-{sha256}"
+
+    async def _fake_poll(upload_id, *args, **kwargs):
+        return TranscodedAudio.model_validate({"transcodedSha256": f"t-{upload_id}"})
+
+    monkeypatch.setattr(journal, "mark_hashed", _mark_hashed)
+    monkeypatch.setattr(api, "_sha256_for_upload", lambda path: Path(path).stem)
+    monkeypatch.setattr(api, "_upload_audio_async", _fake_upload)
+    monkeypatch.setattr(api, "poll_for_transcoding_async", _fake_poll)
+
+    results = asyncio.run(
+        asyncio.wait_for(api._upload_pipeline_async(files, journal=journal), timeout=5)
+    )
+
+    assert isinstance(results[0], OSError)
+    assert results[1].transcodedSha256 == "t-up-good"
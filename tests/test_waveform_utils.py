@@ -0,0 +1,219 @@
+import os
+import subprocess
+import wave
+
+import numpy as np
+import pytest
+
+from yoto_up.waveform_utils import (
+    LoudnessMeter,
+    _EnvelopeBuilder,
+    _ffmpeg_executable,
+    audio_stats,
+    batch_audio_stats,
+    load_audio,
+    run_pooled,
+)
+
+
+def _write_wav(path, samples, rate=44100, channels=2):
+    ints = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.repeat(ints, channels).tobytes())
+    return ints.astype(np.float32) / 32768.0
+
+
+def test_envelope_builder_bounds_bins_and_keeps_extremes():
+    rng = np.random.default_rng(1)
+    signal = rng.uniform(-1, 1, 100_003).astype(np.float32)
+    builder = _EnvelopeBuilder(max_bins=100)
+    for i in range(0, len(signal), 7_001):
+        builder.add(signal[i:i + 7_001])
+    env = builder.finish(1000, len(signal))
+
+    mins, maxs = env.levels[0]
+    assert len(mins) <= 100
+    for i in (0, len(mins) // 2, len(mins) - 1):
+        chunk = signal[i * env.bin_frames:(i + 1) * env.bin_frames]
+        assert mins[i] == chunk.min() and maxs[i] == chunk.max()
+    assert env.levels[-1][0][0] == signal.min() and env.levels[-1][1][0] == signal.max()
+
+    times, pmins, pmaxs = env.points(max_points=20)
+    assert len(times) <= 20 and times[-1] <= env.duration
+
+
+def test_streamed_stats_match_whole_file(tmp_path):
+    rate = 44100
+    t = np.arange(rate * 3) / rate
+    samples = 0.5 * np.sin(2 * np.pi * 440 * t)
+    mono = _write_wav(tmp_path / "tone.wav", samples, rate)
+
+    env, max_amp, avg_amp, lufs, ext, filepath = audio_stats(
+        str(tmp_path / "tone.wav"), {}, block_frames=4096
+    )
+    assert ext == ".wav"
+    assert env.framerate == rate and env.n_frames == len(mono)
+    assert max_amp == pytest.approx(np.abs(mono).max())
+    assert avg_amp == pytest.approx(np.abs(mono).mean(), rel=1e-6)
+    pytest.importorskip("scipy")
+    # -6 dBFS sine in both channels: -3 dB (sine RMS) - 6 dB, minus ~0.7 dB
+    # K-weighting at 440 Hz, plus 3 dB for the second channel
+    assert lufs == pytest.approx(-6.75, abs=0.05)
+
+
+def test_loudness_meter_matches_pyloudnorm():
+    pyln = pytest.importorskip("pyloudnorm")
+    rng = np.random.default_rng(2)
+    rate = 48000
+    audio = 0.1 * rng.standard_normal(rate * 5)
+    audio[rate:rate * 2] *= 0.01
+
+    meter = LoudnessMeter(rate)
+    for i in range(0, len(audio), 10_000):
+        meter.add(audio[i:i + 10_000])
+    assert meter.integrated() == pytest.approx(
+        pyln.Meter(rate).integrated_loudness(audio), abs=1e-3
+    )
+
+
+def test_loudness_meter_sums_channels_like_pyloudnorm():
+    pyln = pytest.importorskip("pyloudnorm")
+    rng = np.random.default_rng(3)
+    rate = 44100
+    left = 0.1 * rng.standard_normal(rate * 4)
+    audio = np.stack([left, 0.5 * left + 0.02 * rng.standard_normal(len(left))], axis=1)
+
+    meter = LoudnessMeter(rate)
+    for i in range(0, len(audio), 7_000):
+        meter.add(audio[i:i + 7_000])
+    assert meter.integrated() == pytest.approx(
+        pyln.Meter(rate).integrated_loudness(audio), abs=1e-3
+    )
+
+
+def test_peak_is_taken_per_channel_not_from_the_downmix(tmp_path):
+    rate = 8000
+    t = np.arange(rate) / rate
+    left = 0.8 * np.sin(2 * np.pi * 200 * t)
+    frames = np.stack([left, -left], axis=1)  # cancels out in the downmix
+    ints = (frames * 32767).astype(np.int16)
+    with wave.open(str(tmp_path / "anti.wav"), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(ints.tobytes())
+
+    env, max_amp, avg_amp, _, _, _ = audio_stats(str(tmp_path / "anti.wav"), {})
+    assert max_amp == pytest.approx(0.8, abs=1e-3)
+    assert avg_amp < 1e-3 and env.levels[-1][1][0] < 1e-3
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_batch_audio_stats_keeps_order_and_fills_cache(tmp_path, executor):
+    files = []
+    for i, amp in enumerate([0.2, 0.4, 0.8]):
+        path = tmp_path / f"{i}.wav"
+        _write_wav(path, amp * np.ones(2000), rate=8000, channels=1)
+        files.append(str(path))
+    files.append(files[0])  # duplicates are analysed once
+    progress = []
+    cache = {}
+
+    results = batch_audio_stats(
+        files, cache, progress_callback=lambda done, total: progress.append(done),
+        max_workers=2, executor=executor,
+    )
+
+    assert [r[5] for r in results] == files
+    assert [round(r[1], 1) for r in results] == [0.2, 0.4, 0.8, 0.2]
+    assert results[0][0].levels[-1][1][0] == pytest.approx(0.2, abs=1e-3)
+    assert progress == [1, 2, 3, 4]
+    assert set(cache) == set(files)
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_run_pooled_keeps_order_and_reports_progress(executor):
+    items = ["b.mp3", "a.mp3", "c.mp3", "b.mp3"]
+    progress = []
+    seen = []
+
+    results = run_pooled(
+        items, str.upper, lambda done, total: progress.append((done, total)),
+        max_workers=2, executor=executor, on_result=lambda item, result: seen.append(item),
+    )
+
+    assert results == ["B.MP3", "A.MP3", "C.MP3", "B.MP3"]
+    assert sorted(seen) == ["a.mp3", "b.mp3", "c.mp3"]
+    assert [d for d, _ in progress] == [1, 2, 3, 4]
+    assert progress[-1] == (4, 4)
+
+
+def test_run_pooled_logs_and_falls_back_to_threads(monkeypatch):
+    import concurrent.futures
+
+    from loguru import logger
+
+    class NoProcesses:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no fork here")
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", NoProcesses)
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+    try:
+        assert run_pooled(["a", "b"], str.upper, executor="process") == ["A", "B"]
+    finally:
+        logger.remove(sink)
+    assert any("no fork here" in m for m in messages)
+
+
+
+def test_run_pooled_spawns_worker_processes(monkeypatch):
+    import concurrent.futures
+
+    contexts = []
+    real_pool = concurrent.futures.ProcessPoolExecutor
+
+    def recording_pool(*args, **kwargs):
+        contexts.append(kwargs.get("mp_context"))
+        return real_pool(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", recording_pool)
+    assert run_pooled(["a", "b"], str.upper, executor="process") == ["A", "B"]
+    assert [c.get_start_method() for c in contexts] == ["spawn"]
+
+def test_run_pooled_reraises_worker_errors_without_falling_back(tmp_path):
+    from loguru import logger
+
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+    try:
+        with pytest.raises(FileNotFoundError):
+            run_pooled([str(tmp_path / "missing"), str(tmp_path)], os.stat, executor="process")
+    finally:
+        logger.remove(sink)
+    assert messages == []
+
+@pytest.mark.parametrize("suffix", [".flac", ".m4a"])
+def test_ffmpeg_decodes_other_formats_downmixed_and_resampled(tmp_path, suffix):
+    if not _ffmpeg_executable():
+        pytest.skip("ffmpeg not available")
+    wav = tmp_path / "tone.wav"
+    t = np.arange(44100 * 2) / 44100
+    _write_wav(wav, 0.5 * np.sin(2 * np.pi * 440 * t), rate=44100, channels=2)
+    out = tmp_path / f"tone{suffix}"
+    subprocess.run(
+        [_ffmpeg_executable(), "-v", "error", "-y", "-i", str(wav), str(out)], check=True
+    )
+
+    env, max_amp, _, _, ext, _ = audio_stats(str(out), {}, block_frames=1000)
+    assert ext == suffix and env.framerate == 44100
+    assert env.duration == pytest.approx(2.0, abs=0.05)
+    assert max_amp == pytest.approx(0.5, abs=0.02)
+
+    audio, rate = load_audio(str(out), sample_rate=16000)
+    assert rate == 16000 and audio.ndim == 1
+    assert len(audio) == pytest.approx(32000, abs=800)
@@ -1,3 +1,4 @@
+from pathlib import Path
 from yoto_up.yoto_api import YotoAPI
 from yoto_up.models import Card, TranscodedAudio
 
@@ -154,3 +155,296 @@ def test_upload_audio_to_card_validates_transcoded_audio_before_delegating(monke
     assert isinstance(observed["transcoded_audio"], TranscodedAudio)
     assert observed["track_details"] == {"title": "T"}
     assert observed["chapter_details"] == {"title": "C"}
+
+
+def test_pooled_client_is_reused_and_closed():
+    api = _api()
+    client = api._get_client()
+    assert api._get_client() is client
+    with api:
+        pass
+    assert client.is_closed
+    assert api._get_client() is not client
+    api.close()
+
+
+def test_async_client_is_shared_within_a_loop():
+    import asyncio
+
+    api = _api()
+
+    async def _run():
+        first = api._get_async_client()
+        second = api._get_async_client()
+        await api.aclose()
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first is second
+    assert first.is_closed
+
+
+def test_async_client_of_a_closed_loop_is_released():
+    import asyncio
+
+    api = _api()
+
+    async def _get():
+        return api._get_async_client()
+
+    async def _next_loop():
+        client = api._get_async_client()
+        await asyncio.sleep(0)  # let the stale client's close run
+        await api.aclose()
+        return client
+
+    stale = asyncio.run(_get())
+    fresh = asyncio.run(_next_loop())
+    assert fresh is not stale
+    assert stale.is_closed
+    assert list(api._async_clients) == []
+
+
+def test_calculate_sha256_hashes_file_incrementally(tmp_path):
+    import hashlib
+
+    api = _api()
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"\x01\x02" * 100_000)
+
+    assert api.calculate_sha256(str(audio)) == hashlib.sha256(audio.read_bytes()).hexdigest()
+
+
+def test_upload_and_transcode_async_streams_file_with_chunk_progress(tmp_path, monkeypatch):
+    import asyncio
+    import httpx
+
+    api = _api()
+    monkeypatch.setattr(api, "UPLOAD_CHUNK_SIZE", 1000)
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(b"x" * 3500)
+
+    received = {}
+
+    async def handler(request):
+        received["length"] = request.headers.get("content-length")
+        received["body"] = await request.aread()
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api, "_get_async_client", lambda: client)
+    monkeypatch.setattr(
+        api,
+        "get_audio_upload_url",
+        lambda sha, filename=None: {"upload": {"uploadUrl": "https://up.test/a", "uploadId": "u1"}},
+    )
+
+    async def _fake_poll(upload_id, *args, **kwargs):
+        return TranscodedAudio.model_validate({"transcodedSha256": "sha-x"})
+
+    monkeypatch.setattr(api, "poll_for_transcoding_async", _fake_poll)
+
+    events = []
+    result = asyncio.run(
+        api.upload_and_transcode_audio_async(
+            str(audio), progress_callback=lambda msg, frac: events.append((msg, frac))
+        )
+    )
+
+    assert result.transcodedSha256 == "sha-x"
+    assert received["length"] == "3500"
+    assert received["body"] == audio.read_bytes()
+    upload_fracs = [f for m, f in events if m.startswith("Uploading audio...") and f]
+    assert upload_fracs == [1000 / 3500, 2000 / 3500, 3000 / 3500, 1.0]
+
+
+def test_transcode_poller_resolves_all_uploads_from_one_scheduler(monkeypatch):
+    import asyncio
+    import httpx
+    from yoto_up import yoto_api
+
+    api = _api()
+    api.access_token = "token"
+    monkeypatch.setattr(yoto_api._TranscodePoller, "MIN_DELAY", 0.01)
+    monkeypatch.setattr(yoto_api._TranscodePoller, "MAX_DELAY", 0.02)
+
+    seen: dict[str, int] = {}
+
+    def handler(request):
+        upload_id = request.url.path.split("/")[3]
+        seen[upload_id] = seen.get(upload_id, 0) + 1
+        if seen[upload_id] == 1:
+            return httpx.Response(
+                202,
+                headers={"Retry-After": "0"},
+                json={"transcode": {"progress": {"percent": 50}}},
+            )
+        return httpx.Response(200, json={"transcode": {"transcodedSha256": f"sha-{upload_id}"}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api, "_get_async_client", lambda: client)
+
+    events = []
+
+    async def _run():
+        return await asyncio.gather(
+            api.poll_for_transcoding_async(
+                "u1", progress_callback=lambda m, f: events.append(f)
+            ),
+            api.poll_for_transcoding_async("u2"),
+        )
+
+    first, second = asyncio.run(_run())
+    assert first.transcodedSha256 == "sha-u1"
+    assert second.transcodedSha256 == "sha-u2"
+    assert seen == {"u1": 2, "u2": 2}
+    assert 0.5 in events
+
+
+def test_transcode_poller_times_out(monkeypatch):
+    import asyncio
+    import httpx
+    import pytest
+    from yoto_up import yoto_api
+
+    api = _api()
+    api.access_token = "token"
+    monkeypatch.setattr(yoto_api._TranscodePoller, "MIN_DELAY", 0.01)
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(202, json={"transcode": {}}))
+    )
+    monkeypatch.setattr(api, "_get_async_client", lambda: client)
+
+    with pytest.raises(Exception, match="timed out"):
+        asyncio.run(api.poll_for_transcoding_async("u1", poll_interval=0.01, max_attempts=5))
+
+
+def test_transcode_poller_survives_unexpected_payloads(monkeypatch):
+    import asyncio
+    import httpx
+    from yoto_up import yoto_api
+
+    api = _api()
+    api.access_token = "token"
+    monkeypatch.setattr(yoto_api._TranscodePoller, "MIN_DELAY", 0.01)
+    replies = iter([["not", "a", "dict"], {"transcode": "pending"}])
+
+    def handler(request):
+        body = next(replies, {"transcode": {"transcodedSha256": "sha"}})
+        return httpx.Response(200, json=body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api, "_get_async_client", lambda: client)
+
+    result = asyncio.run(api.poll_for_transcoding_async("u1"))
+    assert result.transcodedSha256 == "sha"
+
+
+def test_transcode_poller_fails_waiters_if_the_runner_dies(monkeypatch):
+    import asyncio
+    from yoto_up import yoto_api
+
+    api = _api()
+
+    async def broken_poll(self, entry):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(yoto_api._TranscodePoller, "_poll", broken_poll)
+
+    async def _run():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                api.poll_for_transcoding_async("u1"),
+                api.poll_for_transcoding_async("u2"),
+                return_exceptions=True,
+            ),
+            timeout=5,
+        )
+
+    results = asyncio.run(_run())
+    assert [str(r) for r in results] == ["boom", "boom"]
+
+
+def test_upload_many_pipelines_uploads_past_pending_transcodes(tmp_path, monkeypatch):
+    import asyncio
+
+    api = _api()
+    files = []
+    for i in range(5):
+        p = tmp_path / f"{i}.mp3"
+        p.write_bytes(bytes([i]) * 10)
+        files.append(p)
+
+    active_uploads = 0
+    max_active_uploads = 0
+    uploads_started = []
+
+    async def _fake_upload(path, sha256, filename=None, **kwargs):
+        nonlocal active_uploads, max_active_uploads
+        active_uploads += 1
+        max_active_uploads = max(max_active_uploads, active_uploads)
+        uploads_started.append(path)
+        await asyncio.sleep(0.01)
+        active_uploads -= 1
+        return f"up-{sha256}"
+
+    transcode_gate = asyncio.Event()
+
+    async def _fake_poll(upload_id, *args, **kwargs):
+        # Transcodes only finish after every upload has started, which is
+        # impossible if a transcode wait holds an upload slot.
+        if len(uploads_started) < len(files):
+            await transcode_gate.wait()
+        transcode_gate.set()
+        return TranscodedAudio.model_validate({"transcodedSha256": f"t-{upload_id}"})
+
+    monkeypatch.setattr(api, "_sha256_for_upload", lambda p: Path(p).stem)
+    monkeypatch.setattr(api, "_upload_audio_async", _fake_upload)
+    monkeypatch.setattr(api, "poll_for_transcoding_async", _fake_poll)
+
+    results = asyncio.run(
+        asyncio.wait_for(
+            api.upload_and_transcode_many_async(
+                files, show_progress=False, max_concurrent_uploads=2
+            ),
+            timeout=5,
+        )
+    )
+
+    assert [r.transcodedSha256 for r in results] == [f"t-up-{i}" for i in range(5)]
+    assert max_active_uploads <= 2
+
+
+def test_get_cards_many_keeps_input_order_and_per_id_errors(monkeypatch):
+    import asyncio
+    import httpx
+
+    api = _api()
+    api.access_token = "token"
+    api.debug = False
+    active = 0
+    max_active = 0
+
+    async def handler(request):
+        nonlocal active, max_active
+        card_id = request.url.path.rsplit("/", 1)[-1]
+        active += 1
+        max_active = max(max_active, active)
+        # Later ids finish first so ordering comes from the input, not completion
+        await asyncio.sleep(0.01 * (5 - int(card_id[-1])))
+        active -= 1
+        if card_id == "c3":
+            return httpx.Response(404, json={})
+        return httpx.Response(200, json={"card": {"cardId": card_id, "title": card_id}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api, "_get_async_client", lambda: client)
+
+    ids = [f"c{i}" for i in range(5)]
+    results = asyncio.run(
+        api.get_cards_many_async(ids, concurrency=2, save_version_if_missing=False)
+    )
+
+    assert [getattr(r, "cardId", None) for r in results] == ["c0", "c1", "c2", None, "c4"]
+    assert isinstance(results[3], httpx.HTTPStatusError)
+    assert max_active <= 2